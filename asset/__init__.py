@@ -1,4 +1,25 @@
 """_summary_
 """
 from .asset import Asset
-from .asset_tools import asset_return_for_a_time_period, asset_return_for_all_time_periods, get_asset_data_in_a_custom_time_period, get_asset_data_in_a_time_period, today_asset_info
\ No newline at end of file
+from tools.lazy_imports import lazy_package_attribute, lazy_package_dir
+
+_LAZY_ATTRIBUTES = {
+    "assets_liquidity": ".asset_liquidity",
+    "liquidity_columns": ".asset_liquidity",
+    "liquidity_snapshot": ".asset_liquidity",
+    "rolling_liquidity": ".asset_liquidity",
+    "universe_liquidity": ".asset_liquidity",
+    "asset_return_for_a_time_period": ".asset_tools",
+    "asset_return_for_all_time_periods": ".asset_tools",
+    "get_asset_data_in_a_custom_time_period": ".asset_tools",
+    "get_asset_data_in_a_time_period": ".asset_tools",
+    "today_asset_info": ".asset_tools",
+    "UniverseScreener": ".asset_screener",
+}
+
+
+def __getattr__(name):
+    return lazy_package_attribute(package_name=__name__, package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES, name=name)
+
+def __dir__():
+    return lazy_package_dir(package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES)
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 
 
 class Asset:
@@ -26,19 +29,45 @@ class Asset:
         "funds",
     ]
 
-    def __init__(self, name: str, ticker: str, category: str, amount: float = 0.0) -> None:
+    EXCHANGE_SUFFIX_CURRENCIES = {
+        ".SA": "BRL",
+        ".L": "GBp",
+        ".TO": "CAD",
+        ".V": "CAD",
+        ".DE": "EUR",
+        ".F": "EUR",
+        ".PA": "EUR",
+        ".AS": "EUR",
+        ".MI": "EUR",
+        ".MC": "EUR",
+        ".SW": "CHF",
+        ".T": "JPY",
+        ".HK": "HKD",
+        ".AX": "AUD",
+        ".NS": "INR",
+        ".BO": "INR",
+        ".KS": "KRW",
+        ".SS": "CNY",
+        ".SZ": "CNY",
+        ".MX": "MXN",
+        ".JO": "ZAc",
+    }
+
+    def __init__(self, name: str, ticker: str, category: str, amount: float = 0.0, currency: Optional[str] = None) -> None:
         """
         Args:
             name (str): The asset name.
             ticker (str): The asset ticker used in the Yahoo Finance API.
             category (str): The category of the asset. For instance: Stocks
             amount (float, optional): The amount of the asset. Defaults to 0.0.
+            currency (Optional[str], optional): The currency in which the asset is quoted. Defaults to the currency inferred from the ticker.
 
         Raises:
             TypeError: If asset name is not a str.
             TypeError: If asset ticker is not a str.
             TypeError: If asset category is not a str.
             TypeError: If asset amount is not a float number.
+            TypeError: If asset currency is not a str.
         """
         if isinstance(name, str):
             
@@ -69,3 +98,36 @@ class Asset:
         else:
             
             raise TypeError("Invalid type! The asset amount must be a float number.")
+        if isinstance(currency, str):
+            
+            self.currency = currency
+        elif currency is None:
+            
+            self.currency = Asset.infer_currency(ticker=ticker)
+        else:
+            
+            raise TypeError("Invalid type! The asset currency must be a str.")
+
+    @staticmethod
+    def infer_currency(ticker: str) -> str:
+        """Infers the quote currency of a ticker from the Yahoo Finance naming conventions.
+
+        Args:
+            ticker (str): The asset ticker used in the Yahoo Finance API.
+
+        Returns:
+            str: The currency code. For instance: USD, BRL or GBp (pence).
+        """
+        if ticker.endswith("=X"):
+            
+            pair = ticker[:-2]
+            return pair[3:6] if len(pair) == 6 else pair[:3]
+        elif "-" in ticker and "." not in ticker and len(ticker.split("-")[-1]) == 3:
+            
+            return ticker.split("-")[-1]
+        for suffix, currency in Asset.EXCHANGE_SUFFIX_CURRENCIES.items():
+            
+            if ticker.endswith(suffix):
+                
+                return currency
+        return "USD"
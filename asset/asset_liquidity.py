@@ -0,0 +1,184 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import pandas as pd
+import warnings
+from asset import Asset
+from datetime import date
+from market_data import get_price_store
+from pandas import DataFrame, Timestamp
+from tools.instrumentation import timed
+from typing import Dict, List, Optional
+
+def liquidity_columns(base_currency: str = "USD") -> List[str]:
+    """Lists the columns of the liquidity tables, with the values in the base currency.
+
+    Args:
+        base_currency (str, optional): The currency of the dollar volumes and of the values. Defaults to "USD".
+
+    Returns:
+        List[str]: The columns.
+    """
+    return [
+        "ADV",
+        f"ADV ({base_currency})",
+        "Amihud illiquidity",
+        "Amount",
+        f"Position value ({base_currency})",
+        "Days to liquidate",
+    ]
+
+
+LIQUIDITY_COLUMNS = liquidity_columns()
+
+
+def rolling_liquidity(volume: DataFrame, close_prices: DataFrame, window: int = 20, base_currency: str = "USD") -> Dict[str, DataFrame]:
+    """Calculates the rolling liquidity measures of every ticker over the whole history.
+
+    Args:
+        volume (DataFrame): The volumes with dates as rows and tickers as columns.
+        close_prices (DataFrame): The close prices in the base currency on the same dates and tickers.
+        window (int, optional): The number of trading days of the rolling window. Defaults to 20.
+        base_currency (str, optional): The currency of the close prices. Defaults to "USD".
+
+    Returns:
+        Dict[str, DataFrame]: The average daily volume (ADV), the average daily dollar volume (ADV (USD)) and the
+        Amihud illiquidity (the average absolute return per million of dollar volume), each one with dates as rows.
+    """
+    close_prices = close_prices.reindex(index=volume.index, columns=volume.columns)
+    dollar_volume = volume*close_prices
+    absolute_returns = (close_prices.ffill()/close_prices.ffill().shift(1) - 1).abs()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        illiquidity = (absolute_returns/dollar_volume.where(dollar_volume > 0))*1e6
+    return {
+        "ADV": volume.rolling(window=window, min_periods=1).mean(),
+        f"ADV ({base_currency})": dollar_volume.rolling(window=window, min_periods=1).mean(),
+        "Amihud illiquidity": illiquidity.rolling(window=window, min_periods=1).mean(),
+    }
+
+def liquidity_snapshot(volume: DataFrame, close_prices: DataFrame, window: int = 20, as_of: Optional[str] = None, base_currency: str = "USD") -> DataFrame:
+    """Calculates the liquidity measures of every ticker on a date from its last window trading days.
+
+    The trading days of a ticker are the rows up to the date where it has a
+    volume and a close price. They are ranked from the end, so every ticker
+    gets its own last window trading days, whatever the days without prices
+    of the other tickers (holidays of other exchanges, weekends for the
+    cryptocurrencies), and the date does not need to be a trading day.
+
+    Args:
+        volume (DataFrame): The volumes with dates as rows and tickers as columns.
+        close_prices (DataFrame): The close prices in the base currency on the same dates and tickers.
+        window (int, optional): The number of trading days of the window. Defaults to 20.
+        as_of (Optional[str], optional): The date (format:yyyy-mm-dd). Defaults to None (last date).
+        base_currency (str, optional): The currency of the close prices. Defaults to "USD".
+
+    Returns:
+        DataFrame: A table with tickers as rows and the ADV, the ADV (USD) and the Amihud illiquidity as columns.
+    """
+    close_prices = close_prices.reindex(index=volume.index, columns=volume.columns)
+    end = len(volume.index) if as_of is None else int(volume.index.searchsorted(Timestamp(as_of), side="right"))
+    with timed("analytics.liquidity"):
+        
+        raw_prices = close_prices.to_numpy(dtype=np.float64)[:end]
+        volumes = volume.to_numpy(dtype=np.float64)[:end]
+        prices = close_prices.ffill().to_numpy(dtype=np.float64)[:end]
+        previous_prices = np.vstack([np.full((1, prices.shape[1]), np.nan), prices[:-1]])
+        valid = ~np.isnan(volumes) & ~np.isnan(raw_prices)
+        # The number of trading days of each ticker from each row to the date.
+        ranks_from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+        in_window = valid & (ranks_from_end <= window)
+        volumes = np.where(in_window, volumes, np.nan)
+        dollar_volumes = volumes*prices
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            illiquidity = np.where(dollar_volumes > 0, np.abs(prices/previous_prices - 1)/dollar_volumes, np.nan)*1e6
+        with warnings.catch_warnings():
+            
+            # The tickers without trading days get NaN averages.
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            average_volume = np.nanmean(volumes, axis=0)
+            average_dollar_volume = np.nanmean(dollar_volumes, axis=0)
+            average_illiquidity = np.nanmean(illiquidity, axis=0)
+    return pd.DataFrame(data={"ADV": average_volume, f"ADV ({base_currency})": average_dollar_volume, "Amihud illiquidity": average_illiquidity}, index=pd.Index(volume.columns, name="Ticker"))
+
+def universe_liquidity(window: int = 20, as_of: Optional[str] = None) -> DataFrame:
+    """Calculates the liquidity measures of every ticker already loaded in the shared price store, without downloads.
+
+    Args:
+        window (int, optional): The number of trading days of the window. Defaults to 20.
+        as_of (Optional[str], optional): The date (format:yyyy-mm-dd). Defaults to None (last date).
+
+    Returns:
+        DataFrame: A table with tickers as rows and the ADV, the ADV (USD) and the Amihud illiquidity as columns.
+    """
+    panel = get_price_store().panel
+    fields = panel.columns.get_level_values(0)
+    if "Volume" not in fields or "Close" not in fields:
+        
+        return pd.DataFrame(columns=LIQUIDITY_COLUMNS[:3], dtype=np.float64)
+    return liquidity_snapshot(volume=panel["Volume"], close_prices=panel["Close"], window=window, as_of=as_of)
+
+def assets_liquidity(assets_list: List[Asset], window: int = 20, participation_rate: float = 0.1, as_of: Optional[str] = None, base_currency: str = "USD", volume: Optional[DataFrame] = None, close_prices: Optional[DataFrame] = None) -> DataFrame:
+    """Calculates the liquidity of a list of assets and the days needed to sell the amounts held.
+
+    The days to liquidate assume that at most participation_rate of the
+    average daily volume can be sold each day without moving the price.
+
+    Args:
+        assets_list (List[Asset]): The assets list.
+        window (int, optional): The number of trading days of the averages. Defaults to 20.
+        participation_rate (float, optional): The share of the daily volume that can be sold. Defaults to 0.1.
+        as_of (Optional[str], optional): The date (format:yyyy-mm-dd). Defaults to None (last date).
+        base_currency (str, optional): The currency of the dollar volumes and of the values. Defaults to "USD".
+        volume (Optional[DataFrame], optional): A prepared table of volumes with dates as rows and tickers as columns. Defaults to None (shared price store).
+        close_prices (Optional[DataFrame], optional): A prepared table of close prices. Defaults to None (shared price store).
+
+    Raises:
+        ValueError: If the window or the participation rate is not positive.
+        TypeError: If the inputs are not a list, an int and a float.
+
+    Returns:
+        DataFrame: A table with tickers as rows and the ADV, the ADV in the base currency, the Amihud illiquidity,
+        the amount, the position value in the base currency and the days to liquidate as columns.
+    """
+    if isinstance(assets_list, list) and isinstance(window, int) and isinstance(participation_rate, float):
+        
+        if window <= 0 or participation_rate <= 0:
+            
+            raise ValueError("The window and the participation_rate must be positive.")
+        if len(assets_list) == 0:
+            
+            return pd.DataFrame(columns=liquidity_columns(base_currency=base_currency), dtype=np.float64)
+        tickers_list = [asset.ticker for asset in assets_list]
+        currencies_list = [asset.currency for asset in assets_list]
+        price_store = get_price_store()
+        if volume is None or close_prices is None:
+            
+            end = Timestamp(as_of) if as_of is not None else Timestamp(date.today())
+            # Twice the window in calendar days, plus a margin, covers the window of trading days after weekends and holidays.
+            start_str = (end - pd.Timedelta(days=2*window + 10)).strftime("%Y-%m-%d")
+            end_str = (end + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+            if volume is None:
+                
+                volume = price_store.price_matrix(tickers=tickers_list, field="Volume", start_date=start_str, end_date=end_str)
+            if close_prices is None:
+                
+                close_prices = price_store.price_matrix(tickers=tickers_list, field="Close", start_date=start_str, end_date=end_str)
+        volume = volume.reindex(columns=tickers_list)
+        close_prices = price_store.convert_to_base_currency(price_matrix=close_prices.reindex(columns=tickers_list), currencies=currencies_list, base_currency=base_currency)
+        liquidity = liquidity_snapshot(volume=volume, close_prices=close_prices, window=window, as_of=as_of, base_currency=base_currency)
+        last_prices = close_prices.reindex(index=volume.index).ffill()
+        last_prices = last_prices.loc[:Timestamp(as_of)] if as_of is not None else last_prices
+        amounts = np.array([asset.amount for asset in assets_list], dtype=np.float64)
+        liquidity["Amount"] = amounts
+        liquidity[f"Position value ({base_currency})"] = amounts*(last_prices.to_numpy()[-1] if len(last_prices.index) != 0 else np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            liquidity["Days to liquidate"] = np.where(liquidity["ADV"].to_numpy() > 0, amounts/(participation_rate*liquidity["ADV"].to_numpy()), np.inf)
+        return liquidity
+    else:
+        
+        raise TypeError("Invalid types! This function expects a list, an int and a float.")
@@ -0,0 +1,233 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import pandas as pd
+from asset import Asset
+from asset.asset_liquidity import liquidity_snapshot
+from datetime import date
+from market_data import get_price_store, returns_for_all_time_periods
+from market_data.price_store import period_start_positions
+from pandas import DataFrame
+from tools.instrumentation import increment, timed
+from typing import Dict, List, Optional, Tuple
+
+# The time periods sorted by length, to download the longest one needed.
+_TIME_PERIODS_BY_LENGTH = ["1d", "5d", "1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y", "10y", "max"]
+TRADING_DAYS_PER_YEAR = 252
+
+
+class UniverseScreener:
+    """Universe screener class
+
+    Keeps a metrics table of a universe of assets (returns, volatility and
+    liquidity) and one sorted index per metric, so filter and rank queries
+    are answered from memory with binary searches, without downloads. The
+    table is refreshed incrementally: only the tickers that are new, or that
+    were not refreshed today, are computed again, by chunks of tickers.
+
+    For instance, the top 50 ETFs by 1y return with an ADV above 1 million:
+
+        screener.query(category="etf", filters={"ADV (USD)": (1e6, None)}, rank_by="Return (%) - 1y", limit=50)
+    """
+
+    def __init__(self, assets_list: List[Asset], time_periods: Optional[List[str]] = None, volatility_time_period: str = "1y", liquidity_window: int = 20, base_currency: str = "USD") -> None:
+        """
+        Args:
+            assets_list (List[Asset]): The universe.
+            time_periods (Optional[List[str]], optional): The time periods of the returns. Defaults to ["1mo", "3mo", "6mo", "1y", "ytd"].
+            volatility_time_period (str, optional): The time period of the annualized volatility. Defaults to "1y".
+            liquidity_window (int, optional): The number of trading days of the average daily dollar volume. Defaults to 20.
+            base_currency (str, optional): The currency of the dollar volumes. Defaults to "USD".
+
+        Raises:
+            ValueError: If a time period is not valid.
+            TypeError: If assets_list is not a list.
+        """
+        if isinstance(assets_list, list):
+            
+            self.time_periods = ["1mo", "3mo", "6mo", "1y", "ytd"] if time_periods is None else time_periods
+            for time_period in self.time_periods + [volatility_time_period]:
+                
+                if time_period not in Asset.VALIDS_TIME_PERIODS:
+                    
+                    raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+            self.volatility_time_period = volatility_time_period
+            self.liquidity_window = liquidity_window
+            self.base_currency = base_currency
+            self.metrics_columns = [f"Return (%) - {time_period}" for time_period in self.time_periods] + ["Volatility (%)", f"ADV ({base_currency})"]
+            self.assets_by_ticker: Dict[str, Asset] = {}
+            for asset in assets_list:
+                
+                self.assets_by_ticker.setdefault(asset.ticker, asset)
+            tickers = list(self.assets_by_ticker.keys())
+            self._tickers = tickers
+            self._positions = {ticker: position for position, ticker in enumerate(tickers)}
+            self._values = np.full((len(tickers), len(self.metrics_columns)), np.nan)
+            self._refreshed_on: List[Optional[date]] = [None]*len(tickers)
+            self._category_codes, self.categories = pd.factorize(pd.Index([self.assets_by_ticker[ticker].category.lower() for ticker in tickers], dtype=object))
+            self._sorted_indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        else:
+            
+            raise TypeError("Invalid type! The assets_list must be a list.")
+
+    @property
+    def tickers(self) -> List[str]:
+        """The tickers of the universe, in the order of the rows of the metrics table."""
+        return list(self._tickers)
+
+    @property
+    def metrics(self) -> DataFrame:
+        """The metrics table with tickers as rows."""
+        metrics_pd = pd.DataFrame(data=self._values, index=pd.Index(self.tickers, name="Ticker"), columns=self.metrics_columns)
+        metrics_pd.insert(0, "Category", np.asarray(self.categories, dtype=object)[self._category_codes])
+        return metrics_pd
+
+    def add_assets(self, assets_list: List[Asset]) -> None:
+        """Adds assets to the universe. Their metrics are computed by the next refresh.
+
+        Args:
+            assets_list (List[Asset]): The new assets. The tickers already in the universe are ignored.
+        """
+        new_assets = [asset for asset in assets_list if asset.ticker not in self._positions]
+        for asset in new_assets:
+            
+            self.assets_by_ticker.setdefault(asset.ticker, asset)
+        new_tickers = list(dict.fromkeys(asset.ticker for asset in new_assets))
+        for ticker in new_tickers:
+            
+            self._positions[ticker] = len(self._positions)
+            self._tickers.append(ticker)
+        self._values = np.vstack([self._values, np.full((len(new_tickers), len(self.metrics_columns)), np.nan)])
+        self._refreshed_on.extend([None]*len(new_tickers))
+        self._category_codes, self.categories = pd.factorize(pd.Index([self.assets_by_ticker[ticker].category.lower() for ticker in self.tickers], dtype=object))
+        self._sorted_indexes.clear()
+
+    def _chunk_metrics(self, tickers: List[str]) -> np.ndarray:
+        """Computes the metrics of a chunk of tickers from the shared price store.
+
+        Args:
+            tickers (List[str]): The tickers.
+
+        Returns:
+            np.ndarray: The metrics with tickers as rows.
+        """
+        price_store = get_price_store()
+        load_time_period = max(self.time_periods + [self.volatility_time_period], key=_TIME_PERIODS_BY_LENGTH.index)
+        if load_time_period == "ytd":
+            
+            load_time_period = "1y"
+        prices = price_store.price_matrix(tickers=tickers, time_period=load_time_period)
+        returns = returns_for_all_time_periods(price_matrix=prices, time_periods=self.time_periods).to_numpy().T
+        volatility_prices = prices.iloc[int(period_start_positions(price_matrix=prices, time_period=self.volatility_time_period).min(initial=len(prices.index))):].dropna(how="all")
+        filled_prices = volatility_prices.ffill().to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            daily_returns = filled_prices[1:]/filled_prices[:-1] - 1
+        # Each ticker keeps the returns of its own trading days, from its previous valid close.
+        daily_returns[np.isnan(volatility_prices.to_numpy(dtype=np.float64)[1:])] = np.nan
+        volatility = np.nanstd(daily_returns, axis=0, ddof=1)*np.sqrt(TRADING_DAYS_PER_YEAR)*100 if len(daily_returns) > 1 else np.full(len(tickers), np.nan)
+        currencies = [self.assets_by_ticker[ticker].currency for ticker in tickers]
+        volume = price_store.price_matrix(tickers=tickers, field="Volume", time_period="3mo")
+        close_prices = price_store.convert_to_base_currency(price_matrix=price_store.price_matrix(tickers=tickers, field="Close", time_period="3mo"), currencies=currencies, base_currency=self.base_currency)
+        liquidity = liquidity_snapshot(volume=volume, close_prices=close_prices, window=self.liquidity_window, base_currency=self.base_currency)
+        return np.column_stack([returns, volatility, liquidity[f"ADV ({self.base_currency})"].to_numpy()])
+
+    def refresh(self, tickers: Optional[List[str]] = None, chunk_size: int = 500) -> int:
+        """Computes the metrics of the tickers that are new or were not refreshed today, and rebuilds the sorted indexes.
+
+        Args:
+            tickers (Optional[List[str]], optional): The tickers to refresh even if they were refreshed today. Defaults to None.
+            chunk_size (int, optional): The number of tickers loaded at once. Defaults to 500.
+
+        Returns:
+            int: The number of tickers refreshed.
+        """
+        today = date.today()
+        forced_tickers = set() if tickers is None else set(tickers)
+        stale_tickers = [ticker for ticker, position in self._positions.items() if self._refreshed_on[position] != today or ticker in forced_tickers]
+        for start in range(0, len(stale_tickers), chunk_size):
+            
+            chunk = stale_tickers[start:start + chunk_size]
+            positions = np.array([self._positions[ticker] for ticker in chunk], dtype=np.int64)
+            with timed("screener.refresh"):
+                
+                self._values[positions] = self._chunk_metrics(tickers=chunk)
+            for position in positions:
+                
+                self._refreshed_on[position] = today
+        increment("screener.refreshed_tickers", len(stale_tickers))
+        if len(stale_tickers) != 0 or len(self._sorted_indexes) == 0:
+            
+            self._build_indexes()
+        return len(stale_tickers)
+
+    def _build_indexes(self) -> None:
+        """Sorts every metric column once. The missing values are left out of the indexes."""
+        self._sorted_indexes = {}
+        for column_position, column in enumerate(self.metrics_columns):
+            
+            values = self._values[:, column_position]
+            order = np.argsort(values, kind="stable")
+            order = order[~np.isnan(values[order])]
+            self._sorted_indexes[column] = (order, values[order])
+
+    def query(self, filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None, category: Optional[str] = None, rank_by: Optional[str] = None, ascending: bool = False, limit: Optional[int] = 50) -> DataFrame:
+        """Filters and ranks the universe from the metrics table, without downloads.
+
+        Each range filter is a binary search on the sorted index of its
+        column, and the ranking walks the sorted index of the ranked column
+        keeping the tickers that passed every filter.
+
+        Args:
+            filters (Optional[Dict[str, Tuple[Optional[float], Optional[float]]]], optional): The inclusive minimum and maximum
+            of metric columns, None for an open bound. For instance: {"ADV (USD)": (1e6, None)}. Defaults to None.
+            category (Optional[str], optional): The category of the assets. Defaults to None (every category).
+            rank_by (Optional[str], optional): The metric column of the ranking. Defaults to None (universe order).
+            ascending (bool, optional): If the smallest values come first. Defaults to False.
+            limit (Optional[int], optional): The number of tickers returned. Defaults to 50. Use None for all.
+
+        Raises:
+            ValueError: If a column is not a metric column.
+
+        Returns:
+            DataFrame: The metrics of the selected tickers, in the order of the ranking.
+        """
+        if len(self._sorted_indexes) == 0:
+            
+            self._build_indexes()
+        for column in list((filters or {}).keys()) + ([rank_by] if rank_by is not None else []):
+            
+            if column not in self.metrics_columns:
+                
+                raise ValueError(f"Invalid column! The valids columns are {self.metrics_columns}.")
+        with timed("screener.query"):
+            
+            selected = np.ones(len(self._positions), dtype=bool)
+            if category is not None:
+                
+                category_code = list(self.categories).index(category.lower()) if category.lower() in self.categories else -1
+                selected &= self._category_codes == category_code
+            for column, (minimum, maximum) in (filters or {}).items():
+                
+                order, sorted_values = self._sorted_indexes[column]
+                low = 0 if minimum is None else int(np.searchsorted(sorted_values, minimum, side="left"))
+                high = len(sorted_values) if maximum is None else int(np.searchsorted(sorted_values, maximum, side="right"))
+                in_range = np.zeros(len(self._positions), dtype=bool)
+                in_range[order[low:high]] = True
+                selected &= in_range
+            if rank_by is None:
+                
+                positions = np.flatnonzero(selected)
+            else:
+                
+                order = self._sorted_indexes[rank_by][0]
+                order = order if ascending else order[::-1]
+                positions = order[selected[order]]
+            if limit is not None:
+                
+                positions = positions[:limit]
+        result = pd.DataFrame(data=self._values[positions], index=pd.Index([self._tickers[position] for position in positions], name="Ticker"), columns=self.metrics_columns)
+        result.insert(0, "Category", np.asarray(self.categories, dtype=object)[self._category_codes[positions]])
+        return result
@@ -5,12 +5,15 @@ sys.path.append("../")
 import numpy as np
 import pandas as pd
 import re
-import yfinance as yf
 from asset import Asset
+from market_data import get_price_store, returns_for_all_time_periods
 from datetime import date, timedelta
 from pandas import DataFrame
+from tools.lazy_imports import LazyModule
 from typing import List, Optional
 
+yf = LazyModule("yfinance")
+
 def asset_return_for_a_time_period(assets_list: List[Asset], time_period: str) -> DataFrame:
     """Calculates the returns of a list of assets for a given time period.
 
@@ -87,6 +90,9 @@ def asset_return_for_a_time_period(assets_list: List[Asset], time_period: str) -
 def asset_return_for_all_time_periods(assets_list: List[Asset]) -> DataFrame:
     """Calculates the returns of the assets for all time period available in Yahoo Finance.
 
+    The history of every asset is loaded once through the shared price store
+    and the returns of all time periods are computed in a single vectorized step.
+
     Args:
         assets_list (List[Asset]): A list with assets.
 
@@ -99,63 +105,22 @@ def asset_return_for_all_time_periods(assets_list: List[Asset]) -> DataFrame:
     """
     if isinstance(assets_list, List):
         
-        data = []
         for asset in assets_list:
             
-            if isinstance(asset, Asset):
-                
-                asset_return_list_info = [asset.name]
-                columns_list = ["Asset"]
-                time_period_columns = [f"Return (%) - {time_period}" for time_period in asset.VALIDS_TIME_PERIODS]
-                columns_list.extend(time_period_columns)
-                for time_period in asset.VALIDS_TIME_PERIODS:
-                    
-                    if time_period == "1d" and asset.category.lower() != "cryptocurrency":
-                        
-                        end = date.today()
-                        if date.weekday(end) == 0:
-                            
-                            start = end - timedelta(days=4)
-                        elif date.weekday(end) == 5:
-                            
-                            start = end - timedelta(days=2)
-                        elif date.weekday(end) == 6:
-                            
-                            start = end - timedelta(days=3)
-                        else:
-                            
-                            start = end - timedelta(days=2)
-                            if date.weekday(start) == 5:
-                                
-                                start = start - timedelta(days=1)
-                            elif date.weekday(start) == 6:
-                                
-                                start = start - timedelta(days=2)
-                        end_date = end.strftime("%Y-%m-%d")
-                        start_date = start.strftime("%Y-%m-%d")
-                        asset_data = yf.download(asset.ticker, start=start_date, end=end_date, progress=False)
-                        asset_data.dropna()
-                        asset_return = np.round(((asset_data["Adj Close"][-1] - asset_data["Adj Close"][0])/asset_data["Adj Close"][0])*100, 2)
-                    elif time_period == "1d" and asset.category.lower() == "cryptocurrency":
-                        
-                        end = date.today()
-                        start = end - timedelta(days=1)
-                        end_date = end.strftime("%Y-%m-%d")
-                        start_date = start.strftime("%Y-%m-%d")
-                        asset_data = yf.download(asset.ticker, start=start_date, end=end_date, progress=False)
-                        asset_data.dropna()
-                        asset_return = np.round(((asset_data["Adj Close"][-1] - asset_data["Adj Close"][0])/asset_data["Adj Close"][0])*100, 2)
-                    else:
-                        
-                        asset_data = yf.download(asset.ticker, period=time_period, progress=False)
-                        asset_data.dropna()
-                        asset_return = np.round(((asset_data["Adj Close"][-1] - asset_data["Adj Close"][0])/asset_data["Adj Close"][0])*100, 2)
-                    asset_return_list_info.append(asset_return)
-                data.append(asset_return_list_info)
-            else:
+            if not isinstance(asset, Asset):
                 
                 raise TypeError("Invalid type! The elements of the list must be an Asset.")
-        asset_returns_pd = pd.DataFrame(data=data, columns=columns_list)
+        columns_list = ["Asset"]
+        columns_list.extend([f"Return (%) - {time_period}" for time_period in Asset.VALIDS_TIME_PERIODS])
+        if len(assets_list) == 0:
+            
+            return pd.DataFrame(columns=columns_list)
+        tickers_list = list(dict.fromkeys(asset.ticker for asset in assets_list))
+        price_matrix = get_price_store().price_matrix(tickers=tickers_list, time_period="max")
+        returns = returns_for_all_time_periods(price_matrix=price_matrix, time_periods=Asset.VALIDS_TIME_PERIODS)
+        assets_returns = returns.T.reindex([asset.ticker for asset in assets_list])
+        asset_returns_pd = pd.DataFrame(data=assets_returns.to_numpy(), columns=columns_list[1:])
+        asset_returns_pd.insert(0, "Asset", [asset.name for asset in assets_list])
         return asset_returns_pd
     else:
         
@@ -204,7 +169,7 @@ def get_asset_data_in_a_custom_time_period(asset: Asset, start_date: str, end_da
                             start_date_obj = start_date_obj - timedelta(days=2)
                             start_date = start_date_obj.strftime("%Y-%m-%d")
                         asset_data = yf.download(asset.ticker, start=start_date, end=end_date_str, progress=False)
-                        asset_data.dropna()
+                        asset_data = asset_data.dropna(how="all")
                         asset_data["Date"] = asset_data.index
                         columns_list = ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"]
                         for column in columns_list:
@@ -243,7 +208,7 @@ def get_asset_data_in_a_custom_time_period(asset: Asset, start_date: str, end_da
                             start_date_obj = start_date_obj - timedelta(days=2)
                             start_date = start_date_obj.strftime("%Y-%m-%d")
                         asset_data = yf.download(asset.ticker, start=start_date, end=end_date, progress=False)
-                        asset_data.dropna()
+                        asset_data = asset_data.dropna(how="all")
                         asset_data["Date"] = asset_data.index
                         columns_list = ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"]
                         for column in columns_list:
@@ -260,7 +225,7 @@ def get_asset_data_in_a_custom_time_period(asset: Asset, start_date: str, end_da
                     else:
                         
                         asset_data = yf.download(asset.ticker, start=start_date, end=end_date, progress=False)
-                        asset_data.dropna()
+                        asset_data = asset_data.dropna(how="all")
                         asset_data["Date"] = asset_data.index
                         columns_list = ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"]
                         for column in columns_list:
@@ -300,7 +265,7 @@ def get_asset_data_in_a_time_period(asset: Asset, time_period: str) -> DataFrame
         if time_period in Asset.VALIDS_TIME_PERIODS:
             
             asset_data = yf.download(asset.ticker, period=time_period, progress=False)
-            asset_data.dropna()
+            asset_data = asset_data.dropna(how="all")
             asset_data["Date"] = asset_data.index
             columns_list = ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"]
             for column in columns_list:
@@ -321,11 +286,13 @@ def get_asset_data_in_a_time_period(asset: Asset, time_period: str) -> DataFrame
         
         raise TypeError("Invalid types! This function expects a str and an Asset class as input.")
     
-def today_asset_info(assets_list: List[Asset]) -> DataFrame:
+def today_asset_info(assets_list: List[Asset], interval: Optional[str] = None) -> DataFrame:
     """Obtain the information about the assets through Yahoo Finance API.
 
     Args:
         assets_list (List[Asset]): A list with the assets.
+        interval (Optional[str], optional): An intraday bar interval (for instance: 1m or 5m) used to build
+        the statistics of the current session from intraday bars. Defaults to None.
 
     Raises:
         TypeError: If the elements of the list are not equal to a Asset class.
@@ -334,7 +301,23 @@ def today_asset_info(assets_list: List[Asset]) -> DataFrame:
     Returns:
         DataFrame: A table with today information about the assets.
     """
-    if isinstance(assets_list, List):
+    if isinstance(assets_list, List) and interval is not None:
+        
+        if not all(isinstance(asset, Asset) for asset in assets_list):
+            
+            raise TypeError("Invalid type! The elements of the list must be an Asset.")
+        tickers_list = [asset.ticker for asset in assets_list]
+        price_store = get_price_store()
+        intraday_bars = price_store.intraday_bars(tickers=tickers_list, interval=interval, time_period="1d")
+        # The return is measured from the previous close, as in the daily statistics.
+        previous_closes = price_store.price_matrix(tickers=tickers_list, field="Close", time_period="5d")
+        session_summary = intraday_bars.last_session_summary(previous_closes=previous_closes).reindex(tickers_list)
+        session_summary[["Open", "High", "Low", "Close"]] = np.round(session_summary[["Open", "High", "Low", "Close"]].astype(np.float64), 2)
+        session_summary.insert(5, "Adj Close", session_summary["Close"])
+        session_summary.insert(0, "Asset", [asset.name for asset in assets_list])
+        session_summary.reset_index(drop=True, inplace=True)
+        return session_summary
+    elif isinstance(assets_list, List):
         
         data = []
         for asset in assets_list:
@@ -346,7 +329,7 @@ def today_asset_info(assets_list: List[Asset]) -> DataFrame:
                 start = today - timedelta(days=2)
                 start_date = start.strftime("%Y-%m-%d")
                 asset_data = yf.download(asset.ticker, start=start_date, end=end_date, progress=False)
-                asset_data.dropna()
+                asset_data = asset_data.dropna(how="all")
                 asset_return = np.round(((asset_data["Adj Close"][-1] - asset_data["Adj Close"][0])/asset_data["Adj Close"][0])*100, 2)
                 columns_list = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
                 for column in columns_list:
@@ -0,0 +1,250 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from asset import Asset
+from asset.asset_tools import asset_return_for_all_time_periods
+from market_data import FramePriceProvider, PriceStore, generate_synthetic_panel, set_price_store
+from pandas import DataFrame
+from portfolio import Portfolio
+from portfolio.portfolio_tools import _calculate_returns_for_all_time_periods, _set_quadratic_program, numpy_portfolio_optimization, qaoa_portfolio_optimization, vqe_portfolio_optimization
+from typing import Callable, Dict, List, Optional
+
+
+DEFAULT_UNIVERSE_SIZES = [10, 100, 1000, 5000]
+DEFAULT_HISTORY_DAYS = [252, 1260, 2520]
+DEFAULT_MAX_ASSETS = {
+    "_set_quadratic_program": 1000,
+    "numpy_portfolio_optimization": 16,
+    "vqe_portfolio_optimization": 6,
+    "qaoa_portfolio_optimization": 6,
+}
+
+
+def make_fixture_panel(num_tickers: int, num_days: int, seed: int = 0) -> DataFrame:
+    """Creates a reproducible synthetic daily panel that ends today.
+
+    Args:
+        num_tickers (int): The number of tickers.
+        num_days (int): The number of business days.
+        seed (int, optional): The seed of the generator. Defaults to 0.
+
+    Returns:
+        DataFrame: A table with a (field, ticker) column index and a DatetimeIndex.
+    """
+    start_date = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=num_days)[0]
+    tickers = [f"T{number:05d}" for number in range(num_tickers)]
+    return generate_synthetic_panel(tickers=tickers, start_date=start_date.strftime("%Y-%m-%d"), seed=seed)
+
+def _fixture_portfolio(panel: DataFrame) -> Portfolio:
+    """Creates a portfolio holding one unit of every ticker of a panel.
+
+    Args:
+        panel (DataFrame): A table with a (field, ticker) column index.
+
+    Returns:
+        Portfolio: The portfolio.
+    """
+    tickers = list(dict.fromkeys(panel.columns.get_level_values(1)))
+    return Portfolio(assets=[Asset(name=ticker, ticker=ticker, category="stocks", amount=1.0, currency="USD") for ticker in tickers])
+
+def _benchmark_cases(panel: DataFrame, portfolio: Portfolio) -> Dict[str, Callable[[], object]]:
+    """Lists the measured functions, each one ready to be called without arguments.
+
+    Args:
+        panel (DataFrame): The fixture panel.
+        portfolio (Portfolio): The fixture portfolio.
+
+    Returns:
+        Dict[str, Callable[[], object]]: The functions by benchmark name.
+    """
+    start_date = panel.index[0].to_pydatetime()
+    end_date = (panel.index[-1] + pd.Timedelta(days=1)).to_pydatetime()
+    budget = max(1, len(portfolio.assets)//2)
+    optimization_arguments = {"input_portfolio": portfolio, "start_date": start_date, "end_date": end_date, "risk_factor": 0.5, "budget": budget}
+    return {
+        "asset_return_for_all_time_periods": lambda: asset_return_for_all_time_periods(assets_list=portfolio.assets),
+        "_calculate_returns_for_all_time_periods": lambda: _calculate_returns_for_all_time_periods(portfolio=portfolio),
+        "correlation_between_assets": lambda: portfolio.correlation_between_assets(time_period="max"),
+        "_set_quadratic_program": lambda: _set_quadratic_program(**optimization_arguments),
+        "numpy_portfolio_optimization": lambda: numpy_portfolio_optimization(**optimization_arguments),
+        "vqe_portfolio_optimization": lambda: vqe_portfolio_optimization(maxiter=50, **optimization_arguments),
+        "qaoa_portfolio_optimization": lambda: qaoa_portfolio_optimization(maxiter=50, **optimization_arguments),
+    }
+
+def time_function(function: Callable[[], object], panel: DataFrame, repeat: int) -> List[float]:
+    """Times a function, each run starting from an empty price store fed by the fixture panel.
+
+    Args:
+        function (Callable[[], object]): The function.
+        panel (DataFrame): The fixture panel.
+        repeat (int): The number of runs.
+
+    Returns:
+        List[float]: The duration of each run in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        
+        set_price_store(price_store=PriceStore(provider=FramePriceProvider(panel=panel)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+    return durations
+
+def run_benchmarks(universe_sizes: List[int], history_days: List[int], repeat: int = 3, benchmarks: Optional[List[str]] = None, max_assets: Optional[Dict[str, int]] = None, seed: int = 0) -> dict:
+    """Runs every benchmark for every universe size and history length.
+
+    The optimizers grow exponentially (or through large quadratic programs)
+    with the number of assets, so each benchmark is skipped above its maximum
+    number of assets. A benchmark whose optional dependency is missing is
+    recorded as skipped as well.
+
+    Args:
+        universe_sizes (List[int]): The numbers of assets.
+        history_days (List[int]): The numbers of business days of history.
+        repeat (int, optional): The number of runs of each measure. Defaults to 3.
+        benchmarks (Optional[List[str]], optional): The benchmarks to run. Defaults to None (all).
+        max_assets (Optional[Dict[str, int]], optional): The maximum number of assets by benchmark. Defaults to DEFAULT_MAX_ASSETS.
+        seed (int, optional): The seed of the fixture panels. Defaults to 0.
+
+    Returns:
+        dict: The metadata of the run and one result per benchmark, universe size and history length.
+    """
+    if max_assets is None:
+        
+        max_assets = DEFAULT_MAX_ASSETS
+    results = []
+    skipped_benchmarks: Dict[str, str] = {}
+    for num_days in history_days:
+        
+        for num_assets in universe_sizes:
+            
+            panel = make_fixture_panel(num_tickers=num_assets, num_days=num_days, seed=seed)
+            portfolio = _fixture_portfolio(panel=panel)
+            for name, function in _benchmark_cases(panel=panel, portfolio=portfolio).items():
+                
+                if benchmarks is not None and name not in benchmarks:
+                    
+                    continue
+                result = {"benchmark": name, "assets": num_assets, "days": num_days, "repeat": repeat}
+                if name in skipped_benchmarks:
+                    
+                    result["skipped"] = skipped_benchmarks[name]
+                elif num_assets > max_assets.get(name, num_assets):
+                    
+                    result["skipped"] = f"More than {max_assets[name]} assets."
+                else:
+                    
+                    try:
+                        
+                        durations = time_function(function=function, panel=panel, repeat=repeat)
+                        result["best"] = min(durations)
+                        result["median"] = statistics.median(durations)
+                    except ImportError as error:
+                        
+                        skipped_benchmarks[name] = f"Missing dependency: {error}"
+                        result["skipped"] = skipped_benchmarks[name]
+                print(_format_result(result=result))
+                results.append(result)
+    metadata = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "seed": seed,
+    }
+    return {"metadata": metadata, "results": results}
+
+def _format_result(result: dict) -> str:
+    """Formats a result as a line of the report.
+
+    Args:
+        result (dict): The result.
+
+    Returns:
+        str: The line.
+    """
+    case = f"{result['benchmark']:<40} {result['assets']:>6} assets {result['days']:>6} days"
+    if "skipped" in result:
+        
+        return f"{case}  skipped ({result['skipped']})"
+    return f"{case}  best {result['best']:.4f}s  median {result['median']:.4f}s"
+
+def compare_results(baseline: dict, current: dict, tolerance: float = 0.25) -> List[str]:
+    """Compares two benchmark runs and lists the measures that became slower.
+
+    Args:
+        baseline (dict): The reference run.
+        current (dict): The new run.
+        tolerance (float, optional): The accepted relative slowdown of the best duration. Defaults to 0.25.
+
+    Returns:
+        List[str]: The regressions found, empty if none.
+    """
+    baseline_results = {(result["benchmark"], result["assets"], result["days"]): result for result in baseline["results"] if "best" in result}
+    regressions = []
+    for result in current["results"]:
+        
+        key = (result["benchmark"], result["assets"], result["days"])
+        if "best" in result and key in baseline_results:
+            
+            reference = baseline_results[key]["best"]
+            if result["best"] > reference*(1 + tolerance):
+                
+                regressions.append(f"{_format_result(result=result)}  was {reference:.4f}s (+{(result['best']/reference - 1)*100:.1f}%)")
+    return regressions
+
+def main() -> int:
+    """Runs the benchmark suite or compares two runs from the command line.
+
+    Returns:
+        int: The exit code, 1 if a regression is found.
+    """
+    parser = argparse.ArgumentParser(description="Offline benchmarks of the data, analytics and optimization hot paths.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Runs the benchmarks and stores the results as .json.")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="The path to the .json results.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_UNIVERSE_SIZES, help="The universe sizes.")
+    run_parser.add_argument("--days", type=int, nargs="+", default=DEFAULT_HISTORY_DAYS, help="The history lengths in business days.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="The number of runs of each measure.")
+    run_parser.add_argument("--benchmarks", nargs="+", default=None, help="The benchmarks to run.")
+    run_parser.add_argument("--seed", type=int, default=0, help="The seed of the fixture panels.")
+    compare_parser = subparsers.add_parser("compare", help="Compares two .json results.")
+    compare_parser.add_argument("baseline", help="The path to the reference results.")
+    compare_parser.add_argument("current", help="The path to the new results.")
+    compare_parser.add_argument("--tolerance", type=float, default=0.25, help="The accepted relative slowdown.")
+    arguments = parser.parse_args()
+    if arguments.command == "run":
+        
+        report = run_benchmarks(universe_sizes=arguments.sizes, history_days=arguments.days, repeat=arguments.repeat, benchmarks=arguments.benchmarks, seed=arguments.seed)
+        with open(arguments.output, "w") as results_file:
+            
+            json.dump(report, results_file, indent=2)
+        return 0
+    with open(arguments.baseline) as baseline_file, open(arguments.current) as current_file:
+        
+        regressions = compare_results(baseline=json.load(baseline_file), current=json.load(current_file), tolerance=arguments.tolerance)
+    for regression in regressions:
+        
+        print(regression)
+    return 1 if len(regressions) != 0 else 0
+
+
+if __name__ == "__main__":
+    
+    sys.exit(main())
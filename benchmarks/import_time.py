@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_IMPORTS = {
+    "asset": "from asset import Asset",
+    "portfolio": "from portfolio import Portfolio",
+}
+HEAVY_MODULES = ["qiskit", "qiskit_finance", "qiskit_optimization", "matplotlib", "seaborn", "yfinance"]
+DEFAULT_IMPORT_BUDGET = 1.0
+
+
+def measure_import_time(statement: str, repeat: int = 5) -> Dict[str, object]:
+    """Measures the import time of a statement in fresh interpreters, so the import cache does not hide the cost.
+
+    Args:
+        statement (str): The import statement. For instance: from portfolio import Portfolio
+        repeat (int, optional): The number of interpreters. Defaults to 5.
+
+    Returns:
+        Dict[str, object]: The best import time in seconds and the heavy modules loaded by the statement.
+    """
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))\n"
+    )
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(path for path in [REPOSITORY_FOLDER, environment.get("PYTHONPATH", "")] if path)
+    measures = []
+    for _ in range(repeat):
+        
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=REPOSITORY_FOLDER, env=environment)
+        measures.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {"seconds": min(measure["seconds"] for measure in measures), "loaded": measures[0]["loaded"]}
+
+def check_import_budget(budget: float = DEFAULT_IMPORT_BUDGET, repeat: int = 5) -> List[str]:
+    """Checks that every core package imports within the budget and without loading the heavy optional dependencies.
+
+    Args:
+        budget (float, optional): The maximum import time of each core package in seconds. Defaults to DEFAULT_IMPORT_BUDGET.
+        repeat (int, optional): The number of interpreters of each measure. Defaults to 5.
+
+    Returns:
+        List[str]: The failures found, empty if the budget is kept.
+    """
+    failures = []
+    for name, statement in CORE_IMPORTS.items():
+        
+        measure = measure_import_time(statement=statement, repeat=repeat)
+        print(f"{name}: {measure['seconds']:.3f}s (budget {budget:.3f}s)")
+        if measure["seconds"] > budget:
+            
+            failures.append(f"Importing {name} took {measure['seconds']:.3f}s, over the {budget:.3f}s budget.")
+        if len(measure["loaded"]) != 0:
+            
+            failures.append(f"Importing {name} loaded {measure['loaded']}, which must be loaded on first use.")
+    return failures
+
+def main() -> int:
+    """Runs the startup-time benchmark from the command line.
+
+    Returns:
+        int: The exit code, 1 if the budget is not kept.
+    """
+    parser = argparse.ArgumentParser(description="Checks the import time budget of the core packages.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_IMPORT_BUDGET, help="The maximum import time of each core package in seconds.")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of fresh interpreters of each measure.")
+    arguments = parser.parse_args()
+    failures = check_import_budget(budget=arguments.budget, repeat=arguments.repeat)
+    for failure in failures:
+        
+        print(failure)
+    return 1 if len(failures) != 0 else 0
+
+
+if __name__ == "__main__":
+    
+    sys.exit(main())
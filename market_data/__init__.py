@@ -0,0 +1,9 @@
+"""_summary_
+"""
+from .intraday import IntradayBars, VALIDS_INTERVALS
+from .memo import MemoCache, get_memo_cache, memo_key, set_memo_cache
+from .providers import FramePriceProvider, PriceProvider, YahooPriceProvider
+from .quality import PanelCleaner
+from .price_store import PriceStore, get_price_store, set_price_store, period_boundary_prices, returns_for_all_time_periods
+from .streaming import Quote, QuoteFeed, ReplayQuoteFeed, write_replay_file
+from .synthetic import SyntheticPriceProvider, generate_synthetic_panel, iter_synthetic_panels, write_synthetic_data
\ No newline at end of file
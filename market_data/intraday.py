@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import List, Optional
+
+
+VALIDS_INTERVALS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+class IntradayBars:
+    """Intraday bars class
+
+    The bars of every ticker are stored one after another in flat columnar
+    arrays (int64 epoch seconds, float32 prices and uint64 volume), and
+    offsets[i]:offsets[i + 1] is the slice that belongs to tickers[i].
+    """
+
+    def __init__(self, tickers: List[str], interval: str, offsets: np.ndarray, timestamps: np.ndarray, open_prices: np.ndarray, high_prices: np.ndarray, low_prices: np.ndarray, close_prices: np.ndarray, volume: np.ndarray) -> None:
+        """
+        Args:
+            tickers (List[str]): The tickers.
+            interval (str): The bar interval. For instance: 5m
+            offsets (np.ndarray): The start of the bars of each ticker, followed by the total number of bars.
+            timestamps (np.ndarray): The epoch seconds of the bars.
+            open_prices (np.ndarray): The open prices.
+            high_prices (np.ndarray): The high prices.
+            low_prices (np.ndarray): The low prices.
+            close_prices (np.ndarray): The close prices.
+            volume (np.ndarray): The volume.
+
+        Raises:
+            ValueError: If the interval is not valid.
+            ValueError: If the number of offsets does not match the number of tickers.
+        """
+        if interval not in VALIDS_INTERVALS:
+            
+            raise ValueError(f"Invalid interval! The valids intervals are {list(VALIDS_INTERVALS.keys())}.")
+        if len(offsets) != len(tickers) + 1:
+            
+            raise ValueError("The number of offsets must be equal to the number of tickers plus one.")
+        self.tickers = tickers
+        self.interval = interval
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.open = np.asarray(open_prices, dtype=np.float32)
+        self.high = np.asarray(high_prices, dtype=np.float32)
+        self.low = np.asarray(low_prices, dtype=np.float32)
+        self.close = np.asarray(close_prices, dtype=np.float32)
+        self.volume = np.asarray(volume, dtype=np.uint64)
+
+    @classmethod
+    def from_panel(cls, panel: DataFrame, interval: str) -> "IntradayBars":
+        """Creates the compact bars from a table with a (field, ticker) column index.
+
+        Args:
+            panel (DataFrame): A table with a (field, ticker) column index and a DatetimeIndex.
+            interval (str): The bar interval.
+
+        Returns:
+            IntradayBars: The bars of every ticker of the table.
+        """
+        tickers = list(panel["Close"].columns)
+        epoch_seconds = panel.index.to_numpy(dtype="datetime64[s]").astype(np.int64)
+        close_prices = panel["Close"].to_numpy(dtype=np.float64).T
+        valid = ~np.isnan(close_prices)
+        counts = valid.sum(axis=1)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        timestamps = np.broadcast_to(epoch_seconds, close_prices.shape)[valid]
+        fields_values = {}
+        for field in ["Open", "High", "Low", "Volume"]:
+            
+            values = panel[field].reindex(columns=tickers).to_numpy(dtype=np.float64).T[valid]
+            fields_values[field] = np.nan_to_num(values)
+        return cls(tickers=tickers, interval=interval, offsets=offsets, timestamps=timestamps, open_prices=fields_values["Open"], high_prices=fields_values["High"], low_prices=fields_values["Low"], close_prices=close_prices[valid], volume=fields_values["Volume"])
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The total number of bars.
+        """
+        return len(self.timestamps)
+
+    def nbytes(self) -> int:
+        """Calculates the memory used by the bars arrays.
+
+        Returns:
+            int: The number of bytes.
+        """
+        arrays = [self.offsets, self.timestamps, self.open, self.high, self.low, self.close, self.volume]
+        return sum(array.nbytes for array in arrays)
+
+    def ticker_bars(self, ticker: str) -> DataFrame:
+        """Builds a table with the bars of one ticker.
+
+        Args:
+            ticker (str): The ticker.
+
+        Raises:
+            ValueError: If the ticker is not in the bars.
+
+        Returns:
+            DataFrame: A table with the Date, Open, High, Low, Close and Volume of the bars.
+        """
+        if ticker in self.tickers:
+            
+            position = self.tickers.index(ticker)
+            start, end = self.offsets[position], self.offsets[position + 1]
+            bars_pd = pd.DataFrame(data={
+                "Date": pd.to_datetime(self.timestamps[start:end], unit="s"),
+                "Open": self.open[start:end],
+                "High": self.high[start:end],
+                "Low": self.low[start:end],
+                "Close": self.close[start:end],
+                "Volume": self.volume[start:end],
+            })
+            return bars_pd
+        else:
+            
+            raise ValueError(f"The ticker {ticker} is not in the bars.")
+
+    def resample(self, interval: str) -> "IntradayBars":
+        """Aggregates the bars of every ticker to a coarser interval in a single vectorized pass.
+
+        Args:
+            interval (str): The new bar interval. It must be coarser than the current interval.
+
+        Raises:
+            ValueError: If the new interval is not valid or is finer than the current interval.
+
+        Returns:
+            IntradayBars: The aggregated bars.
+        """
+        if interval not in VALIDS_INTERVALS or VALIDS_INTERVALS[interval] < VALIDS_INTERVALS[self.interval]:
+            
+            raise ValueError("Invalid interval! The new interval must be valid and coarser than the current one.")
+        if len(self) == 0:
+            
+            return IntradayBars(tickers=self.tickers, interval=interval, offsets=self.offsets, timestamps=self.timestamps, open_prices=self.open, high_prices=self.high, low_prices=self.low, close_prices=self.close, volume=self.volume)
+        step = VALIDS_INTERVALS[interval]
+        buckets = (self.timestamps//step)*step
+        new_group = np.ones(len(buckets), dtype=bool)
+        new_group[1:] = buckets[1:] != buckets[:-1]
+        new_group[self.offsets[:-1][self.offsets[:-1] < len(buckets)]] = True
+        starts = np.flatnonzero(new_group)
+        ends = np.append(starts[1:], len(buckets))
+        offsets = np.searchsorted(starts, self.offsets, side="left")
+        return IntradayBars(
+            tickers=self.tickers,
+            interval=interval,
+            offsets=offsets,
+            timestamps=buckets[starts],
+            open_prices=self.open[starts],
+            high_prices=np.maximum.reduceat(self.high, starts),
+            low_prices=np.minimum.reduceat(self.low, starts),
+            close_prices=self.close[ends - 1],
+            volume=np.add.reduceat(self.volume, starts),
+        )
+
+    def last_session_summary(self, previous_closes: Optional[DataFrame] = None) -> DataFrame:
+        """Summarizes the most recent session of every ticker from its bars.
+
+        Args:
+            previous_closes (Optional[DataFrame], optional): The daily closes with dates as rows and tickers as columns.
+            The return of a session is measured from the last close before it, as in the daily statistics.
+            Defaults to None (from the open of the session).
+
+        Returns:
+            DataFrame: A table indexed by ticker with the Return (%), Open, High, Low, Close and Volume of the session.
+        """
+        columns_list = ["Return (%)", "Open", "High", "Low", "Close", "Volume"]
+        if len(self) == 0:
+            
+            return pd.DataFrame(index=self.tickers, columns=columns_list, dtype=np.float64)
+        daily_bars = self.resample(interval="1d")
+        has_bars = daily_bars.offsets[1:] > daily_bars.offsets[:-1]
+        last = np.maximum(daily_bars.offsets[1:] - 1, 0)
+        reference_prices = daily_bars.open[last].astype(np.float64)
+        if previous_closes is not None:
+            
+            closes = previous_closes.reindex(columns=self.tickers).ffill()
+            session_dates = pd.to_datetime(daily_bars.timestamps[last], unit="s")
+            positions = closes.index.searchsorted(session_dates, side="left") - 1
+            reference_prices = np.where(positions >= 0, closes.to_numpy(dtype=np.float64)[np.maximum(positions, 0), np.arange(len(self.tickers))], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            session_return = np.round(((daily_bars.close[last].astype(np.float64) - reference_prices)/reference_prices)*100, 2)
+        summary_pd = pd.DataFrame(data={
+            "Return (%)": session_return,
+            "Open": daily_bars.open[last],
+            "High": daily_bars.high[last],
+            "Low": daily_bars.low[last],
+            "Close": daily_bars.close[last],
+            "Volume": daily_bars.volume[last],
+        }, index=self.tickers)
+        summary_pd.loc[~has_bars, :] = np.nan
+        return summary_pd
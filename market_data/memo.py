@@ -0,0 +1,171 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from tools.instrumentation import increment
+
+
+# The shorter the window, the faster its last prices change, so its results
+# are kept for less time (in seconds).
+DEFAULT_TTL_SECONDS = {
+    "1m": 15,
+    "5m": 30,
+    "15m": 60,
+    "30m": 120,
+    "60m": 300,
+    "1h": 300,
+    "1d": 60,
+    "5d": 300,
+    "1mo": 900,
+    "3mo": 1800,
+    "6mo": 3600,
+    "1y": 3600,
+    "ytd": 3600,
+    "2y": 2*3600,
+    "5y": 6*3600,
+    "10y": 12*3600,
+    "max": 12*3600,
+}
+DEFAULT_TTL = 300
+
+
+def memo_key(kind: str, provider_name: str, tickers: List[str], window: str, interval: str = "1d", *extra: Hashable) -> Tuple:
+    """Builds the key of a memoized result.
+
+    Args:
+        kind (str): The kind of result. For instance: correlation
+        provider_name (str): The name of the price provider.
+        tickers (List[str]): The tickers, in the order of the result.
+        window (str): The time period or the date range of the data.
+        interval (str, optional): The bar interval. Defaults to "1d".
+        *extra (Hashable): Any other argument of the result.
+
+    Returns:
+        Tuple: The key.
+    """
+    return (kind, provider_name, tuple(tickers), window, interval) + extra
+
+
+class MemoCache:
+    """Memoization cache class
+
+    Keeps the results of repeated analytics calls in memory, with a bounded
+    size, least recently used eviction and a time to live that depends on the
+    window of the data.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: Optional[Dict[str, float]] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            max_size (int, optional): The maximum number of results. Defaults to 256.
+            ttl_seconds (Optional[Dict[str, float]], optional): The time to live by window or interval. Defaults to DEFAULT_TTL_SECONDS.
+            clock (Callable[[], float], optional): The clock in seconds. Defaults to time.monotonic.
+
+        Raises:
+            TypeError: If max_size is not an int.
+            ValueError: If max_size is not positive.
+        """
+        if isinstance(max_size, int):
+            
+            if max_size <= 0:
+                
+                raise ValueError("The max_size must be positive.")
+            self.max_size = max_size
+        else:
+            
+            raise TypeError("Invalid type! The max_size must be an int.")
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS) if ttl_seconds is None else dict(ttl_seconds)
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, window: str, interval: str = "1d") -> float:
+        """Finds the time to live of a result. Intraday bars use the time to live of their interval.
+
+        Args:
+            window (str): The time period of the data.
+            interval (str, optional): The bar interval. Defaults to "1d".
+
+        Returns:
+            float: The time to live in seconds.
+        """
+        if interval != "1d":
+            
+            return self.ttl_seconds.get(interval, DEFAULT_TTL)
+        return self.ttl_seconds.get(window, DEFAULT_TTL)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Obtains a result that has not expired yet and marks it as the most recently used.
+
+        Args:
+            key (Tuple): The key of the result.
+
+        Returns:
+            Optional[Any]: The result, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            
+            expires_at, value = entry
+            if expires_at > self.clock():
+                
+                self._entries.move_to_end(key)
+                increment("memo.hits")
+                return value
+            del self._entries[key]
+        increment("memo.misses")
+        return None
+
+    def put(self, key: Tuple, value: Any, ttl: float) -> None:
+        """Stores a result, evicting the least recently used results above the maximum size.
+
+        Args:
+            key (Tuple): The key of the result.
+            value (Any): The result.
+            ttl (float): The time to live in seconds.
+        """
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            
+            self._entries.popitem(last=False)
+            increment("memo.evictions")
+
+    def clear(self) -> None:
+        """Removes every result."""
+        self._entries.clear()
+
+
+_shared_memo_cache: Optional[MemoCache] = None
+
+
+def get_memo_cache() -> MemoCache:
+    """Obtains the memoization cache shared by the analytics calls of the session.
+
+    Returns:
+        MemoCache: The shared memoization cache.
+    """
+    global _shared_memo_cache
+    if _shared_memo_cache is None:
+        
+        _shared_memo_cache = MemoCache()
+    return _shared_memo_cache
+
+
+def set_memo_cache(memo_cache: MemoCache) -> None:
+    """Replaces the shared memoization cache. For instance, to change its size or its time to live.
+
+    Args:
+        memo_cache (MemoCache): The new memoization cache.
+
+    Raises:
+        TypeError: If the input is not a MemoCache.
+    """
+    global _shared_memo_cache
+    if isinstance(memo_cache, MemoCache):
+        
+        _shared_memo_cache = memo_cache
+    else:
+        
+        raise TypeError("Invalid type! The input must be a MemoCache.")
@@ -0,0 +1,615 @@
+import numpy as np
+import pandas as pd
+from datetime import date
+from pandas import DataFrame, DatetimeIndex, Series, Timestamp
+from typing import Dict, List, Optional, Tuple
+from .intraday import IntradayBars, VALIDS_INTERVALS
+from .memo import get_memo_cache
+from .providers import PriceProvider, YahooPriceProvider
+from .quality import PanelCleaner, empty_quality_report
+from tools.instrumentation import increment, timed
+
+
+VALIDS_TIME_PERIODS = [
+    "1d",
+    "5d",
+    "1mo",
+    "3mo",
+    "6mo",
+    "1y",
+    "2y",
+    "5y",
+    "10y",
+    "ytd",
+    "max",
+]
+# The "1d" return needs two closes, so the shortest download that is sure to
+# contain them (weekends and holidays included) is used instead.
+_DOWNLOAD_TIME_PERIOD = {"1d": "5d"}
+_ROW_BASED_TIME_PERIODS = {"1d": 2, "5d": 5}
+ADJUSTMENT_FACTOR_FIELD = "Adj Factor"
+# Quotes in a minor unit (pence, cents) are converted to the major currency.
+MINOR_CURRENCY_UNITS = {
+    "GBp": ("GBP", 0.01),
+    "GBX": ("GBP", 0.01),
+    "ZAc": ("ZAR", 0.01),
+    "ILA": ("ILS", 0.01),
+}
+# The ISO 4217 currencies whose rates are quoted as "XXXYYY=X". The other
+# quote currencies (BTC, ETH, ...) are cryptocurrencies quoted as "XXX-YYY".
+FIAT_CURRENCIES = frozenset([
+    "AED", "ARS", "AUD", "BGN", "BRL", "CAD", "CHF", "CLP", "CNY", "COP", "CZK", "DKK", "EGP", "EUR", "GBP", "HKD",
+    "HUF", "IDR", "ILS", "INR", "ISK", "JPY", "KRW", "KWD", "MXN", "MYR", "NGN", "NOK", "NZD", "PEN", "PHP", "PKR",
+    "PLN", "QAR", "RON", "RUB", "SAR", "SEK", "SGD", "THB", "TRY", "TWD", "UAH", "USD", "VND", "ZAR",
+])
+_OFFSET_TIME_PERIODS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def _required_start_date(time_period: str, end: Timestamp) -> Timestamp:
+    """Calculates the earliest date that a download of a time period must cover.
+
+    Args:
+        time_period (str): A time period valid in the Yahoo Finance API.
+        end (Timestamp): The last date of the period.
+
+    Returns:
+        Timestamp: The earliest date needed by the time period.
+    """
+    if time_period in _ROW_BASED_TIME_PERIODS:
+        
+        return end - pd.Timedelta(days=7)
+    elif time_period in _OFFSET_TIME_PERIODS:
+        
+        return end - _OFFSET_TIME_PERIODS[time_period]
+    elif time_period == "ytd":
+        
+        return Timestamp(year=end.year, month=1, day=1)
+    else:
+        
+        return Timestamp.min
+
+
+def fx_ticker(currency: str, base_currency: str) -> str:
+    """Builds the Yahoo Finance ticker of an exchange rate.
+
+    Args:
+        currency (str): The quote currency.
+        base_currency (str): The base currency.
+
+    Returns:
+        str: The ticker of the rate that gives the value of one unit of currency in the base currency.
+        For instance: EURUSD=X, or BTC-USD for a cryptocurrency.
+    """
+    if currency in FIAT_CURRENCIES and base_currency in FIAT_CURRENCIES:
+        
+        return f"{currency}{base_currency}=X"
+    return f"{currency}-{base_currency}"
+
+
+def split_adjustment_factor(data: DataFrame) -> DataFrame:
+    """Replaces the adjusted close of a downloaded table by the adjustment factor.
+
+    The adjusted series are derived again from the raw series and the factor,
+    so both come from a single stored copy.
+
+    Args:
+        data (DataFrame): A table with a (field, ticker) column index.
+
+    Returns:
+        DataFrame: The same table with an adjustment factor field instead of the adjusted close.
+    """
+    fields = data.columns.get_level_values(0)
+    if "Adj Close" in fields and "Close" in fields:
+        
+        adjustment_factor = (data["Adj Close"]/data["Close"]).astype(np.float64)
+        adjustment_factor.columns = pd.MultiIndex.from_product([[ADJUSTMENT_FACTOR_FIELD], adjustment_factor.columns])
+        data = pd.concat([data.drop(columns="Adj Close", level=0), adjustment_factor], axis=1)
+    return data
+
+
+def period_start_position(index: DatetimeIndex, time_period: str) -> int:
+    """Finds the row where a time period starts in a sorted date index.
+
+    Args:
+        index (DatetimeIndex): A sorted date index that ends at the most recent date.
+        time_period (str): A time period valid in the Yahoo Finance API.
+
+    Raises:
+        ValueError: If the time period is not valid.
+
+    Returns:
+        int: The position of the first row of the time period.
+    """
+    if time_period not in VALIDS_TIME_PERIODS:
+        
+        raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+    if len(index) == 0:
+        
+        return 0
+    if time_period in _ROW_BASED_TIME_PERIODS:
+        
+        return max(len(index) - _ROW_BASED_TIME_PERIODS[time_period], 0)
+    elif time_period == "max":
+        
+        return 0
+    else:
+        
+        start = _required_start_date(time_period=time_period, end=index[-1])
+        return int(index.searchsorted(start, side="left"))
+
+
+def period_start_positions(price_matrix: DataFrame, time_period: str) -> np.ndarray:
+    """Finds the row where a time period starts for every ticker of a price table, on the ticker's own prices.
+
+    The tickers of a table can trade on different calendars (cryptocurrencies
+    on weekends, futures on other holidays), so the rows of the row-based time
+    periods ("1d" and "5d") are counted on the rows where each ticker has a
+    price, and the other time periods start on the first price of each ticker
+    from the start date of the time period.
+
+    Args:
+        price_matrix (DataFrame): A table of prices with dates as rows and tickers as columns.
+        time_period (str): A time period valid in the Yahoo Finance API.
+
+    Raises:
+        ValueError: If the time period is not valid.
+
+    Returns:
+        np.ndarray: The position of the first price of each ticker. The tickers without prices in the time period
+        get the start of the time period on the whole table.
+    """
+    table_start = period_start_position(index=price_matrix.index, time_period=time_period)
+    valid = price_matrix.notna().to_numpy()
+    if time_period in _ROW_BASED_TIME_PERIODS:
+        
+        # The number of prices of each ticker from each row to the end of the table.
+        ranks_from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+        num_rows = np.minimum(_ROW_BASED_TIME_PERIODS[time_period], ranks_from_end[0]) if len(valid) != 0 else np.zeros(valid.shape[1], dtype=np.int64)
+        in_period = valid & (ranks_from_end == num_rows)
+    else:
+        
+        in_period = valid & (np.arange(len(valid)) >= table_start)[:, None]
+    has_prices = in_period.any(axis=0)
+    return np.where(has_prices, in_period.argmax(axis=0), table_start)
+
+
+def period_boundary_prices(price_matrix: DataFrame, time_periods: Optional[List[str]] = None) -> Tuple[DataFrame, Series]:
+    """Obtains the first and last prices of every ticker for many time periods at once.
+
+    The boundaries of each ticker are found on its own prices (see
+    period_start_positions), so a ticker is not cut by the calendar of the
+    other tickers of the table.
+
+    Args:
+        price_matrix (DataFrame): A table of prices with dates as rows and tickers as columns.
+        time_periods (Optional[List[str]], optional): The time periods. Defaults to all valid time periods.
+
+    Returns:
+        Tuple[DataFrame, Series]: The first price of each ticker for each time period (time periods as rows)
+        and the last price of each ticker.
+    """
+    if time_periods is None:
+        
+        time_periods = VALIDS_TIME_PERIODS
+    with timed("transform.period_boundary_prices"):
+        
+        price_matrix = price_matrix.dropna(how="all")
+        prices = price_matrix.to_numpy(dtype=np.float64)
+        columns = np.arange(prices.shape[1])
+        if len(prices) != 0:
+            
+            first_prices = np.vstack([prices[period_start_positions(price_matrix=price_matrix, time_period=time_period), columns] for time_period in time_periods])
+            last_prices = price_matrix.ffill().to_numpy(dtype=np.float64)[-1]
+        else:
+            
+            first_prices = np.full((len(time_periods), prices.shape[1]), np.nan)
+            last_prices = np.full(prices.shape[1], np.nan)
+    first_prices_pd = pd.DataFrame(data=first_prices, index=time_periods, columns=price_matrix.columns)
+    last_prices_pd = pd.Series(data=last_prices, index=price_matrix.columns)
+    return first_prices_pd, last_prices_pd
+
+
+def returns_for_all_time_periods(price_matrix: DataFrame, time_periods: Optional[List[str]] = None) -> DataFrame:
+    """Calculates the returns of every ticker for many time periods in a single vectorized step.
+
+    Args:
+        price_matrix (DataFrame): A table of prices with dates as rows and tickers as columns.
+        time_periods (Optional[List[str]], optional): The time periods. Defaults to all valid time periods.
+
+    Returns:
+        DataFrame: A table with the returns (%) with time periods as rows and tickers as columns.
+    """
+    first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=time_periods)
+    returns = np.round(((last_prices.to_numpy() - first_prices.to_numpy())/first_prices.to_numpy())*100, 2)
+    returns_pd = pd.DataFrame(data=returns, index=first_prices.index, columns=first_prices.columns)
+    return returns_pd
+
+
+class PriceStore:
+    """Price store class"""
+
+    def __init__(self, provider: Optional[PriceProvider] = None, clean: bool = True, cleaner: Optional[PanelCleaner] = None) -> None:
+        """
+        Args:
+            provider (Optional[PriceProvider], optional): The source of the prices. Defaults to YahooPriceProvider.
+            clean (bool, optional): If every downloaded table must be cleaned before it is stored. Defaults to True.
+            cleaner (Optional[PanelCleaner], optional): The cleaner of the downloaded tables. Defaults to PanelCleaner().
+
+        Raises:
+            TypeError: If the provider is not a PriceProvider.
+        """
+        if isinstance(provider, PriceProvider):
+            
+            self.provider = provider
+        elif provider is None:
+            
+            self.provider = YahooPriceProvider()
+        else:
+            
+            raise TypeError("Invalid type! The provider must be a PriceProvider.")
+        self.panel = pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=["Field", "Ticker"]))
+        self._coverage: Dict[str, Tuple[Timestamp, Timestamp, date]] = {}
+        self.intraday: Dict[str, IntradayBars] = {}
+        self.clean = clean
+        self.cleaner = PanelCleaner() if cleaner is None else cleaner
+        self.quality_report = empty_quality_report()
+
+    def _is_covered(self, ticker: str, start: Timestamp, end: Timestamp) -> bool:
+        """Checks if the history of a ticker was already loaded for a date range today.
+
+        Args:
+            ticker (str): The ticker.
+            start (Timestamp): The first date needed.
+            end (Timestamp): The last date needed (exclusive).
+
+        Returns:
+            bool: True if the stored history covers the date range.
+        """
+        if ticker in self._coverage:
+            
+            covered_start, covered_end, loaded_on = self._coverage[ticker]
+            return loaded_on == date.today() and covered_start <= start and covered_end >= end
+        return False
+
+    def _download(self, tickers: List[str], time_period: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> DataFrame:
+        """Downloads a table from the provider, recording the time, the rows and the bytes of the fetch.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+            start (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+            end (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            interval (str, optional): The bar interval. Defaults to "1d".
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index.
+        """
+        with timed(f"price_store.fetch.{self.provider.name}"):
+            
+            data = self.provider.download(tickers=tickers, time_period=time_period, start=start, end=end, interval=interval)
+        increment("price_store.fetches")
+        increment("price_store.fetch_rows", len(data))
+        increment("price_store.fetch_bytes", int(data.memory_usage(index=True).sum()))
+        return data
+
+    def _merge(self, data: DataFrame, tickers: List[str], start: Timestamp, end: Timestamp) -> None:
+        """Cleans a downloaded table, once, and merges it into the stored panel.
+
+        Args:
+            data (DataFrame): A table with a (field, ticker) column index.
+            tickers (List[str]): The tickers that were downloaded.
+            start (Timestamp): The first date of the download.
+            end (Timestamp): The last date of the download (exclusive).
+        """
+        data = split_adjustment_factor(data=data)
+        data.columns = data.columns.set_names(["Field", "Ticker"])
+        if self.clean:
+            
+            with timed("transform.clean"):
+                
+                data, report = self.cleaner.clean(panel=data)
+            self.quality_report = pd.concat([self.quality_report.drop(index=report.index, errors="ignore"), report]) if not self.quality_report.empty else report
+        if self.panel.empty:
+            
+            self.panel = data
+        else:
+            
+            self.panel = data.combine_first(self.panel)
+        for ticker in tickers:
+            
+            if ticker in self._coverage and self._coverage[ticker][2] == date.today():
+                
+                covered_start, covered_end, _ = self._coverage[ticker]
+                self._coverage[ticker] = (min(covered_start, start), max(covered_end, end), date.today())
+            else:
+                
+                self._coverage[ticker] = (start, end, date.today())
+
+    def _refresh_tails(self, tickers: List[str], start: Timestamp, end: Timestamp, end_date: Optional[str] = None) -> List[str]:
+        """Downloads again only the outdated end of the histories that already cover the start of a date range.
+
+        Args:
+            tickers (List[str]): The tickers that are not covered.
+            start (Timestamp): The first date needed.
+            end (Timestamp): The last date needed (exclusive).
+            end_date (Optional[str], optional): The end date of the download (format:yyyy-mm-dd). Defaults to None.
+
+        Returns:
+            List[str]: The tickers that still need a full download.
+        """
+        tail_tickers = [ticker for ticker in tickers if ticker in self._coverage and self._coverage[ticker][2] == date.today() and self._coverage[ticker][0] <= start]
+        if len(tail_tickers) != 0:
+            
+            tail_start = min(self._coverage[ticker][1] for ticker in tail_tickers)
+            data = self._download(tickers=tail_tickers, start=tail_start.strftime("%Y-%m-%d"), end=end_date)
+            increment("price_store.tail_refreshes", len(tail_tickers))
+            with timed("price_store.merge"):
+                
+                self._merge(data=data, tickers=tail_tickers, start=tail_start, end=end)
+        return [ticker for ticker in tickers if ticker not in tail_tickers]
+
+    def load(self, tickers: List[str], time_period: Optional[str] = "max", start_date: Optional[str] = None, end_date: Optional[str] = None) -> None:
+        """Loads the history of the tickers that are not stored yet with a single provider request.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to "max".
+            start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). It overrides the time period. Defaults to None.
+            end_date (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+
+        Raises:
+            ValueError: If the time period is not valid.
+            TypeError: If the tickers are not a list.
+        """
+        if isinstance(tickers, list):
+            
+            tomorrow = Timestamp(date.today()) + pd.Timedelta(days=1)
+            if start_date is not None:
+                
+                start = Timestamp(start_date)
+                end = Timestamp(end_date) if end_date is not None else tomorrow
+                missing_tickers = [ticker for ticker in tickers if not self._is_covered(ticker=ticker, start=start, end=end)]
+                increment("price_store.cache_hits", len(tickers) - len(missing_tickers))
+                increment("price_store.cache_misses", len(missing_tickers))
+                missing_tickers = self._refresh_tails(tickers=missing_tickers, start=start, end=end, end_date=end_date)
+                if len(missing_tickers) != 0:
+                    
+                    data = self._download(tickers=missing_tickers, start=start_date, end=end_date)
+                    with timed("price_store.merge"):
+                        
+                        self._merge(data=data, tickers=missing_tickers, start=start, end=end)
+            elif time_period in VALIDS_TIME_PERIODS:
+                
+                start = _required_start_date(time_period=time_period, end=Timestamp(date.today()))
+                missing_tickers = [ticker for ticker in tickers if not self._is_covered(ticker=ticker, start=start, end=tomorrow)]
+                increment("price_store.cache_hits", len(tickers) - len(missing_tickers))
+                increment("price_store.cache_misses", len(missing_tickers))
+                missing_tickers = self._refresh_tails(tickers=missing_tickers, start=start, end=tomorrow)
+                if len(missing_tickers) != 0:
+                    
+                    download_time_period = _DOWNLOAD_TIME_PERIOD.get(time_period, time_period)
+                    data = self._download(tickers=missing_tickers, time_period=download_time_period)
+                    with timed("price_store.merge"):
+                        
+                        self._merge(data=data, tickers=missing_tickers, start=start, end=tomorrow)
+            else:
+                
+                raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        else:
+            
+            raise TypeError("Invalid type! The tickers must be a list.")
+
+    def _field_matrix(self, tickers: List[str], field: str, adjusted: bool) -> DataFrame:
+        """Obtains one stored field for a list of tickers, applying the adjustment factor if needed.
+
+        Args:
+            tickers (List[str]): The tickers.
+            field (str): The price field.
+            adjusted (bool): If the prices must be adjusted for splits and dividends.
+
+        Returns:
+            DataFrame: A table with dates as rows and tickers as columns.
+        """
+        if field == "Adj Close":
+            
+            field = "Close"
+            adjusted = True
+        matrix = self.panel[field].reindex(columns=tickers)
+        if adjusted and field != "Volume" and ADJUSTMENT_FACTOR_FIELD in self.panel.columns.get_level_values(0):
+            
+            adjustment_factor = self.panel[ADJUSTMENT_FACTOR_FIELD].reindex(columns=tickers).fillna(1.0)
+            matrix = matrix*adjustment_factor.to_numpy(dtype=np.float64)
+        return matrix
+
+    def price_matrix(self, tickers: List[str], field: str = "Adj Close", time_period: Optional[str] = "max", start_date: Optional[str] = None, end_date: Optional[str] = None, adjusted: bool = False) -> DataFrame:
+        """Builds a table of one price field aligned by date for a list of tickers.
+
+        Args:
+            tickers (List[str]): The tickers.
+            field (str, optional): The price field. Defaults to "Adj Close".
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to "max".
+            start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). It overrides the time period. Defaults to None.
+            end_date (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            adjusted (bool, optional): If the Open, High, Low and Close prices must be adjusted for splits and dividends. Defaults to False.
+
+        Returns:
+            DataFrame: A table with dates as rows and tickers as columns.
+        """
+        self.load(tickers=tickers, time_period=time_period, start_date=start_date, end_date=end_date)
+        with timed("transform.price_matrix"):
+            
+            matrix = self._field_matrix(tickers=tickers, field=field, adjusted=adjusted)
+            if start_date is not None:
+                
+                matrix = matrix.loc[Timestamp(start_date):]
+                if end_date is not None:
+                    
+                    matrix = matrix.loc[:Timestamp(end_date) - pd.Timedelta(days=1)]
+                matrix = matrix.dropna(how="all")
+            else:
+                
+                matrix = matrix.dropna(how="all")
+                if len(matrix.index) != 0:
+                    
+                    matrix = matrix.iloc[int(period_start_positions(price_matrix=matrix, time_period=time_period).min(initial=len(matrix.index))):]
+        return matrix
+
+    def intraday_bars(self, tickers: List[str], interval: str = "5m", time_period: str = "1d") -> IntradayBars:
+        """Loads the intraday bars of a list of tickers with a single provider request.
+
+        Intraday bars change during the session, so they are downloaded on every
+        call and the compact copy of the last call is kept by interval.
+
+        Args:
+            tickers (List[str]): The tickers.
+            interval (str, optional): The bar interval. For instance: 1m or 5m. Defaults to "5m".
+            time_period (str, optional): A time period valid in the Yahoo Finance API. Defaults to "1d".
+
+        Raises:
+            ValueError: If the interval is not valid.
+            TypeError: If the tickers are not a list.
+
+        Returns:
+            IntradayBars: The bars of the tickers.
+        """
+        if isinstance(tickers, list):
+            
+            if interval in VALIDS_INTERVALS:
+                
+                data = self._download(tickers=tickers, time_period=time_period, interval=interval)
+                with timed("transform.intraday_bars"):
+                    
+                    self.intraday[interval] = IntradayBars.from_panel(panel=data, interval=interval)
+                return self.intraday[interval]
+            else:
+                
+                raise ValueError(f"Invalid interval! The valids intervals are {list(VALIDS_INTERVALS.keys())}.")
+        else:
+            
+            raise TypeError("Invalid type! The tickers must be a list.")
+
+    def fx_matrix(self, currencies: List[str], base_currency: str = "USD", time_period: Optional[str] = "max", start_date: Optional[str] = None, end_date: Optional[str] = None) -> DataFrame:
+        """Builds a table with the value of one unit of each currency in the base currency.
+
+        Args:
+            currencies (List[str]): The currencies. Repeated currencies give repeated columns.
+            base_currency (str, optional): The base currency. Defaults to "USD".
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to "max".
+            start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). It overrides the time period. Defaults to None.
+            end_date (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+
+        Returns:
+            DataFrame: A table with dates as rows and one column per input currency.
+        """
+        major_currencies = [MINOR_CURRENCY_UNITS.get(currency, (currency, 1.0))[0] for currency in currencies]
+        unit_factors = np.array([MINOR_CURRENCY_UNITS.get(currency, (currency, 1.0))[1] for currency in currencies])
+        rates_tickers = sorted({fx_ticker(currency=currency, base_currency=base_currency) for currency in major_currencies if currency != base_currency})
+        if len(rates_tickers) != 0:
+            
+            rates = self.price_matrix(tickers=rates_tickers, field="Close", time_period=time_period, start_date=start_date, end_date=end_date)
+            rates = rates.assign(**{fx_ticker(currency=base_currency, base_currency=base_currency): 1.0})
+        else:
+            
+            rates = pd.DataFrame(data={fx_ticker(currency=base_currency, base_currency=base_currency): [1.0]}, index=[Timestamp(date.today())])
+        columns = [fx_ticker(currency=currency, base_currency=base_currency) for currency in major_currencies]
+        fx_rates = rates.ffill().reindex(columns=columns).to_numpy()*unit_factors
+        fx_rates_pd = pd.DataFrame(data=fx_rates, index=rates.index, columns=currencies)
+        return fx_rates_pd
+
+    def convert_to_base_currency(self, price_matrix: DataFrame, currencies: List[str], base_currency: str = "USD") -> DataFrame:
+        """Converts every column of a price table to the base currency in a single vectorized step.
+
+        Args:
+            price_matrix (DataFrame): A table of prices with dates as rows and tickers as columns.
+            currencies (List[str]): The quote currency of each column.
+            base_currency (str, optional): The base currency. Defaults to "USD".
+
+        Raises:
+            ValueError: If the number of currencies is not equal to the number of columns.
+
+        Returns:
+            DataFrame: The price table in the base currency.
+        """
+        if len(currencies) != len(price_matrix.columns):
+            
+            raise ValueError("The number of currencies must be equal to the number of columns of the price matrix.")
+        if all(currency == base_currency for currency in currencies) or len(price_matrix.index) == 0:
+            
+            return price_matrix
+        start = price_matrix.index[0] - pd.Timedelta(days=7)
+        fx_rates = self.fx_matrix(currencies=currencies, base_currency=base_currency, start_date=start.strftime("%Y-%m-%d"))
+        with timed("transform.currency_conversion"):
+            
+            fx_rates = fx_rates.reindex(fx_rates.index.union(price_matrix.index)).ffill().reindex(price_matrix.index)
+            converted_matrix = price_matrix*fx_rates.to_numpy()
+        return converted_matrix
+
+    def invalidate(self, tickers: List[str], days: int = 7) -> None:
+        """Marks the last days of the history of the tickers as outdated, so the next load downloads only them again.
+
+        The start of the stored history stays covered, and the stored prices
+        are kept until the new download replaces them.
+
+        Args:
+            tickers (List[str]): The tickers.
+            days (int, optional): The number of calendar days to download again. Defaults to 7.
+        """
+        stale_from = Timestamp(date.today()) - pd.Timedelta(days=days)
+        for ticker in tickers:
+            
+            if ticker in self._coverage:
+                
+                covered_start, covered_end, loaded_on = self._coverage[ticker]
+                self._coverage[ticker] = (covered_start, max(min(covered_end, stale_from), covered_start), loaded_on)
+
+    def clear(self) -> None:
+        """Removes every stored price and the memoized results computed from them."""
+        self.panel = pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=["Field", "Ticker"]))
+        self._coverage = {}
+        self.intraday = {}
+        get_memo_cache().clear()
+
+
+_shared_price_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """Obtains the price store shared by the asset, portfolio and plot tools.
+
+    Returns:
+        PriceStore: The shared price store.
+    """
+    global _shared_price_store
+    if _shared_price_store is None:
+        
+        _shared_price_store = PriceStore()
+    return _shared_price_store
+
+
+def set_price_store(price_store: PriceStore) -> None:
+    """Replaces the shared price store, for instance to use another provider.
+
+    The memoized results computed from the previous store are cleared.
+
+    Args:
+        price_store (PriceStore): The new shared price store.
+
+    Raises:
+        TypeError: If the input is not a PriceStore.
+    """
+    global _shared_price_store
+    if isinstance(price_store, PriceStore):
+        
+        _shared_price_store = price_store
+        get_memo_cache().clear()
+    else:
+        
+        raise TypeError("Invalid type! The input must be a PriceStore.")
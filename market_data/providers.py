@@ -0,0 +1,139 @@
+import pandas as pd
+from pandas import DataFrame
+from tools.lazy_imports import LazyModule
+from typing import List, Optional
+
+yf = LazyModule("yfinance")
+
+
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def normalize_panel(data: DataFrame, tickers: List[str]) -> DataFrame:
+    """Normalizes a downloaded table to columns indexed by (field, ticker).
+
+    Args:
+        data (DataFrame): The table returned by the data source.
+        tickers (List[str]): The tickers that were requested.
+
+    Returns:
+        DataFrame: A table with a (field, ticker) column index and a DatetimeIndex.
+    """
+    if not isinstance(data.columns, pd.MultiIndex):
+        
+        data = pd.concat({tickers[0]: data}, axis=1).swaplevel(0, 1, axis=1)
+    data = data.loc[:, data.columns.get_level_values(0).isin(PRICE_FIELDS)]
+    data.index = pd.DatetimeIndex(data.index).tz_localize(None)
+    data = data[~data.index.duplicated(keep="last")].sort_index()
+    return data
+
+
+class PriceProvider:
+    """Price provider class"""
+
+    name = "base"
+
+    def download(self, tickers: List[str], time_period: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> DataFrame:
+        """Downloads the history of a list of tickers.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+            start (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+            end (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            interval (str, optional): The bar interval. For instance: 1m, 5m or 1d. Defaults to "1d".
+
+        Raises:
+            NotImplementedError: If the provider does not implement the download.
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index.
+        """
+        raise NotImplementedError("The price provider must implement the download method.")
+
+
+class YahooPriceProvider(PriceProvider):
+    """Yahoo Finance price provider class"""
+
+    name = "yahoo"
+
+    def download(self, tickers: List[str], time_period: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> DataFrame:
+        """Downloads the history of a list of tickers in a single Yahoo Finance request.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+            start (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+            end (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            interval (str, optional): The bar interval. For instance: 1m, 5m or 1d. Defaults to "1d".
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index.
+        """
+        if time_period is not None:
+            
+            data = yf.download(tickers, period=time_period, interval=interval, progress=False)
+        else:
+            
+            data = yf.download(tickers, start=start, end=end, interval=interval, progress=False)
+        return normalize_panel(data=data, tickers=tickers)
+
+
+class FramePriceProvider(PriceProvider):
+    """Frame price provider class
+
+    Serves a prepared panel (a fixture file or a generated table) instead of
+    downloading it, so the price store can run offline and reproducibly.
+    """
+
+    name = "frame"
+
+    def __init__(self, panel: DataFrame) -> None:
+        """
+        Args:
+            panel (DataFrame): A table with a (field, ticker) column index and a DatetimeIndex.
+
+        Raises:
+            TypeError: If the panel is not a DataFrame.
+        """
+        if isinstance(panel, DataFrame):
+            
+            self.panel = panel.sort_index()
+            self.downloads = 0
+        else:
+            
+            raise TypeError("Invalid type! The panel must be a DataFrame.")
+
+    def download(self, tickers: List[str], time_period: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> DataFrame:
+        """Selects the history of a list of tickers from the panel.
+
+        The whole history is returned for a time period, the price store keeps
+        only the rows that it needs.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+            start (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+            end (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            interval (str, optional): The bar interval. Defaults to "1d".
+
+        Raises:
+            ValueError: If the interval is not the interval of the panel.
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index.
+        """
+        if interval != "1d":
+            
+            raise ValueError("Invalid interval! The frame price provider only serves daily bars.")
+        self.downloads += 1
+        data = self.panel.loc[:, self.panel.columns.get_level_values(1).isin(tickers)]
+        if time_period is None:
+            
+            if start is not None:
+                
+                data = data.loc[pd.Timestamp(start):]
+            if end is not None:
+                
+                data = data.loc[:pd.Timestamp(end) - pd.Timedelta(days=1)]
+        return normalize_panel(data=data.copy(), tickers=tickers)
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from typing import List, Optional, Tuple
+
+
+QUALITY_REPORT_COLUMNS = [
+    "First date",
+    "Last date",
+    "Calendar",
+    "Rows",
+    "Missing rows",
+    "Filled rows",
+    "Outliers",
+    "Suspected splits",
+    "Stale rows",
+    "Missing (%)",
+]
+FILLED_PRICE_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Adj Factor"]
+COMMON_SPLIT_RATIOS = [2.0, 3.0, 4.0, 5.0, 8.0, 10.0, 20.0, 1/2, 1/3, 1/4, 1/5, 1/8, 1/10, 1/20, 3/2, 2/3]
+# A scale of the median absolute deviation that matches the standard deviation of a normal distribution.
+_MAD_TO_STD = 1.4826
+
+
+def empty_quality_report() -> DataFrame:
+    """Creates a quality report without tickers.
+
+    Returns:
+        DataFrame: An empty table with the columns of the quality report.
+    """
+    return pd.DataFrame(columns=QUALITY_REPORT_COLUMNS, index=pd.Index([], name="Ticker"))
+
+
+class PanelCleaner:
+    """Panel cleaner class
+
+    Cleans a downloaded (field, ticker) panel with vectorized operations over
+    all the tickers at once and describes the quality of every ticker:
+
+    - calendars: a ticker that trades on weekends (cryptocurrencies) follows
+      the calendar of the dates where any weekend ticker trades, the others
+      follow the calendar of the business-day tickers, so the gaps of a ticker
+      are only the dates of its calendar where it has no prices;
+    - outliers: an isolated price whose log return from the previous price
+      and back to the next price are both above outlier_threshold robust
+      standard deviations of the ticker is dropped and filled;
+    - splits: a jump that remains once the outliers are dropped and is close
+      to a common split ratio is reported as a suspected split, without changing the prices;
+    - gaps: the prices are forward-filled for at most max_fill rows inside the
+      history of the ticker and the volume of a filled row is zero;
+    - stale prices: the rows whose close repeats the previous close are counted.
+    """
+
+    def __init__(self, max_fill: int = 5, outlier_threshold: float = 10.0, split_tolerance: float = 0.02, split_ratios: Optional[List[float]] = None) -> None:
+        """
+        Args:
+            max_fill (int, optional): The number of consecutive rows that can be forward-filled. Defaults to 5.
+            outlier_threshold (float, optional): The number of robust standard deviations of an outlier. Defaults to 10.0.
+            split_tolerance (float, optional): The maximum distance between the log return of a split and the log of its ratio. Defaults to 0.02.
+            split_ratios (Optional[List[float]], optional): The split ratios to detect. Defaults to COMMON_SPLIT_RATIOS.
+
+        Raises:
+            TypeError: If max_fill is not an int.
+            ValueError: If max_fill is negative or outlier_threshold is not positive.
+        """
+        if isinstance(max_fill, int):
+            
+            if max_fill < 0 or outlier_threshold <= 0:
+                
+                raise ValueError("The max_fill must not be negative and the outlier_threshold must be positive.")
+            self.max_fill = max_fill
+        else:
+            
+            raise TypeError("Invalid type! The max_fill must be an int.")
+        self.outlier_threshold = outlier_threshold
+        self.split_tolerance = split_tolerance
+        self.split_ratios = COMMON_SPLIT_RATIOS if split_ratios is None else split_ratios
+
+    def _calendar_rows(self, index: pd.DatetimeIndex, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the calendar of every ticker.
+
+        Args:
+            index (pd.DatetimeIndex): The dates of the panel.
+            valid (np.ndarray): If each ticker has a close on each date, with dates as rows.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The dates of the calendar of each ticker, with dates as rows,
+            and if each ticker trades on weekends.
+        """
+        weekend = np.asarray(index.dayofweek >= 5)
+        trades_weekends = (valid & weekend[:, None]).any(axis=0)
+        weekend_calendar = valid[:, trades_weekends].any(axis=1)
+        business_calendar = valid[:, ~trades_weekends].any(axis=1)
+        calendar_rows = np.where(trades_weekends[None, :], weekend_calendar[:, None], business_calendar[:, None])
+        return calendar_rows, trades_weekends
+
+    def _jumps(self, close: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the outliers and the suspected splits of the close prices.
+
+        Args:
+            close (DataFrame): The close prices with dates as rows and tickers as columns.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: If each price is an outlier and if each price follows a suspected split.
+        """
+        positive_close = close.where(close > 0)
+        prices = positive_close.to_numpy(dtype=np.float64)
+        previous_prices = positive_close.ffill().shift(1).to_numpy(dtype=np.float64)
+        next_prices = positive_close.bfill().shift(-1).to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            jump_in = np.log(prices/previous_prices)
+            jump_out = np.log(next_prices/prices)
+            median = np.nanmedian(jump_in, axis=0)
+            scale = _MAD_TO_STD*np.nanmedian(np.abs(jump_in - median), axis=0)
+            threshold = self.outlier_threshold*np.where(scale > 0, scale, np.inf)
+            outliers = (np.abs(jump_in) > threshold) & (np.abs(jump_out) > threshold) & (np.sign(jump_in) != np.sign(jump_out)) & (np.abs(jump_in + jump_out) < 0.5*np.abs(jump_in))
+            without_outliers = positive_close.mask(outliers)
+            jump_in = np.log(without_outliers.to_numpy(dtype=np.float64)/without_outliers.ffill().shift(1).to_numpy(dtype=np.float64))
+            candidates = np.nonzero(np.abs(jump_in) > threshold)
+            split_distance = np.min(np.abs(jump_in[candidates][:, None] - np.log(np.array(self.split_ratios))[None, :]), axis=1, initial=np.inf)
+            splits = np.zeros(jump_in.shape, dtype=bool)
+            splits[candidates] = split_distance < self.split_tolerance
+        return outliers, splits
+
+    def clean(self, panel: DataFrame) -> Tuple[DataFrame, DataFrame]:
+        """Cleans a panel and describes the quality of each ticker.
+
+        Args:
+            panel (DataFrame): A table with a (field, ticker) column index and a DatetimeIndex.
+
+        Returns:
+            Tuple[DataFrame, DataFrame]: The cleaned panel and the quality report with tickers as rows.
+        """
+        fields = list(dict.fromkeys(panel.columns.get_level_values(0)))
+        if "Close" not in fields or panel.empty:
+            
+            return panel, empty_quality_report()
+        close = panel["Close"]
+        tickers = list(close.columns)
+        valid = close.notna().to_numpy()
+        calendar_rows, trades_weekends = self._calendar_rows(index=panel.index, valid=valid)
+        positions = np.arange(len(panel.index))[:, None]
+        has_prices = valid.any(axis=0)
+        first_positions = valid.argmax(axis=0)
+        last_positions = len(panel.index) - 1 - valid[::-1].argmax(axis=0)
+        inside = (positions >= first_positions) & (positions <= last_positions) & has_prices
+        outliers, splits = self._jumps(close=close)
+        missing = calendar_rows & inside & ~valid
+        gaps = missing | outliers
+        cleaned_fields = {}
+        for field in fields:
+            
+            matrix = panel[field].reindex(columns=tickers)
+            if field in FILLED_PRICE_FIELDS:
+                
+                filled = matrix.mask(outliers).ffill(limit=self.max_fill)
+                cleaned_fields[field] = matrix.mask(gaps, filled)
+            elif field == "Volume":
+                
+                cleaned_fields[field] = matrix.mask(missing & matrix.isna().to_numpy(), 0.0)
+            else:
+                
+                cleaned_fields[field] = matrix
+        cleaned_panel = pd.concat(cleaned_fields, axis=1)
+        cleaned_panel.columns = cleaned_panel.columns.set_names(panel.columns.names)
+        filled_rows = (gaps & cleaned_panel["Close"].notna().to_numpy()).sum(axis=0)
+        cleaned_close = cleaned_panel["Close"].to_numpy(dtype=np.float64)
+        stale_rows = (valid[1:] & ~outliers[1:] & (cleaned_close[1:] == cleaned_close[:-1])).sum(axis=0)
+        calendar_size = (calendar_rows & inside).sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            missing_percentage = np.where(calendar_size > 0, missing.sum(axis=0)/calendar_size*100, 0.0)
+        report = pd.DataFrame(index=pd.Index(tickers, name="Ticker"))
+        report["First date"] = pd.Series(panel.index[first_positions], index=report.index).where(has_prices)
+        report["Last date"] = pd.Series(panel.index[last_positions], index=report.index).where(has_prices)
+        report["Calendar"] = np.where(trades_weekends, "7d", "5d")
+        report["Rows"] = valid.sum(axis=0)
+        report["Missing rows"] = missing.sum(axis=0)
+        report["Filled rows"] = filled_rows
+        report["Outliers"] = outliers.sum(axis=0)
+        report["Suspected splits"] = splits.sum(axis=0)
+        report["Stale rows"] = stale_rows
+        report["Missing (%)"] = np.round(missing_percentage, 2)
+        return cleaned_panel, report
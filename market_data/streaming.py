@@ -0,0 +1,122 @@
+import asyncio
+import csv
+import numpy as np
+from typing import AsyncIterator, NamedTuple, Optional
+from .intraday import IntradayBars
+
+
+class Quote(NamedTuple):
+    """Quote class"""
+
+    timestamp: int
+    ticker: str
+    price: float
+
+
+class QuoteFeed:
+    """Quote feed class"""
+
+    async def stream(self) -> AsyncIterator[Quote]:
+        """Yields the quotes of the feed as they arrive.
+
+        Raises:
+            NotImplementedError: If the feed does not implement the stream.
+
+        Yields:
+            Quote: The next quote.
+        """
+        raise NotImplementedError("The quote feed must implement the stream method.")
+        yield
+
+
+class ReplayQuoteFeed(QuoteFeed):
+    """Replay quote feed class
+
+    Replays a .csv file with the timestamp, ticker and price columns, so the
+    streaming valuation can be driven and load-tested offline.
+    """
+
+    def __init__(self, file_path: str, tick_rate: Optional[float] = None) -> None:
+        """
+        Args:
+            file_path (str): The path to the replay file.
+            tick_rate (Optional[float], optional): The number of quotes per second. Defaults to None (as fast as possible).
+
+        Raises:
+            TypeError: If file_path is not a str.
+            TypeError: If tick_rate is not a float number.
+            ValueError: If tick_rate is not positive.
+        """
+        if isinstance(file_path, str):
+            
+            self.file_path = file_path
+        else:
+            
+            raise TypeError("Invalid type! The file_path must be a str.")
+        if isinstance(tick_rate, (int, float)) or tick_rate is None:
+            
+            if tick_rate is not None and tick_rate <= 0:
+                
+                raise ValueError("The tick_rate must be positive.")
+            self.tick_rate = tick_rate
+        else:
+            
+            raise TypeError("Invalid type! The tick_rate must be a float number.")
+
+    async def stream(self) -> AsyncIterator[Quote]:
+        """Reads the replay file line by line and yields its quotes at the configured tick rate.
+
+        The feed only sleeps when it is ahead of the schedule, so high tick
+        rates are not limited by the resolution of the event loop timer.
+
+        Yields:
+            Quote: The next quote.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        with open(self.file_path, newline="") as replay_file:
+            
+            reader = csv.reader(replay_file)
+            next(reader, None)
+            for count, row in enumerate(reader):
+                
+                if self.tick_rate is not None:
+                    
+                    delay = start_time + count/self.tick_rate - loop.time()
+                    if delay > 0:
+                        
+                        await asyncio.sleep(delay)
+                elif count % 1000 == 0:
+                    
+                    await asyncio.sleep(0)
+                yield Quote(timestamp=int(row[0]), ticker=row[1], price=float(row[2]))
+
+
+def write_replay_file(bars: IntradayBars, file_path: str) -> int:
+    """Writes the close prices of intraday bars as a replay file ordered by time.
+
+    Args:
+        bars (IntradayBars): The bars.
+        file_path (str): The path to the replay file.
+
+    Raises:
+        TypeError: If the inputs are not an IntradayBars and a str.
+
+    Returns:
+        int: The number of quotes written.
+    """
+    if isinstance(bars, IntradayBars) and isinstance(file_path, str):
+        
+        tickers_codes = np.repeat(np.arange(len(bars.tickers)), np.diff(bars.offsets))
+        order = bars.timestamps.argsort(kind="stable")
+        with open(file_path, "w", newline="") as replay_file:
+            
+            writer = csv.writer(replay_file)
+            writer.writerow(["timestamp", "ticker", "price"])
+            for position in order:
+                
+                writer.writerow([int(bars.timestamps[position]), bars.tickers[tickers_codes[position]], float(bars.close[position])])
+        return len(order)
+    else:
+        
+        raise TypeError("Invalid types! This function expects an IntradayBars and a str.")
@@ -0,0 +1,312 @@
+import numpy as np
+import pandas as pd
+import zlib
+from collections import OrderedDict
+from datetime import date
+from pandas import DataFrame, DatetimeIndex
+from pandas.tseries.holiday import AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr, USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+from tools.files import append_partitioned_data, price_panel_to_table
+from typing import Dict, Iterator, List, Optional, Tuple
+from .providers import PriceProvider, normalize_panel
+
+
+VALIDS_SYNTHETIC_MODELS = ["gbm", "garch"]
+TRADING_DAYS_PER_YEAR = {
+    "cryptocurrency": 365,
+    "currency": 260,
+}
+DEFAULT_TRADING_DAYS_PER_YEAR = 252
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """NYSE holiday calendar class
+
+    The federal holidays without Columbus Day and Veterans Day, plus Good
+    Friday. New Year's Day falling on a Saturday is not observed on the
+    Friday before, and Juneteenth is a holiday since 2022.
+    """
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def trading_calendar(category: str, start_date: str, end_date: str) -> DatetimeIndex:
+    """Builds the trading days of an asset category.
+
+    The cryptocurrencies trade every day, the currencies every weekday and the
+    other categories every weekday except the NYSE holidays.
+
+    Args:
+        category (str): The asset category. For instance: stocks, etf or cryptocurrency.
+        start_date (str): The first date (format:yyyy-mm-dd).
+        end_date (str): The last date (format:yyyy-mm-dd).
+
+    Returns:
+        DatetimeIndex: The trading days.
+    """
+    category = category.lower()
+    if category == "cryptocurrency":
+        
+        return pd.date_range(start=start_date, end=end_date, freq="D")
+    elif category == "currency":
+        
+        return pd.bdate_range(start=start_date, end=end_date)
+    else:
+        
+        holidays = NYSEHolidayCalendar().holidays(start=start_date, end=end_date)
+        return pd.bdate_range(start=start_date, end=end_date).difference(holidays)
+
+def _ticker_seed(seed: int, ticker: str) -> int:
+    """Derives a stable seed for a ticker, so its series does not depend on the other tickers requested.
+
+    Args:
+        seed (int): The seed of the generator.
+        ticker (str): The ticker.
+
+    Returns:
+        int: The seed of the ticker.
+    """
+    return zlib.crc32(f"{seed}:{ticker}".encode("utf-8"))
+
+def _simulate_log_returns(shocks: np.ndarray, volatility: np.ndarray, model: str, garch_alpha: float, garch_beta: float) -> np.ndarray:
+    """Turns standard normal shocks into daily log returns, with constant or GARCH(1,1) volatility.
+
+    The GARCH recursion runs over the days and is vectorized over the tickers.
+
+    Args:
+        shocks (np.ndarray): The correlated standard normal shocks with days as rows and tickers as columns.
+        volatility (np.ndarray): The long-run daily volatility of each ticker.
+        model (str): The volatility model (gbm or garch).
+        garch_alpha (float): The weight of the last squared shock.
+        garch_beta (float): The weight of the last variance.
+
+    Returns:
+        np.ndarray: The log returns without drift and jumps.
+    """
+    if model == "gbm":
+        
+        return shocks*volatility
+    long_run_variance = volatility**2
+    omega = long_run_variance*(1 - garch_alpha - garch_beta)
+    variance = long_run_variance.copy()
+    log_returns = np.empty_like(shocks)
+    for day in range(shocks.shape[0]):
+        
+        log_returns[day] = np.sqrt(variance)*shocks[day]
+        variance = omega + garch_alpha*log_returns[day]**2 + garch_beta*variance
+    return log_returns
+
+def generate_synthetic_panel(tickers: List[str], start_date: str, end_date: Optional[str] = None, categories: Optional[Dict[str, str]] = None, model: str = "garch", correlation: float = 0.3, annual_drift: float = 0.06, annual_volatility: float = 0.25, garch_alpha: float = 0.08, garch_beta: float = 0.9, jump_intensity: float = 2.0, jump_mean: float = -0.02, jump_volatility: float = 0.05, seed: int = 0) -> DataFrame:
+    """Generates a daily OHLCV panel of correlated synthetic prices.
+
+    Every ticker loads on a market factor shared by all tickers (one-factor
+    correlation), follows a GBM or a GARCH(1,1) volatility and has Poisson
+    jumps. Each ticker trades on the calendar of its category and its series
+    only depends on the seed and its ticker.
+
+    Args:
+        tickers (List[str]): The tickers.
+        start_date (str): The first date (format:yyyy-mm-dd).
+        end_date (Optional[str], optional): The last date (format:yyyy-mm-dd). Defaults to None (today).
+        categories (Optional[Dict[str, str]], optional): The category of each ticker. Defaults to None (stocks).
+        model (str, optional): The volatility model (gbm or garch). Defaults to "garch".
+        correlation (float, optional): The correlation between the shocks of two tickers. Defaults to 0.3.
+        annual_drift (float, optional): The annual drift. Defaults to 0.06.
+        annual_volatility (float, optional): The mean annual volatility. Defaults to 0.25.
+        garch_alpha (float, optional): The GARCH weight of the last squared shock. Defaults to 0.08.
+        garch_beta (float, optional): The GARCH weight of the last variance. Defaults to 0.9.
+        jump_intensity (float, optional): The mean number of jumps per year. Defaults to 2.0.
+        jump_mean (float, optional): The mean log jump. Defaults to -0.02.
+        jump_volatility (float, optional): The volatility of the log jumps. Defaults to 0.05.
+        seed (int, optional): The seed of the generator. Defaults to 0.
+
+    Raises:
+        ValueError: If the model is not valid.
+        ValueError: If the correlation is not between 0 and 1.
+
+    Returns:
+        DataFrame: A table with a (field, ticker) column index and a DatetimeIndex.
+    """
+    if model not in VALIDS_SYNTHETIC_MODELS:
+        
+        raise ValueError(f"Invalid model! The valids synthetic models are {VALIDS_SYNTHETIC_MODELS}.")
+    if not 0 <= correlation <= 1:
+        
+        raise ValueError("The correlation must be between 0 and 1.")
+    if end_date is None:
+        
+        end_date = date.today().strftime("%Y-%m-%d")
+    if categories is None:
+        
+        categories = {}
+    all_days = pd.date_range(start=start_date, end=end_date, freq="D")
+    market_shocks = np.random.default_rng(seed).standard_normal(len(all_days))
+    groups: Dict[str, List[str]] = {}
+    for ticker in dict.fromkeys(tickers):
+        
+        groups.setdefault(categories.get(ticker, "stocks").lower(), []).append(ticker)
+    frames = []
+    for category, group_tickers in groups.items():
+        
+        calendar = trading_calendar(category=category, start_date=start_date, end_date=end_date)
+        days_per_year = TRADING_DAYS_PER_YEAR.get(category, DEFAULT_TRADING_DAYS_PER_YEAR)
+        num_days = len(calendar)
+        ticker_rngs = [np.random.default_rng(_ticker_seed(seed=seed, ticker=ticker)) for ticker in group_tickers]
+        idiosyncratic_shocks = np.column_stack([rng.standard_normal(num_days) for rng in ticker_rngs])
+        parameters = np.array([rng.uniform(0.5, 1.5, size=4) for rng in ticker_rngs])
+        jump_counts = np.column_stack([rng.poisson(jump_intensity/days_per_year, size=num_days) for rng in ticker_rngs])
+        jump_sizes = np.column_stack([rng.normal(jump_mean, jump_volatility, size=num_days) for rng in ticker_rngs])
+        noises = np.stack([rng.standard_normal((4, num_days)) for rng in ticker_rngs], axis=2)
+        shocks = np.sqrt(correlation)*market_shocks[all_days.get_indexer(calendar)][:, None] + np.sqrt(1 - correlation)*idiosyncratic_shocks
+        volatility = annual_volatility*parameters[:, 0]/np.sqrt(days_per_year)
+        log_returns = _simulate_log_returns(shocks=shocks, volatility=volatility, model=model, garch_alpha=garch_alpha, garch_beta=garch_beta)
+        log_returns += annual_drift/days_per_year - volatility**2/2 + jump_counts*jump_sizes
+        close = 10*parameters[:, 1]*np.exp(np.cumsum(log_returns, axis=0))
+        previous_close = np.vstack([close[:1], close[:-1]])
+        open_prices = previous_close*np.exp(0.2*volatility*noises[0])
+        high = np.maximum(open_prices, close)*np.exp(0.5*volatility*np.abs(noises[1]))
+        low = np.minimum(open_prices, close)*np.exp(-0.5*volatility*np.abs(noises[2]))
+        volume = np.round(1e6*parameters[:, 2]*np.exp(0.3*noises[3] + 20*np.abs(log_returns)))
+        fields = {"Open": open_prices, "High": high, "Low": low, "Close": close, "Adj Close": close, "Volume": volume}
+        frames.append(pd.concat({field: pd.DataFrame(data=values, index=calendar, columns=group_tickers) for field, values in fields.items()}, axis=1))
+    panel = pd.concat(frames, axis=1, sort=True)
+    return normalize_panel(data=panel, tickers=tickers)
+
+def iter_synthetic_panels(tickers: List[str], start_date: str, end_date: Optional[str] = None, chunk_size: int = 500, **generator_options) -> Iterator[DataFrame]:
+    """Generates a synthetic panel in chunks of tickers, so any number of tickers fits in memory.
+
+    The chunks are the same as the corresponding columns of a single panel.
+
+    Args:
+        tickers (List[str]): The tickers.
+        start_date (str): The first date (format:yyyy-mm-dd).
+        end_date (Optional[str], optional): The last date (format:yyyy-mm-dd). Defaults to None (today).
+        chunk_size (int, optional): The number of tickers of each chunk. Defaults to 500.
+        **generator_options: The options of generate_synthetic_panel.
+
+    Yields:
+        DataFrame: The panel of the next chunk of tickers.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    for position in range(0, len(tickers), chunk_size):
+        
+        yield generate_synthetic_panel(tickers=tickers[position:position + chunk_size], start_date=start_date, end_date=end_date, **generator_options)
+
+def write_synthetic_data(root_path: str, tickers: List[str], start_date: str, end_date: Optional[str] = None, chunk_size: int = 500, date_partition: str = "year", file_format: str = "parquet", **generator_options) -> List[str]:
+    """Generates a synthetic panel chunk by chunk and appends it to a partitioned dataset.
+
+    The dataset can be read back with tools.files.load_data or iter_data_chunks.
+
+    Args:
+        root_path (str): The folder of the dataset.
+        tickers (List[str]): The tickers.
+        start_date (str): The first date (format:yyyy-mm-dd).
+        end_date (Optional[str], optional): The last date (format:yyyy-mm-dd). Defaults to None (today).
+        chunk_size (int, optional): The number of tickers of each chunk. Defaults to 500.
+        date_partition (str, optional): The date partition (year or month). Defaults to "year".
+        file_format (str, optional): The file format of the parts (parquet or feather). Defaults to "parquet".
+        **generator_options: The options of generate_synthetic_panel.
+
+    Returns:
+        List[str]: The paths of the part files.
+    """
+    paths = []
+    for panel in iter_synthetic_panels(tickers=tickers, start_date=start_date, end_date=end_date, chunk_size=chunk_size, **generator_options):
+        
+        table = price_panel_to_table(panel=panel).dropna(subset=["Close"])
+        paths.extend(append_partitioned_data(data=table, root_path=root_path, date_partition=date_partition, file_format=file_format))
+    return paths
+
+
+class SyntheticPriceProvider(PriceProvider):
+    """Synthetic price provider class
+
+    Generates the history of any ticker on demand, so the price store, the
+    tests and the benchmarks can run offline at any scale. The histories of
+    the last ticker sets requested are kept until the end of the day.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, categories: Optional[Dict[str, str]] = None, history_start_date: str = "2000-01-01", seed: int = 0, max_cached_panels: int = 8, **generator_options) -> None:
+        """
+        Args:
+            categories (Optional[Dict[str, str]], optional): The category of each ticker. Defaults to None (stocks).
+            history_start_date (str, optional): The first date of every history (format:yyyy-mm-dd). Defaults to "2000-01-01".
+            seed (int, optional): The seed of the generator. Defaults to 0.
+            max_cached_panels (int, optional): The number of ticker sets whose history is kept. Defaults to 8.
+            **generator_options: The options of generate_synthetic_panel.
+        """
+        self.categories = categories if categories is not None else {}
+        self.history_start_date = history_start_date
+        self.seed = seed
+        self.max_cached_panels = max_cached_panels
+        self.generator_options = generator_options
+        self._panels: "OrderedDict[Tuple[str, Tuple[str, ...]], DataFrame]" = OrderedDict()
+
+    def _history(self, tickers: List[str]) -> DataFrame:
+        """Generates the whole history of a ticker set, or reuses the one generated today.
+
+        Args:
+            tickers (List[str]): The tickers.
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index and a DatetimeIndex.
+        """
+        key = (date.today().isoformat(), tuple(dict.fromkeys(tickers)))
+        panel = self._panels.get(key)
+        if panel is None:
+            
+            panel = generate_synthetic_panel(tickers=tickers, start_date=self.history_start_date, categories=self.categories, seed=self.seed, **self.generator_options)
+            self._panels[key] = panel
+            while len(self._panels) > self.max_cached_panels:
+                
+                self._panels.popitem(last=False)
+        else:
+            
+            self._panels.move_to_end(key)
+        return panel
+
+    def download(self, tickers: List[str], time_period: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> DataFrame:
+        """Generates the history of a list of tickers.
+
+        The whole history is generated from history_start_date, or reused
+        from a previous request of the same tickers, and then cut, so a ticker
+        always gets the same prices whatever the request.
+
+        Args:
+            tickers (List[str]): The tickers.
+            time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+            start (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+            end (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+            interval (str, optional): The bar interval. Defaults to "1d".
+
+        Raises:
+            ValueError: If the interval is not daily.
+
+        Returns:
+            DataFrame: A table with a (field, ticker) column index.
+        """
+        if interval != "1d":
+            
+            raise ValueError("Invalid interval! The synthetic price provider only generates daily bars.")
+        data = self._history(tickers=tickers)
+        if time_period is None:
+            
+            if start is not None:
+                
+                data = data.loc[pd.Timestamp(start):]
+            if end is not None:
+                
+                data = data.loc[:pd.Timestamp(end) - pd.Timedelta(days=1)]
+        return data.copy()
@@ -1,4 +1,49 @@
 """_summary_
 """
 from .portfolio import Portfolio
-from .portfolio_tools import portfolio_current_valuation, numpy_portfolio_optimization, vqe_portfolio_optimization, qaoa_portfolio_optimization, show_portfolio_returns_for_all_time_periods, market_benchmark_index_return
\ No newline at end of file
+from .portfolio_ledger import Transaction, TransactionLedger
+from tools.lazy_imports import lazy_package_attribute, lazy_package_dir
+
+_LAZY_ATTRIBUTES = {
+    "portfolio_current_valuation": ".portfolio_tools",
+    "numpy_portfolio_optimization": ".portfolio_tools",
+    "vqe_portfolio_optimization": ".portfolio_tools",
+    "qaoa_portfolio_optimization": ".portfolio_tools",
+    "heuristic_portfolio_optimization": ".portfolio_tools",
+    "show_portfolio_returns_for_all_time_periods": ".portfolio_tools",
+    "market_benchmark_index_return": ".portfolio_tools",
+    "portfolio_benchmark_comparison": ".portfolio_tools",
+    "batch_portfolio_analytics": ".portfolio_batch",
+    "batch_position_weights": ".portfolio_batch",
+    "holdings_matrix": ".portfolio_batch",
+    "LivePortfolioValuation": ".portfolio_stream",
+    "run_live_valuation": ".portfolio_stream",
+    "batch_exposure": ".portfolio_exposure",
+    "portfolio_exposure": ".portfolio_exposure",
+    "AnalyticsService": ".portfolio_service",
+    "run_service": ".portfolio_service",
+    "Qubo": ".portfolio_qubo",
+    "all_selections": ".portfolio_qubo",
+    "evaluate_qubo": ".portfolio_qubo",
+    "portfolio_qubo": ".portfolio_qubo",
+    "qubo_penalty": ".portfolio_qubo",
+    "FactorCovariance": ".portfolio_factor_model",
+    "fit_factor_covariance": ".portfolio_factor_model",
+    "portfolio_factor_risk": ".portfolio_factor_model",
+    "universe_factor_covariance": ".portfolio_factor_model",
+    "hrp_weights": ".portfolio_hrp",
+    "portfolio_hrp_allocation": ".portfolio_hrp",
+    "quasi_diagonal_order": ".portfolio_hrp",
+    "recursive_bisection": ".portfolio_hrp",
+    "HeuristicResult": ".portfolio_heuristics",
+    "simulated_annealing": ".portfolio_heuristics",
+    "solve_qubo": ".portfolio_heuristics",
+    "tabu_search": ".portfolio_heuristics",
+}
+
+
+def __getattr__(name):
+    return lazy_package_attribute(package_name=__name__, package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES, name=name)
+
+def __dir__():
+    return lazy_package_dir(package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES)
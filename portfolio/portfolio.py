@@ -2,10 +2,20 @@ import sys
 
 sys.path.append("../")
 
-import yfinance as yf
 from asset import Asset
+from datetime import datetime
+from market_data import get_memo_cache, get_price_store, memo_key
+from tools.instrumentation import timed
+from tools.lazy_imports import LazyModule
 from pandas import DataFrame
-from typing import List, Optional
+from typing import Dict, List, Optional, TYPE_CHECKING, Union
+from .portfolio_ledger import Transaction, TransactionLedger, time_weighted_returns
+
+if TYPE_CHECKING:
+    
+    from scipy.sparse import csr_matrix
+
+sparse = LazyModule("scipy.sparse")
 
 
 class Portfolio:
@@ -31,11 +41,13 @@ class Portfolio:
         "Gold": "GC=F",
     }
 
-    def __init__(self, assets: Optional[List] = None) -> None:
+    def __init__(self, assets: Optional[List] = None, opening_date: Union[datetime, str] = "1970-01-01") -> None:
         """
 
         Args:
             assets (Optional[list], optional): A list with the assets that defines a portfolio. Defaults to None.
+            opening_date (Union[datetime, str], optional): The date of the opening buys that record the initial amounts
+            in the ledger. Defaults to "1970-01-01" (held over the whole price history).
 
         Raises:
             TypeError: If the input is not equal to a list.
@@ -50,6 +62,22 @@ class Portfolio:
             
             raise TypeError("Invalid type!")
         self.portfolio_return_dict = {time_period: 0.0 for time_period in Portfolio.VALIDS_TIME_PERIODS}
+        self.opening_date = opening_date
+        self.ledger = TransactionLedger()
+        for asset in self.assets:
+            
+            self._record_opening_position(asset=asset)
+
+    def _record_opening_position(self, asset: Asset) -> None:
+        """Records the amount of an asset as an opening buy (or sell, if it is short) in the ledger.
+
+        Args:
+            asset (Asset): The asset.
+        """
+        if asset.amount != 0:
+            
+            transaction_type = "buy" if asset.amount > 0 else "sell"
+            self.ledger.record(transaction=Transaction(date=self.opening_date, ticker=asset.ticker, transaction_type=transaction_type, quantity=abs(asset.amount)))
 
     def add_an_asset(self, asset: Asset) -> None:
         """Adds an asset in the portfolio assets list.
@@ -63,6 +91,7 @@ class Portfolio:
         if isinstance(asset, Asset):
             
             self.assets.append(asset)
+            self._record_opening_position(asset=asset)
         else:
             
             raise TypeError("Invalid type! The input must be an Asset class.")
@@ -70,6 +99,9 @@ class Portfolio:
     def correlation_between_assets(self, time_period: str) -> DataFrame:
         """Builds a table with the correlation between the assets.
 
+        Repeated calls are served by the shared memoization cache until the
+        time to live of the time period expires.
+
         Args:
             time_period (str): The time period that will used to calculate
             the correlation between the assets
@@ -80,16 +112,27 @@ class Portfolio:
         if len(self.assets) != 0:
             
             tickers = [asset.ticker for asset in self.assets]
-            data = yf.download(tickers, period=time_period, progress=False)
-            data.dropna()
-            assets_correlation = data["Adj Close"].corr()
-            return assets_correlation
+            price_store = get_price_store()
+            memo_cache = get_memo_cache()
+            key = memo_key("correlation", price_store.provider.name, tickers, time_period)
+            assets_correlation = memo_cache.get(key)
+            if assets_correlation is None:
+                
+                data = price_store.price_matrix(tickers=tickers, time_period=time_period)
+                with timed("matrix.correlation"):
+                    
+                    assets_correlation = data.corr()
+                memo_cache.put(key, assets_correlation, ttl=memo_cache.ttl_for(window=time_period))
+            return assets_correlation.copy()
         else:
             
             print("Empty assets list!")
 
     def remove_an_asset(self, asset_name: str) -> None:
         """Removes an asset from the assets list of the portfolio.
+
+        The transactions of its ticker are removed from the ledger, unless
+        another asset of the portfolio has the same ticker.
         
         Args:
             asset_name (str): The name of the asset we want to remove from the portfolio.
@@ -110,7 +153,11 @@ class Portfolio:
                 if asset_name in assets_names_list:
                     
                     asset_index = assets_names_list.index(asset_name)
+                    ticker = self.assets[asset_index].ticker
                     del self.assets[asset_index]
+                    if all(asset.ticker != ticker for asset in self.assets):
+                        
+                        self.ledger.remove_ticker(ticker=ticker)
                 else:
                     
                     print(
@@ -119,3 +166,147 @@ class Portfolio:
             else:
                 
                 raise TypeError("Invalid type! The asset_name must be a str.")
+
+    def record_transaction(self, transaction: Transaction) -> None:
+        """Records a buy, a sell, a split or a dividend in the ledger of the portfolio.
+
+        The ledger starts with the opening amounts of the assets, so the amount
+        of the asset becomes its opening amount plus every transaction of its
+        ticker.
+
+        Args:
+            transaction (Transaction): The transaction.
+
+        Raises:
+            ValueError: If the ticker of the transaction is not in the assets list.
+            TypeError: If the input is not a Transaction.
+        """
+        if isinstance(transaction, Transaction):
+            
+            assets = [asset for asset in self.assets if asset.ticker == transaction.ticker]
+            if len(assets) == 0:
+                
+                raise ValueError(f"The ticker {transaction.ticker} is not in the assets list of this portfolio!")
+            self.ledger.record(transaction=transaction)
+            assets[0].amount = self.ledger.holdings_as_of().get(transaction.ticker, 0.0)
+        else:
+            
+            raise TypeError("Invalid type! The input must be a Transaction.")
+
+    def holdings_as_of(self, date: Union[datetime, str]) -> Dict[str, float]:
+        """Derives the shares held at the end of a date from the ledger of the portfolio.
+
+        Args:
+            date (Union[datetime, str]): The date.
+
+        Returns:
+            Dict[str, float]: The shares held of each ticker.
+        """
+        return self.ledger.holdings_as_of(date=date)
+
+    def time_weighted_return(self, time_period: str, base_currency: str = "USD") -> DataFrame:
+        """Calculates the cumulative time-weighted return of the ledger of the portfolio.
+
+        The holdings of every date come from one pass over the ledger and are
+        valued with the split-adjusted close prices plus the dividends received,
+        both converted to the base currency.
+
+        Args:
+            time_period (str): The time period of the prices.
+            base_currency (str, optional): The currency of the valuations. Defaults to "USD".
+
+        Raises:
+            ValueError: If the time period is not valid.
+
+        Returns:
+            DataFrame: A table with the cumulative return (%) on each date.
+        """
+        if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+            
+            raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        tickers = self.ledger.tickers
+        currencies_by_ticker = {asset.ticker: asset.currency for asset in self.assets}
+        currencies = [currencies_by_ticker.get(ticker) or Asset.infer_currency(ticker=ticker) for ticker in tickers]
+        price_store = get_price_store()
+        price_matrix = price_store.price_matrix(tickers=tickers, field="Close", time_period=time_period)[tickers]
+        price_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies, base_currency=base_currency)
+        dividends = price_store.convert_to_base_currency(price_matrix=self.ledger.dividends_matrix(dates=price_matrix.index), currencies=currencies, base_currency=base_currency)
+        with timed("analytics.time_weighted_return"):
+            
+            holdings = self.ledger.holdings_matrix(dates=price_matrix.index, split_adjusted=True)
+            returns = time_weighted_returns(holdings=holdings, prices=price_matrix, dividends=dividends)
+        return returns.to_frame()
+
+    def amounts_to_csr(self, tickers_index: Dict[str, int]) -> "csr_matrix":
+        """Exports the amounts of the portfolio as a row of a sparse holdings matrix.
+
+        The amounts of a ticker held twice are summed.
+
+        Args:
+            tickers_index (Dict[str, int]): The column of each ticker of the universe.
+
+        Raises:
+            ValueError: If a ticker of the portfolio is not in the universe.
+            TypeError: If tickers_index is not a dict.
+
+        Returns:
+            csr_matrix: A 1 x universe size sparse row with the amounts.
+        """
+        if isinstance(tickers_index, dict):
+            
+            missing_tickers = [asset.ticker for asset in self.assets if asset.ticker not in tickers_index]
+            if len(missing_tickers) != 0:
+                
+                raise ValueError(f"The tickers {missing_tickers} are not in the universe.")
+            columns = [tickers_index[asset.ticker] for asset in self.assets]
+            amounts = [asset.amount for asset in self.assets]
+            row = sparse.csr_matrix((amounts, ([0]*len(columns), columns)), shape=(1, len(tickers_index)))
+            row.sum_duplicates()
+            return row
+        else:
+            
+            raise TypeError("Invalid type! The tickers_index must be a dict.")
+
+    @classmethod
+    def from_csr_row(cls, row: "csr_matrix", tickers: List[str], assets_by_ticker: Optional[Dict[str, Asset]] = None) -> "Portfolio":
+        """Creates a portfolio from a row of a sparse holdings matrix.
+
+        Args:
+            row (csr_matrix): A 1 x universe size sparse row with the amounts.
+            tickers (List[str]): The ticker of each column of the universe.
+            assets_by_ticker (Optional[Dict[str, Asset]], optional): Assets whose name, category and currency are copied.
+            Defaults to None (the ticker as name and the Other category).
+
+        Raises:
+            ValueError: If the row does not have one line and one column per ticker.
+            TypeError: If tickers is not a list.
+
+        Returns:
+            Portfolio: A portfolio with one asset per nonzero amount.
+        """
+        if isinstance(tickers, list):
+            
+            row = sparse.csr_matrix(row)
+            if row.shape != (1, len(tickers)):
+                
+                raise ValueError("The row must have one line and one column per ticker.")
+            row.sum_duplicates()
+            row.eliminate_zeros()
+            if assets_by_ticker is None:
+                
+                assets_by_ticker = {}
+            assets = []
+            for column, amount in zip(row.indices, row.data):
+                
+                ticker = tickers[column]
+                template = assets_by_ticker.get(ticker)
+                if template is None:
+                    
+                    assets.append(Asset(name=ticker, ticker=ticker, category="Other", amount=float(amount)))
+                else:
+                    
+                    assets.append(Asset(name=template.name, ticker=ticker, category=template.category, amount=float(amount), currency=template.currency))
+            return cls(assets=assets)
+        else:
+            
+            raise TypeError("Invalid type! The tickers must be a list.")
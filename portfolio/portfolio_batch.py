@@ -0,0 +1,214 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from market_data import get_price_store, period_boundary_prices
+from market_data.price_store import period_start_positions
+from pandas import DataFrame
+from portfolio import Portfolio
+from tools.instrumentation import timed
+from tools.lazy_imports import LazyModule
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    
+    from scipy.sparse import csr_matrix
+
+sparse = LazyModule("scipy.sparse")
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def holdings_matrix(portfolios: Dict[str, Portfolio]) -> Tuple["csr_matrix", List[str], List[str]]:
+    """Builds the sparse holdings matrix of many portfolios over the union of their tickers.
+
+    Only the positions are stored, so the memory grows with the number of
+    positions and not with the number of portfolios times the universe size.
+    The amounts of a ticker held twice by the same portfolio are summed.
+
+    Args:
+        portfolios (Dict[str, Portfolio]): The portfolios by name.
+
+    Raises:
+        ValueError: If a ticker is quoted in two currencies.
+
+    Returns:
+        Tuple[csr_matrix, List[str], List[str]]: The amounts with portfolios as rows and tickers as columns,
+        the tickers and the currency of each ticker.
+    """
+    tickers_codes: Dict[str, int] = {}
+    currencies_list = []
+    rows, columns, amounts = [], [], []
+    for row, portfolio in enumerate(portfolios.values()):
+        
+        for asset in portfolio.assets:
+            
+            if asset.ticker not in tickers_codes:
+                
+                tickers_codes[asset.ticker] = len(tickers_codes)
+                currencies_list.append(asset.currency)
+            elif currencies_list[tickers_codes[asset.ticker]] != asset.currency:
+                
+                raise ValueError(f"The ticker {asset.ticker} is quoted in more than one currency.")
+            rows.append(row)
+            columns.append(tickers_codes[asset.ticker])
+            amounts.append(asset.amount)
+    holdings = sparse.csr_matrix((np.array(amounts, dtype=np.float64), (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64))), shape=(len(portfolios), len(tickers_codes)))
+    return holdings, list(tickers_codes.keys()), currencies_list
+
+def _risk_statistics(daily_returns: np.ndarray) -> np.ndarray:
+    """Calculates the annualized volatility and the one-day historical value at risk of portfolio return series.
+
+    Args:
+        daily_returns (np.ndarray): The daily portfolio returns with dates as rows and portfolios as columns.
+
+    Returns:
+        np.ndarray: The volatility (%) and the 95% value at risk (%) with portfolios as rows.
+    """
+    volatility = np.nanstd(daily_returns, axis=0, ddof=1)*np.sqrt(TRADING_DAYS_PER_YEAR)*100
+    value_at_risk = -np.nanpercentile(daily_returns, 5, axis=0)*100
+    return np.column_stack([volatility, value_at_risk])
+
+def _chunk_analytics(holdings: "csr_matrix", boundary_prices: np.ndarray, price_changes: np.ndarray, previous_prices: np.ndarray) -> np.ndarray:
+    """Calculates the analytics of a chunk of portfolios with sparse-dense matrix products.
+
+    The daily return of a portfolio is its change in value over its value on
+    the previous day, both counted only on the tickers that have a price on
+    both days, so a ticker that lists inside the risk time period enters the
+    portfolio from its second price on instead of as a jump from zero.
+
+    Args:
+        holdings (csr_matrix): The amounts with portfolios as rows and tickers as columns.
+        boundary_prices (np.ndarray): The first price of each time period followed by the last price, with tickers as columns.
+        price_changes (np.ndarray): The daily price changes of the risk time period, zero when a price is missing.
+        previous_prices (np.ndarray): The prices of the previous days, zero when the price change is missing.
+
+    Returns:
+        np.ndarray: The valuation, the returns (%), the volatility (%) and the value at risk (%) with portfolios as rows.
+    """
+    boundary_values = (holdings @ boundary_prices.T).T
+    first_values, last_values = boundary_values[:-1], boundary_values[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        returns = (last_values - first_values)/first_values*100
+        previous_values = (holdings @ previous_prices.T).T
+        daily_returns = np.where(previous_values > 0, (holdings @ price_changes.T).T/previous_values, np.nan)
+    risk = _risk_statistics(daily_returns=daily_returns)
+    return np.column_stack([last_values, returns.T, risk])
+
+def batch_portfolio_analytics(portfolios: Dict[str, Portfolio], base_currency: str = "USD", time_periods: Optional[List[str]] = None, risk_time_period: str = "1y", max_workers: Optional[int] = None, parallel_threshold: int = 1000) -> DataFrame:
+    """Calculates the valuation, the returns and the risk of many portfolios at once.
+
+    The prices of the union of the tickers are loaded once and converted to
+    the base currency, then every figure of every portfolio comes from a
+    product between the sparse holdings matrix and the price matrix. Above
+    parallel_threshold portfolios, the products run by chunks of portfolios
+    in a thread pool (NumPy and the SciPy sparse kernels release the GIL, so
+    the chunks use every core and share the price matrix without copies).
+
+    Args:
+        portfolios (Dict[str, Portfolio]): The portfolios by name.
+        base_currency (str, optional): The currency of the valuations. Defaults to "USD".
+        time_periods (Optional[List[str]], optional): The time periods of the returns. Defaults to all valid time periods.
+        risk_time_period (str, optional): The time period of the volatility and the value at risk. Defaults to "1y".
+        max_workers (Optional[int], optional): The number of threads. Defaults to None (number of CPUs).
+        parallel_threshold (int, optional): The number of portfolios from which the products run in parallel. Defaults to 1000.
+
+    Raises:
+        ValueError: If a time period is not valid.
+        TypeError: If the inputs are not a dict and a str.
+
+    Returns:
+        DataFrame: A table with portfolios as rows and the valuation, the returns (%), the volatility (%)
+        and the 95% one-day value at risk (%) as columns.
+    """
+    if isinstance(portfolios, dict) and isinstance(base_currency, str):
+        
+        if time_periods is None:
+            
+            time_periods = Portfolio.VALIDS_TIME_PERIODS
+        time_periods = list(time_periods)
+        for time_period in time_periods + [risk_time_period]:
+            
+            if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+                
+                raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        columns = [f"Valuation ({base_currency})"] + [f"Return (%) - {time_period}" for time_period in time_periods] + ["Volatility (%)", "VaR 95% (%)"]
+        holdings, tickers_list, currencies_list = holdings_matrix(portfolios=portfolios)
+        if len(tickers_list) == 0:
+            
+            return pd.DataFrame(index=list(portfolios.keys()), columns=columns, dtype=np.float64)
+        price_store = get_price_store()
+        price_matrix = price_store.price_matrix(tickers=tickers_list, time_period="max")
+        price_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies_list, base_currency=base_currency)
+        first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=time_periods)
+        boundary_prices = np.vstack([first_prices.to_numpy(), last_prices.to_numpy()])
+        price_matrix = price_matrix.dropna(how="all")
+        risk_start = int(period_start_positions(price_matrix=price_matrix, time_period=risk_time_period).min(initial=len(price_matrix.index)))
+        risk_prices = price_matrix.ffill().iloc[risk_start:].to_numpy(dtype=np.float64)
+        price_changes = risk_prices[1:] - risk_prices[:-1]
+        previous_prices = np.where(np.isnan(price_changes), 0.0, risk_prices[:-1])
+        price_changes = np.nan_to_num(price_changes)
+        chunk_size = len(portfolios)
+        if len(portfolios) >= parallel_threshold:
+            
+            chunk_size = max(1, -(-len(portfolios)//(max_workers or os.cpu_count() or 1)))
+        chunks = [holdings[position:position + chunk_size] for position in range(0, len(portfolios), chunk_size)]
+        with timed("analytics.batch_portfolios"):
+            
+            if len(chunks) == 1:
+                
+                results = [_chunk_analytics(holdings=chunks[0], boundary_prices=boundary_prices, price_changes=price_changes, previous_prices=previous_prices)]
+            else:
+                
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    
+                    results = list(executor.map(_chunk_analytics, chunks, [boundary_prices]*len(chunks), [price_changes]*len(chunks), [previous_prices]*len(chunks)))
+        analytics_pd = pd.DataFrame(data=np.vstack(results), index=list(portfolios.keys()), columns=columns)
+        return analytics_pd.round(2)
+    else:
+        
+        raise TypeError("Invalid types! This function expects a dict and a str.")
+
+def batch_position_weights(portfolios: Dict[str, Portfolio], base_currency: str = "USD") -> Tuple["csr_matrix", List[str]]:
+    """Calculates the weight of every position of many portfolios at once.
+
+    The weights keep the sparsity of the holdings matrix: the values of the
+    positions are the holdings scaled by the last prices and each row is then
+    divided by the valuation of its portfolio.
+
+    Args:
+        portfolios (Dict[str, Portfolio]): The portfolios by name.
+        base_currency (str, optional): The currency of the valuations. Defaults to "USD".
+
+    Raises:
+        TypeError: If the inputs are not a dict and a str.
+
+    Returns:
+        Tuple[csr_matrix, List[str]]: The weights with portfolios as rows and tickers as columns and the tickers.
+    """
+    if isinstance(portfolios, dict) and isinstance(base_currency, str):
+        
+        holdings, tickers_list, currencies_list = holdings_matrix(portfolios=portfolios)
+        if len(tickers_list) == 0:
+            
+            return holdings, tickers_list
+        price_store = get_price_store()
+        price_matrix = price_store.price_matrix(tickers=tickers_list, field="Close", time_period="5d")
+        price_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies_list, base_currency=base_currency)
+        last_prices = np.nan_to_num(price_matrix.ffill().to_numpy()[-1])
+        positions_values = holdings @ sparse.diags(last_prices)
+        valuations = np.asarray(positions_values.sum(axis=1)).ravel()
+        with np.errstate(divide="ignore"):
+            
+            inverse_valuations = np.where(valuations != 0, 1/valuations, 0.0)
+        weights = sparse.csr_matrix(sparse.diags(inverse_valuations) @ positions_values)
+        return weights, tickers_list
+    else:
+        
+        raise TypeError("Invalid types! This function expects a dict and a str.")
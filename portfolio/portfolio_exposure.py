@@ -0,0 +1,262 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import pandas as pd
+from asset import Asset
+from market_data import get_price_store, period_boundary_prices
+from pandas import DataFrame
+from portfolio import Portfolio
+from tools.instrumentation import timed
+from tools.lazy_imports import LazyModule
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from .portfolio_batch import holdings_matrix
+
+if TYPE_CHECKING:
+    
+    from scipy.sparse import csr_matrix
+
+sparse = LazyModule("scipy.sparse")
+
+
+VALIDS_GROUPINGS = ["category", "currency"]
+
+
+def _group_label(asset: Asset, grouping: Union[str, Dict[str, str]]) -> str:
+    """Finds the group of an asset.
+
+    Args:
+        asset (Asset): The asset.
+        grouping (Union[str, Dict[str, str]]): An attribute of the assets (category or currency) or the group of each ticker.
+
+    Returns:
+        str: The group. The tickers missing in a dict grouping belong to the "other" group.
+    """
+    if isinstance(grouping, dict):
+        
+        return grouping.get(asset.ticker, "other")
+    elif grouping == "category":
+        
+        return asset.category.lower()
+    return asset.currency
+
+def group_codes(labels: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Encodes the group labels as integer codes.
+
+    Args:
+        labels (List[str]): The group of each position.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The code of each position and the groups, in order of appearance.
+    """
+    codes, groups = pd.factorize(pd.Index(labels, dtype=object))
+    return codes.astype(np.int64), list(groups)
+
+def _check_grouping(grouping: Union[str, Dict[str, str]]) -> None:
+    """Checks if a grouping is valid.
+
+    Args:
+        grouping (Union[str, Dict[str, str]]): An attribute of the assets or the group of each ticker.
+
+    Raises:
+        ValueError: If the grouping is not valid.
+    """
+    if not isinstance(grouping, dict) and grouping not in VALIDS_GROUPINGS:
+        
+        raise ValueError(f"Invalid grouping! The valids groupings are {VALIDS_GROUPINGS} or a dict with the group of each ticker.")
+
+def portfolio_exposure(portfolio: Portfolio, grouping: Union[str, Dict[str, str]] = "category", base_currency: str = "USD", time_period: str = "1y", price_matrix: Optional[DataFrame] = None) -> DataFrame:
+    """Aggregates the value, the weight, the return contribution and the risk contribution of a portfolio by group.
+
+    The position figures are computed once and summed by group with a
+    bincount over integer group codes. The return contribution of a position
+    is its weight at the start of the time period times its return, so the
+    contributions add up to the portfolio return. The risk contribution is
+    the share of the variance of the daily portfolio returns, computed from
+    the product between the centered returns and the weights, without the
+    covariance matrix.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        grouping (Union[str, Dict[str, str]], optional): An attribute of the assets (category or currency) or the group
+        of each ticker. For instance: a sector or a country by ticker. Defaults to "category".
+        base_currency (str, optional): The currency of the values. Defaults to "USD".
+        time_period (str, optional): The time period of the returns and of the risk. Defaults to "1y".
+        price_matrix (Optional[DataFrame], optional): A prepared table of prices in the quote currency of each ticker,
+        with dates as rows and tickers as columns. Defaults to None (shared price store).
+
+    Raises:
+        ValueError: If the grouping or the time period is not valid.
+        TypeError: If the inputs are not a Portfolio, a str or a dict and a str.
+
+    Returns:
+        DataFrame: A table with the groups as rows, sorted by value, and the value, the weight (%),
+        the return contribution (%) and the risk contribution (%) as columns.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(grouping, (str, dict)) and isinstance(base_currency, str):
+        
+        _check_grouping(grouping=grouping)
+        if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+            
+            raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        columns = [f"Value ({base_currency})", "Weight (%)", "Return contribution (%)", "Risk contribution (%)"]
+        if len(portfolio.assets) == 0:
+            
+            return pd.DataFrame(columns=columns, dtype=np.float64)
+        tickers_list = [asset.ticker for asset in portfolio.assets]
+        currencies_list = [asset.currency for asset in portfolio.assets]
+        assets_amounts = np.array([asset.amount for asset in portfolio.assets], dtype=np.float64)
+        price_store = get_price_store()
+        if price_matrix is None:
+            
+            price_matrix = price_store.price_matrix(tickers=tickers_list, time_period=time_period)
+        else:
+            
+            price_matrix = price_matrix.reindex(columns=tickers_list)
+        price_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies_list, base_currency=base_currency)
+        codes, groups = group_codes(labels=[_group_label(asset=asset, grouping=grouping) for asset in portfolio.assets])
+        with timed("analytics.exposure"):
+            
+            prices = price_matrix.dropna(how="all").ffill().bfill().to_numpy(dtype=np.float64)
+            values = np.nan_to_num(prices[-1]*assets_amounts)
+            start_values = np.nan_to_num(prices[0]*assets_amounts)
+            weights = values/values.sum() if values.sum() != 0 else np.zeros(len(values))
+            start_weights = start_values/start_values.sum() if start_values.sum() != 0 else np.zeros(len(values))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                
+                assets_returns = np.nan_to_num(prices[-1]/prices[0] - 1)
+                daily_returns = np.nan_to_num(prices[1:]/prices[:-1] - 1)
+            centered_returns = daily_returns - daily_returns.mean(axis=0)
+            covariance_weights = centered_returns.T @ (centered_returns @ weights)/max(len(daily_returns) - 1, 1)
+            variance = weights @ covariance_weights
+            risk_contributions = weights*covariance_weights/variance if variance > 0 else np.zeros(len(values))
+            exposure = np.column_stack([
+                np.bincount(codes, weights=values, minlength=len(groups)),
+                np.bincount(codes, weights=weights, minlength=len(groups))*100,
+                np.bincount(codes, weights=start_weights*assets_returns, minlength=len(groups))*100,
+                np.bincount(codes, weights=risk_contributions, minlength=len(groups))*100,
+            ])
+        exposure_pd = pd.DataFrame(data=exposure, index=pd.Index(groups, name=grouping if isinstance(grouping, str) else "group"), columns=columns)
+        return exposure_pd.sort_values(by=columns[0], ascending=False).round(2)
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio, a str or a dict and a str.")
+
+def _positions_risk_covariances(weights: "csr_matrix", daily_returns: np.ndarray, chunk_size: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the covariance between the daily returns of every position and of its portfolio.
+
+    The returns are zero where a ticker has no price change. A portfolio only
+    counts the days where at least one of its tickers has a price change, so
+    its figures do not depend on the calendars of the other portfolios. The
+    covariances are only computed on the positions, by chunks of positions.
+
+    Args:
+        weights (csr_matrix): The weights with portfolios as rows and tickers as columns.
+        daily_returns (np.ndarray): The daily returns with dates as rows and tickers as columns, NaN where a price change is missing.
+        chunk_size (int, optional): The number of positions of each chunk. Defaults to 65536.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The covariance of each position, in the order of weights.data,
+        and the variance of the daily returns of each portfolio.
+    """
+    weights = weights.tocoo()
+    rows, columns = weights.row, weights.col
+    filled_returns = np.nan_to_num(daily_returns)
+    pattern = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=weights.shape)
+    days_counts = ((pattern @ (~np.isnan(daily_returns)).T.astype(np.float64)) > 0).sum(axis=1)
+    portfolios_returns = (weights @ filled_returns.T).T
+    returns_sums = filled_returns.sum(axis=0)
+    portfolios_sums = portfolios_returns.sum(axis=0)
+    products = np.empty(len(rows))
+    for position in range(0, len(rows), chunk_size):
+        
+        chunk = slice(position, position + chunk_size)
+        products[chunk] = np.einsum("ti,ti->i", filled_returns[:, columns[chunk]], portfolios_returns[:, rows[chunk]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        covariances = (products - returns_sums[columns]*portfolios_sums[rows]/days_counts[rows])/(days_counts[rows] - 1)
+        variances = ((portfolios_returns**2).sum(axis=0) - portfolios_sums**2/days_counts)/(days_counts - 1)
+    return np.nan_to_num(covariances), np.nan_to_num(variances)
+
+def batch_exposure(portfolios: Dict[str, Portfolio], grouping: Union[str, Dict[str, str]] = "category", base_currency: str = "USD", time_period: str = "1y") -> DataFrame:
+    """Aggregates the value, the weight, the return contribution and the risk contribution of many portfolios by group at once.
+
+    The figures are the ones of portfolio_exposure. Every figure of every
+    position is a sparse matrix with the sparsity of the holdings matrix, and
+    it is summed by group with a product by a sparse indicator matrix with the
+    tickers as rows and the groups as columns, so the cost grows with the
+    number of positions. The boundaries of the time period are found on the
+    prices of each ticker (see period_boundary_prices).
+
+    Args:
+        portfolios (Dict[str, Portfolio]): The portfolios by name.
+        grouping (Union[str, Dict[str, str]], optional): An attribute of the assets (category or currency) or the group
+        of each ticker. Defaults to "category".
+        base_currency (str, optional): The currency of the values. Defaults to "USD".
+        time_period (str, optional): The time period of the returns and of the risk. Defaults to "1y".
+
+    Raises:
+        ValueError: If the grouping or the time period is not valid.
+        TypeError: If the inputs are not a dict, a str or a dict and a str.
+
+    Returns:
+        DataFrame: A table with portfolios as rows and the value, the weight (%), the return contribution (%)
+        and the risk contribution (%) of each group as columns, indexed by (figure, group).
+    """
+    if isinstance(portfolios, dict) and isinstance(grouping, (str, dict)) and isinstance(base_currency, str):
+        
+        _check_grouping(grouping=grouping)
+        if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+            
+            raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        figures = [f"Value ({base_currency})", "Weight (%)", "Return contribution (%)", "Risk contribution (%)"]
+        holdings, tickers_list, currencies_list = holdings_matrix(portfolios=portfolios)
+        if len(tickers_list) == 0:
+            
+            return pd.DataFrame(index=list(portfolios.keys()), columns=pd.MultiIndex.from_product([figures, []]), dtype=np.float64)
+        assets_by_ticker = {}
+        for portfolio in portfolios.values():
+            
+            for asset in portfolio.assets:
+                
+                assets_by_ticker.setdefault(asset.ticker, asset)
+        codes, groups = group_codes(labels=[_group_label(asset=assets_by_ticker[ticker], grouping=grouping) for ticker in tickers_list])
+        price_store = get_price_store()
+        price_matrix = price_store.price_matrix(tickers=tickers_list, time_period=time_period)
+        price_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies_list, base_currency=base_currency).dropna(how="all")
+        first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=[time_period])
+        first_prices, last_prices = np.nan_to_num(first_prices.to_numpy()[0]), np.nan_to_num(last_prices.to_numpy())
+        with timed("analytics.batch_exposure"):
+            
+            raw_prices = price_matrix.to_numpy(dtype=np.float64)
+            prices = price_matrix.ffill().to_numpy(dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                
+                assets_returns = np.nan_to_num(last_prices/first_prices - 1)
+                daily_returns = prices[1:]/prices[:-1] - 1
+            daily_returns[np.isnan(raw_prices[1:])] = np.nan
+            values = sparse.csr_matrix(holdings @ sparse.diags(last_prices))
+            start_values = sparse.csr_matrix(holdings @ sparse.diags(first_prices))
+            valuations = np.asarray(values.sum(axis=1)).ravel()
+            start_valuations = np.asarray(start_values.sum(axis=1)).ravel()
+            with np.errstate(divide="ignore"):
+                
+                weights = sparse.csr_matrix(sparse.diags(np.where(valuations != 0, 1/valuations, 0.0)) @ values)
+                start_weights = sparse.csr_matrix(sparse.diags(np.where(start_valuations != 0, 1/start_valuations, 0.0)) @ start_values)
+            covariances, variances = _positions_risk_covariances(weights=weights, daily_returns=daily_returns)
+            risk_contributions = weights.tocoo()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                
+                risk_contributions.data = np.where(variances[risk_contributions.row] > 0, risk_contributions.data*covariances/variances[risk_contributions.row], 0.0)
+            indicator = sparse.csr_matrix((np.ones(len(codes)), (np.arange(len(codes)), codes)), shape=(len(codes), len(groups)))
+            exposure = np.hstack([
+                (values @ indicator).toarray(),
+                (weights @ indicator).toarray()*100,
+                (start_weights @ sparse.diags(assets_returns) @ indicator).toarray()*100,
+                (risk_contributions.tocsr() @ indicator).toarray()*100,
+            ])
+        return pd.DataFrame(data=exposure, index=list(portfolios.keys()), columns=pd.MultiIndex.from_product([figures, groups])).round(2)
+    else:
+        
+        raise TypeError("Invalid types! This function expects a dict, a str or a dict and a str.")
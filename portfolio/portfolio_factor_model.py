@@ -0,0 +1,302 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import pandas as pd
+from market_data import get_price_store
+from pandas import Series
+from portfolio import Portfolio
+from statistics import NormalDist
+from tools.instrumentation import timed
+from typing import List, Optional, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    
+    from scipy.sparse import csr_matrix
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class FactorCovariance:
+    """Factor covariance class
+
+    A covariance matrix of N assets written as B @ F @ B.T + D, with the
+    loadings B (N x K), the diagonal covariance F of K statistical factors and
+    the diagonal D of the specific variances. Every product with it costs
+    O(N*K) and its inverse comes from the Woodbury identity in O(N*K^2), so
+    the N x N matrix is never built (10,000 assets need 800 MB as a dense
+    matrix and a few MB as factors).
+
+    The weights of the methods are a vector of N weights or a matrix with one
+    portfolio per row (dense or sparse), so many portfolios are priced at once.
+    """
+
+    def __init__(self, loadings: np.ndarray, factor_variances: np.ndarray, specific_variances: np.ndarray, tickers: Optional[List[str]] = None, explained_variance: Optional[float] = None) -> None:
+        """
+        Args:
+            loadings (np.ndarray): The loadings with assets as rows and factors as columns.
+            factor_variances (np.ndarray): The variance of each factor.
+            specific_variances (np.ndarray): The specific variance of each asset.
+            tickers (Optional[List[str]], optional): The tickers of the assets. Defaults to None.
+            explained_variance (Optional[float], optional): The share of the total variance explained by the factors. Defaults to None.
+
+        Raises:
+            ValueError: If the sizes do not match or a specific variance is not positive.
+        """
+        self.loadings = np.atleast_2d(np.asarray(loadings, dtype=np.float64))
+        self.factor_variances = np.asarray(factor_variances, dtype=np.float64).ravel()
+        self.specific_variances = np.asarray(specific_variances, dtype=np.float64).ravel()
+        if self.loadings.shape != (len(self.specific_variances), len(self.factor_variances)):
+            
+            raise ValueError("The loadings must have one row per asset and one column per factor.")
+        if np.any(self.specific_variances <= 0):
+            
+            raise ValueError("The specific variances must be positive.")
+        self.tickers = list(tickers) if tickers is not None else None
+        self.explained_variance = explained_variance
+
+    @property
+    def num_assets(self) -> int:
+        """The number of assets."""
+        return self.loadings.shape[0]
+
+    @property
+    def num_factors(self) -> int:
+        """The number of factors."""
+        return self.loadings.shape[1]
+
+    def matvec(self, weights: Union[np.ndarray, "csr_matrix"]) -> np.ndarray:
+        """Multiplies weights by the covariance matrix.
+
+        Args:
+            weights (Union[np.ndarray, csr_matrix]): The weights of one or many portfolios.
+
+        Returns:
+            np.ndarray: The product, with the shape of the weights.
+        """
+        factor_exposures = np.asarray(weights @ self.loadings)*self.factor_variances
+        specific_terms = weights.multiply(self.specific_variances).toarray() if hasattr(weights, "multiply") else weights*self.specific_variances
+        return factor_exposures @ self.loadings.T + specific_terms
+
+    def variance(self, weights: Union[np.ndarray, "csr_matrix"]) -> Union[float, np.ndarray]:
+        """Calculates the variance of the returns of one or many portfolios.
+
+        Args:
+            weights (Union[np.ndarray, csr_matrix]): The weights of one or many portfolios.
+
+        Returns:
+            Union[float, np.ndarray]: The variance of each portfolio.
+        """
+        factor_exposures = np.asarray(weights @ self.loadings)
+        squared_weights = weights.multiply(weights) if hasattr(weights, "multiply") else weights**2
+        variances = factor_exposures**2 @ self.factor_variances + squared_weights @ self.specific_variances
+        return float(variances) if np.ndim(variances) == 0 else np.asarray(variances)
+
+    def volatility(self, weights: Union[np.ndarray, "csr_matrix"], annualize: bool = True) -> Union[float, np.ndarray]:
+        """Calculates the volatility of the returns of one or many portfolios.
+
+        Args:
+            weights (Union[np.ndarray, csr_matrix]): The weights of one or many portfolios.
+            annualize (bool, optional): If the daily volatility must be annualized. Defaults to True.
+
+        Returns:
+            Union[float, np.ndarray]: The volatility (%) of each portfolio.
+        """
+        return np.sqrt(self.variance(weights=weights)*(TRADING_DAYS_PER_YEAR if annualize else 1))*100
+
+    def value_at_risk(self, weights: Union[np.ndarray, "csr_matrix"], confidence: float = 0.95, horizon: int = 1, expected_returns: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        """Calculates the parametric (normal) value at risk of one or many portfolios.
+
+        Args:
+            weights (Union[np.ndarray, csr_matrix]): The weights of one or many portfolios.
+            confidence (float, optional): The confidence level. Defaults to 0.95.
+            horizon (int, optional): The number of trading days. Defaults to 1.
+            expected_returns (Optional[np.ndarray], optional): The expected daily returns of the assets. Defaults to None (zero).
+
+        Returns:
+            Union[float, np.ndarray]: The value at risk (%) of each portfolio, as a positive loss.
+        """
+        value_at_risk = NormalDist().inv_cdf(confidence)*np.sqrt(self.variance(weights=weights)*horizon)
+        if expected_returns is not None:
+            
+            value_at_risk = value_at_risk - np.asarray(weights @ expected_returns)*horizon
+        return value_at_risk*100
+
+    def risk_contributions(self, weights: np.ndarray) -> np.ndarray:
+        """Calculates the share of the variance of a portfolio that comes from each asset.
+
+        Args:
+            weights (np.ndarray): The weights of the portfolio.
+
+        Returns:
+            np.ndarray: The risk contribution (%) of each asset. They add up to 100.
+        """
+        marginal_risks = weights*self.matvec(weights=weights)
+        variance = marginal_risks.sum()
+        return marginal_risks/variance*100 if variance > 0 else np.zeros(len(weights))
+
+    def solve(self, right_hand_side: np.ndarray) -> np.ndarray:
+        """Multiplies vectors by the inverse of the covariance matrix with the Woodbury identity.
+
+        Args:
+            right_hand_side (np.ndarray): A vector of N values or a matrix with N rows.
+
+        Returns:
+            np.ndarray: The solution, with the shape of the right hand side.
+        """
+        scaled_loadings = self.loadings/self.specific_variances[:, None]
+        capacitance = np.diag(1/self.factor_variances) + self.loadings.T @ scaled_loadings
+        scaled_right_hand_side = right_hand_side/(self.specific_variances if np.ndim(right_hand_side) == 1 else self.specific_variances[:, None])
+        return scaled_right_hand_side - scaled_loadings @ np.linalg.solve(capacitance, self.loadings.T @ scaled_right_hand_side)
+
+    def mean_variance_weights(self, expected_returns: np.ndarray, risk_factor: float) -> np.ndarray:
+        """Calculates the weights that minimize risk_factor * w @ covariance @ w - expected_returns @ w with weights that add up to one.
+
+        Args:
+            expected_returns (np.ndarray): The expected returns of the assets.
+            risk_factor (float): The risk factor.
+
+        Returns:
+            np.ndarray: The weights. Short positions are allowed.
+        """
+        solutions = self.solve(right_hand_side=np.column_stack([expected_returns, np.ones(self.num_assets)]))
+        multiplier = (2*risk_factor - solutions[:, 0].sum())/solutions[:, 1].sum()
+        return (solutions[:, 0] + multiplier*solutions[:, 1])/(2*risk_factor)
+
+    def to_dense(self) -> np.ndarray:
+        """Builds the N x N covariance matrix. It is meant for small universes.
+
+        Returns:
+            np.ndarray: The covariance matrix.
+        """
+        return (self.loadings*self.factor_variances) @ self.loadings.T + np.diag(self.specific_variances)
+
+    def subset(self, positions: Union[List[int], np.ndarray]) -> "FactorCovariance":
+        """Selects the covariance of some of the assets, with the same factors.
+
+        Args:
+            positions (Union[List[int], np.ndarray]): The positions of the assets.
+
+        Returns:
+            FactorCovariance: The covariance of the selected assets.
+        """
+        tickers = [self.tickers[position] for position in positions] if self.tickers is not None else None
+        return FactorCovariance(loadings=self.loadings[positions], factor_variances=self.factor_variances, specific_variances=self.specific_variances[positions], tickers=tickers, explained_variance=self.explained_variance)
+
+
+def fit_factor_covariance(returns: np.ndarray, num_factors: Optional[int] = None, explained_variance: float = 0.9, tickers: Optional[List[str]] = None) -> FactorCovariance:
+    """Fits a statistical factor model (PCA) to a matrix of returns with a truncated SVD.
+
+    The factors are the first right singular vectors of the centered returns,
+    so the fit costs O(T*N*min(T, N)) for T dates and N assets and works when
+    N is larger than T, where the sample covariance matrix is singular. The
+    specific variance of an asset is the part of its sample variance that the
+    factors do not explain.
+
+    Args:
+        returns (np.ndarray): The returns with dates as rows and assets as columns. Missing returns count as the mean return.
+        num_factors (Optional[int], optional): The number of factors. Defaults to None (the fewest factors that explain
+        explained_variance of the total variance).
+        explained_variance (float, optional): The share of the total variance to explain when num_factors is None. Defaults to 0.9.
+        tickers (Optional[List[str]], optional): The tickers of the assets. Defaults to None.
+
+    Raises:
+        ValueError: If there are less than two dates or the number of factors is not between 1 and min(T - 1, N).
+
+    Returns:
+        FactorCovariance: The factor covariance.
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    num_dates, num_assets = returns.shape
+    max_factors = min(num_dates - 1, num_assets)
+    if num_dates < 2:
+        
+        raise ValueError("The returns must have at least two dates.")
+    if num_factors is not None and not 1 <= num_factors <= max_factors:
+        
+        raise ValueError(f"The number of factors must be between 1 and {max_factors}.")
+    with timed("estimation.factor_covariance"):
+        
+        with np.errstate(invalid="ignore"):
+            
+            centered_returns = np.nan_to_num(returns - np.nanmean(returns, axis=0))
+        _, singular_values, right_vectors = np.linalg.svd(centered_returns, full_matrices=False)
+        variances = singular_values**2/(num_dates - 1)
+        total_variances = np.sum(centered_returns**2, axis=0)/(num_dates - 1)
+        explained_shares = np.cumsum(variances)/max(variances.sum(), np.finfo(np.float64).tiny)
+        if num_factors is None:
+            
+            num_factors = min(int(np.searchsorted(explained_shares, explained_variance) + 1), max_factors)
+        loadings = right_vectors[:num_factors].T
+        factor_variances = np.maximum(variances[:num_factors], np.finfo(np.float64).tiny)
+        specific_variances = total_variances - (loadings**2) @ factor_variances
+        # A floor keeps the covariance positive definite for the assets fully explained by the factors.
+        specific_variances = np.maximum(specific_variances, 1e-6*max(float(np.median(total_variances)), np.finfo(np.float64).tiny))
+    return FactorCovariance(loadings=loadings, factor_variances=factor_variances, specific_variances=specific_variances, tickers=tickers, explained_variance=float(explained_shares[num_factors - 1]))
+
+def universe_factor_covariance(tickers: List[str], time_period: str = "1y", num_factors: Optional[int] = None, explained_variance: float = 0.9) -> FactorCovariance:
+    """Fits a factor covariance to the daily returns of a universe from the shared price store.
+
+    Args:
+        tickers (List[str]): The tickers.
+        time_period (str, optional): The time period of the returns. Defaults to "1y".
+        num_factors (Optional[int], optional): The number of factors. Defaults to None (from explained_variance).
+        explained_variance (float, optional): The share of the total variance to explain when num_factors is None. Defaults to 0.9.
+
+    Raises:
+        ValueError: If the time period is not valid.
+
+    Returns:
+        FactorCovariance: The factor covariance of the daily returns.
+    """
+    if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+        
+        raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+    price_matrix = get_price_store().price_matrix(tickers=tickers, time_period=time_period).dropna(how="all")
+    prices = price_matrix.ffill().to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        daily_returns = prices[1:]/prices[:-1] - 1
+    return fit_factor_covariance(returns=daily_returns, num_factors=num_factors, explained_variance=explained_variance, tickers=list(price_matrix.columns))
+
+def portfolio_factor_risk(portfolio: Portfolio, time_period: str = "1y", num_factors: Optional[int] = None, confidence: float = 0.95, base_currency: str = "USD") -> Series:
+    """Calculates the risk of a portfolio from a factor covariance of its assets.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str, optional): The time period of the returns. Defaults to "1y".
+        num_factors (Optional[int], optional): The number of factors. Defaults to None (90% of the variance explained).
+        confidence (float, optional): The confidence level of the value at risk. Defaults to 0.95.
+        base_currency (str, optional): The currency of the valuations of the weights. Defaults to "USD".
+
+    Raises:
+        ValueError: If the time period is not valid.
+        TypeError: If the inputs are not a Portfolio and a str.
+
+    Returns:
+        Series: The annualized volatility (%), the one-day value at risk (%), the systematic share of the variance (%),
+        the number of factors and the variance explained by them (%).
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(time_period, str):
+        
+        tickers_list = [asset.ticker for asset in portfolio.assets]
+        currencies_list = [asset.currency for asset in portfolio.assets]
+        covariance = universe_factor_covariance(tickers=tickers_list, time_period=time_period, num_factors=num_factors)
+        price_store = get_price_store()
+        last_prices = price_store.convert_to_base_currency(price_matrix=price_store.price_matrix(tickers=tickers_list, time_period="5d"), currencies=currencies_list, base_currency=base_currency).ffill()
+        values = np.nan_to_num(last_prices.to_numpy()[-1]*np.array([asset.amount for asset in portfolio.assets], dtype=np.float64))
+        weights = values/values.sum() if values.sum() != 0 else np.zeros(len(values))
+        variance = covariance.variance(weights=weights)
+        systematic_variance = ((weights @ covariance.loadings)**2) @ covariance.factor_variances
+        return pd.Series({
+            "Volatility (%)": covariance.volatility(weights=weights),
+            f"VaR {confidence*100:g}% (%)": covariance.value_at_risk(weights=weights, confidence=confidence),
+            "Systematic variance (%)": systematic_variance/variance*100 if variance > 0 else 0.0,
+            "Factors": covariance.num_factors,
+            "Explained variance (%)": covariance.explained_variance*100,
+        }).round(2)
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio and a str.")
@@ -0,0 +1,263 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tools.instrumentation import increment
+from typing import NamedTuple, Optional, Tuple
+from .portfolio_qubo import Qubo, evaluate_qubo
+
+VALIDS_HEURISTIC_METHODS = ["annealing", "tabu"]
+# About one second of sweeps or swaps in a single process (restarts x iterations x assets).
+PARALLEL_THRESHOLD = 2000000
+
+
+class HeuristicResult(NamedTuple):
+    """Heuristic result class
+
+    The best selection found (x) and its value (fval), as in the results of
+    the eigensolvers, and the distinct selections reached by the restarts,
+    sorted by value, with the share of restarts that ended on each one.
+    """
+
+    x: np.ndarray
+    fval: float
+    selections: np.ndarray
+    values: np.ndarray
+    probabilities: np.ndarray
+
+
+def _symmetric_terms(qubo: Qubo) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits a QUBO in the terms used by the swap moves.
+
+    Args:
+        qubo (Qubo): The QUBO.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The symmetric quadratic matrix, its diagonal and the linear terms.
+    """
+    quadratic = qubo.quadratic.toarray() if hasattr(qubo.quadratic, "toarray") else np.asarray(qubo.quadratic, dtype=np.float64)
+    symmetric = (quadratic + quadratic.T)/2
+    return symmetric, np.diag(symmetric).copy(), np.asarray(qubo.linear, dtype=np.float64)
+
+def _random_selections(rng: np.random.Generator, num_restarts: int, num_assets: int, budget: int) -> np.ndarray:
+    """Draws random selections of exactly budget assets.
+
+    Args:
+        rng (np.random.Generator): The random generator.
+        num_restarts (int): The number of selections.
+        num_assets (int): The number of assets.
+        budget (int): The number of selected assets.
+
+    Returns:
+        np.ndarray: The boolean selections as rows.
+    """
+    ranks = np.argsort(rng.random((num_restarts, num_assets)), axis=1)
+    return ranks < budget
+
+def simulated_annealing(qubo: Qubo, budget: int, num_restarts: int = 8, maxiter: int = 100, seed: Optional[int] = None) -> np.ndarray:
+    """Minimizes a QUBO over the selections of exactly budget assets with simulated annealing.
+
+    Every move swaps a selected asset with an unselected one, so the budget
+    always holds. The local fields (the product between the quadratic matrix
+    and the selection) are kept up to date, so the energy change of a swap
+    costs O(1) and an accepted swap costs O(n). The restarts run together as
+    the rows of the arrays, with a geometric cooling schedule.
+
+    Args:
+        qubo (Qubo): The QUBO.
+        budget (int): The number of selected assets.
+        num_restarts (int, optional): The number of independent runs. Defaults to 8.
+        maxiter (int, optional): The number of sweeps, a sweep being one proposed swap per asset. Defaults to 100.
+        seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+    Returns:
+        np.ndarray: The best selection of each run as rows.
+    """
+    rng = np.random.default_rng(seed)
+    symmetric, diagonal, linear = _symmetric_terms(qubo=qubo)
+    num_assets = len(linear)
+    selections = _random_selections(rng=rng, num_restarts=num_restarts, num_assets=num_assets, budget=budget)
+    if budget == 0 or budget == num_assets:
+        
+        return selections
+    selected = np.sort(np.argsort(~selections, axis=1, kind="stable")[:, :budget], axis=1)
+    unselected = np.sort(np.argsort(selections, axis=1, kind="stable")[:, :num_assets - budget], axis=1)
+    fields = selections @ symmetric
+    energies = np.einsum("ij,ij->i", fields, selections) + selections @ linear
+    best_selections = selections.copy()
+    best_energies = energies.copy()
+    rows = np.arange(num_restarts)
+    num_steps = maxiter*num_assets
+    # The initial temperature accepts an average uphill swap between random selections with a probability of 1/e.
+    sample_i = selected[rows, rng.integers(budget, size=num_restarts)]
+    sample_j = unselected[rows, rng.integers(num_assets - budget, size=num_restarts)]
+    sample_deltas = 2*(fields[rows, sample_j] - fields[rows, sample_i]) + diagonal[sample_i] + diagonal[sample_j] + linear[sample_j] - linear[sample_i] - 2*symmetric[sample_i, sample_j]
+    initial_temperature = float(np.mean(np.abs(sample_deltas))) or 1.0
+    temperatures = initial_temperature*np.geomspace(1.0, 1e-4, num=num_steps)
+    accepted_swaps = 0
+    for temperature in temperatures:
+        
+        out_slots = rng.integers(budget, size=num_restarts)
+        in_slots = rng.integers(num_assets - budget, size=num_restarts)
+        i = selected[rows, out_slots]
+        j = unselected[rows, in_slots]
+        deltas = 2*(fields[rows, j] - fields[rows, i]) + diagonal[i] + diagonal[j] + linear[j] - linear[i] - 2*symmetric[i, j]
+        accepted = (deltas <= 0) | (rng.random(num_restarts) < np.exp(-np.maximum(deltas, 0)/temperature))
+        if not accepted.any():
+            
+            continue
+        accepted_rows, i, j = rows[accepted], i[accepted], j[accepted]
+        fields[accepted_rows] += symmetric[j] - symmetric[i]
+        selections[accepted_rows, i] = False
+        selections[accepted_rows, j] = True
+        selected[accepted_rows, out_slots[accepted]] = j
+        unselected[accepted_rows, in_slots[accepted]] = i
+        energies[accepted_rows] += deltas[accepted]
+        improved = energies < best_energies
+        best_selections[improved] = selections[improved]
+        best_energies[improved] = energies[improved]
+        accepted_swaps += len(accepted_rows)
+    increment("solver.annealing.accepted_swaps", accepted_swaps)
+    return best_selections
+
+def tabu_search(qubo: Qubo, budget: int, num_restarts: int = 8, maxiter: int = 100, tenure: Optional[int] = None, seed: Optional[int] = None) -> np.ndarray:
+    """Minimizes a QUBO over the selections of exactly budget assets with tabu search.
+
+    Each iteration applies the best swap between a selected and an unselected
+    asset, even if it is uphill, and both assets cannot move again for tenure
+    iterations unless the swap beats the best selection found. The energy
+    changes of all the swaps come from the local fields, which an applied
+    swap updates in O(n).
+
+    Args:
+        qubo (Qubo): The QUBO.
+        budget (int): The number of selected assets.
+        num_restarts (int, optional): The number of independent runs. Defaults to 8.
+        maxiter (int, optional): The number of swaps of each run. Defaults to 100.
+        tenure (Optional[int], optional): The number of iterations an asset stays tabu. Defaults to None
+        (a quarter of the smallest between the selected and the unselected assets, at least 1).
+        seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+    Returns:
+        np.ndarray: The best selection of each run as rows.
+    """
+    rng = np.random.default_rng(seed)
+    symmetric, diagonal, linear = _symmetric_terms(qubo=qubo)
+    num_assets = len(linear)
+    initial_selections = _random_selections(rng=rng, num_restarts=num_restarts, num_assets=num_assets, budget=budget)
+    if budget == 0 or budget == num_assets:
+        
+        return initial_selections
+    if tenure is None:
+        
+        tenure = max(1, min(budget, num_assets - budget)//4)
+    best_selections = initial_selections.copy()
+    for restart, selection in enumerate(initial_selections):
+        
+        fields = symmetric @ selection
+        energy = fields @ selection + linear @ selection
+        best_energy = energy
+        tabu_until = np.zeros(num_assets, dtype=np.int64)
+        for iteration in range(maxiter):
+            
+            selected = np.flatnonzero(selection)
+            unselected = np.flatnonzero(~selection)
+            out_deltas = diagonal[selected] - 2*fields[selected] - linear[selected]
+            in_deltas = diagonal[unselected] + 2*fields[unselected] + linear[unselected]
+            deltas = out_deltas[:, None] + in_deltas[None, :] - 2*symmetric[np.ix_(selected, unselected)]
+            tabu = (tabu_until[selected] > iteration)[:, None] | (tabu_until[unselected] > iteration)[None, :]
+            deltas = np.where(tabu & (energy + deltas >= best_energy), np.inf, deltas)
+            move = np.argmin(deltas)
+            if np.isinf(deltas.flat[move]):
+                
+                break
+            i, j = selected[move//len(unselected)], unselected[move % len(unselected)]
+            fields += symmetric[j] - symmetric[i]
+            selection[i], selection[j] = False, True
+            energy += deltas.flat[move]
+            tabu_until[[i, j]] = iteration + 1 + tenure
+            if energy < best_energy:
+                
+                best_energy = energy
+                best_selections[restart] = selection
+    return best_selections
+
+def _solve_chunk(qubo: Qubo, budget: int, method: str, num_restarts: int, maxiter: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Runs a chunk of restarts. It is used as the job of the solver processes.
+
+    Args:
+        qubo (Qubo): The QUBO.
+        budget (int): The number of selected assets.
+        method (str): The heuristic (annealing or tabu).
+        num_restarts (int): The number of restarts of the chunk.
+        maxiter (int): The number of sweeps or of swaps of each restart.
+        seed (np.random.SeedSequence): The seed of the chunk.
+
+    Returns:
+        np.ndarray: The best selection of each restart as rows.
+    """
+    if method == "annealing":
+        
+        return simulated_annealing(qubo=qubo, budget=budget, num_restarts=num_restarts, maxiter=maxiter, seed=seed)
+    return tabu_search(qubo=qubo, budget=budget, num_restarts=num_restarts, maxiter=maxiter, seed=seed)
+
+def solve_qubo(qubo: Qubo, budget: int, method: str = "annealing", num_restarts: int = 32, maxiter: Optional[int] = None, workers: Optional[int] = None, seed: Optional[int] = None, parallel_threshold: int = PARALLEL_THRESHOLD) -> HeuristicResult:
+    """Minimizes a QUBO over the selections of exactly budget assets with independent restarts spread over processes.
+
+    Starting a process pool costs more than solving a small QUBO, so by default
+    the restarts only run in a pool when the work, counted as restarts times
+    iterations times assets, reaches parallel_threshold. The result only
+    depends on the seed and the number of workers.
+
+    Args:
+        qubo (Qubo): The QUBO.
+        budget (int): The number of selected assets.
+        method (str, optional): The heuristic (annealing or tabu). Defaults to "annealing".
+        num_restarts (int, optional): The number of independent runs. Defaults to 32.
+        maxiter (Optional[int], optional): The number of sweeps (annealing) or of swaps (tabu) of each run.
+        Defaults to None (100 sweeps or 10 swaps per asset).
+        workers (Optional[int], optional): The number of processes. Defaults to None (in-process below
+        parallel_threshold, else number of CPUs).
+        seed (Optional[int], optional): The seed of the random generators. Defaults to None.
+        parallel_threshold (int, optional): The work from which the restarts run in a process pool by default.
+        Defaults to PARALLEL_THRESHOLD.
+
+    Raises:
+        ValueError: If the method is not valid or the budget is not between 0 and the number of assets.
+
+    Returns:
+        HeuristicResult: The best selection, its value and the selections reached by the restarts.
+    """
+    num_assets = len(qubo.linear)
+    if method not in VALIDS_HEURISTIC_METHODS:
+        
+        raise ValueError(f"Invalid method! The valids methods are {VALIDS_HEURISTIC_METHODS}.")
+    if budget < 0 or budget > num_assets:
+        
+        raise ValueError("The budget must be between 0 and the number of assets.")
+    if maxiter is None:
+        
+        maxiter = 100 if method == "annealing" else 10*num_assets
+    if workers is None:
+        
+        workers = (os.cpu_count() or 1) if num_restarts*maxiter*num_assets >= parallel_threshold else 1
+    workers = max(min(workers, num_restarts), 1)
+    chunk_sizes = [len(chunk) for chunk in np.array_split(np.arange(num_restarts), workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    if workers == 1:
+        
+        chunks = [_solve_chunk(qubo, budget, method, chunk_sizes[0], maxiter, seeds[0])]
+    else:
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            
+            chunks = list(executor.map(_solve_chunk, [qubo]*workers, [budget]*workers, [method]*workers, chunk_sizes, [maxiter]*workers, seeds))
+    increment(f"solver.{method}.restarts", num_restarts)
+    selections, counts = np.unique(np.vstack(chunks).astype(np.int64), axis=0, return_counts=True)
+    values = evaluate_qubo(qubo=qubo, selections=selections)
+    order = np.argsort(values, kind="stable")
+    selections, values, probabilities = selections[order], values[order], counts[order]/num_restarts
+    return HeuristicResult(x=selections[0], fval=float(values[0]), selections=selections, values=values, probabilities=probabilities)
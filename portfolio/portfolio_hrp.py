@@ -0,0 +1,220 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+import pandas as pd
+from market_data import get_price_store
+from pandas import DataFrame, Series
+from portfolio import Portfolio
+from tools.instrumentation import timed
+from tools.lazy_imports import LazyModule
+from typing import List, Optional, Tuple, Union
+
+hierarchy = LazyModule("scipy.cluster.hierarchy")
+spatial_distance = LazyModule("scipy.spatial.distance")
+
+
+VALIDS_LINKAGE_METHODS = ["single", "complete", "average", "ward"]
+
+
+def quasi_diagonal_order(correlation: np.ndarray, linkage_method: str = "single") -> np.ndarray:
+    """Orders the assets so that the correlated assets are next to each other.
+
+    The assets are clustered with the distance sqrt((1 - correlation)/2) and
+    ordered as the leaves of the dendrogram. SciPy builds the single linkage
+    from a minimum spanning tree and the other linkages with the nearest
+    neighbor chain algorithm, both in O(N^2) time and memory.
+
+    Args:
+        correlation (np.ndarray): The correlation matrix.
+        linkage_method (str, optional): The linkage method. Defaults to "single".
+
+    Raises:
+        ValueError: If the linkage method is not valid.
+
+    Returns:
+        np.ndarray: The positions of the assets in the quasi-diagonal order.
+    """
+    if linkage_method not in VALIDS_LINKAGE_METHODS:
+        
+        raise ValueError(f"Invalid linkage method! The valids linkage methods are {VALIDS_LINKAGE_METHODS}.")
+    if len(correlation) < 2:
+        
+        return np.arange(len(correlation))
+    distance = np.sqrt(np.clip((1 - correlation)/2, 0.0, 1.0))
+    np.fill_diagonal(distance, 0.0)
+    with timed("matrix.linkage"):
+        
+        linkage_matrix = hierarchy.linkage(spatial_distance.squareform(distance, checks=False), method=linkage_method)
+    return hierarchy.leaves_list(linkage_matrix)
+
+def _block_sums(matrix: np.ndarray) -> np.ndarray:
+    """Builds the two-dimensional prefix sums of a matrix, so the sum of any square block costs O(1).
+
+    Args:
+        matrix (np.ndarray): The matrix.
+
+    Returns:
+        np.ndarray: The prefix sums, with a leading row and column of zeros.
+    """
+    prefix_sums = np.zeros((len(matrix) + 1, len(matrix) + 1))
+    prefix_sums[1:, 1:] = matrix.cumsum(axis=0).cumsum(axis=1)
+    return prefix_sums
+
+def _cluster_variances(scaled_sums: np.ndarray, weight_sums: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Calculates the variance of the inverse-variance portfolio of many contiguous clusters.
+
+    Args:
+        scaled_sums (np.ndarray): The prefix sums of correlation / (volatility * volatility.T).
+        weight_sums (np.ndarray): The prefix sums of 1/volatility^2, with a leading zero.
+        starts (np.ndarray): The first position of each cluster.
+        ends (np.ndarray): The position after the last one of each cluster.
+
+    Returns:
+        np.ndarray: The variance of each cluster.
+    """
+    block_sums = scaled_sums[ends, ends] - scaled_sums[starts, ends] - scaled_sums[ends, starts] + scaled_sums[starts, starts]
+    return block_sums/(weight_sums[ends] - weight_sums[starts])**2
+
+def recursive_bisection(correlation: np.ndarray, volatilities: np.ndarray) -> np.ndarray:
+    """Allocates between the two halves of every cluster of assets in inverse proportion to their variances.
+
+    The assets must be in the quasi-diagonal order. The variance of a cluster
+    is the variance of its inverse-variance portfolio, whose unnormalized
+    weights are 1/volatility^2, so it is the sum of a block of the matrix
+    correlation / (volatility * volatility.T) divided by the squared sum of
+    the unnormalized weights. Both sums come from prefix sums, so all the
+    clusters of a level of the bisection are split at once and the whole
+    bisection costs O(N^2) for the prefix sums plus O(N) per level.
+
+    Args:
+        correlation (np.ndarray): The correlation matrix in the quasi-diagonal order.
+        volatilities (np.ndarray): The volatility of each asset in the same order.
+
+    Returns:
+        np.ndarray: The weight of each asset, in the same order. They add up to one.
+    """
+    num_assets = len(volatilities)
+    inverse_volatilities = 1/volatilities
+    scaled_sums = _block_sums(matrix=correlation*np.outer(inverse_volatilities, inverse_volatilities))
+    weight_sums = np.concatenate([[0.0], np.cumsum(inverse_volatilities**2)])
+    starts, ends = np.array([0]), np.array([num_assets])
+    cluster_weights = np.array([1.0])
+    weights = np.zeros(num_assets)
+    with timed("analytics.recursive_bisection"):
+        
+        while len(starts) != 0:
+            
+            singletons = ends - starts == 1
+            weights[starts[singletons]] = cluster_weights[singletons]
+            starts, ends, cluster_weights = starts[~singletons], ends[~singletons], cluster_weights[~singletons]
+            middles = (starts + ends)//2
+            left_variances = _cluster_variances(scaled_sums=scaled_sums, weight_sums=weight_sums, starts=starts, ends=middles)
+            right_variances = _cluster_variances(scaled_sums=scaled_sums, weight_sums=weight_sums, starts=middles, ends=ends)
+            left_shares = 1 - left_variances/(left_variances + right_variances)
+            starts, ends = np.concatenate([starts, middles]), np.concatenate([middles, ends])
+            cluster_weights = np.concatenate([cluster_weights*left_shares, cluster_weights*(1 - left_shares)])
+    return weights
+
+def hrp_weights(correlation: DataFrame, volatilities: Union[Series, np.ndarray], linkage_method: str = "single") -> Series:
+    """Calculates the hierarchical risk parity weights of a universe.
+
+    Args:
+        correlation (DataFrame): The correlation matrix with the tickers as index and columns.
+        volatilities (Union[Series, np.ndarray]): The volatility of each ticker (by ticker or in the order of the columns).
+        linkage_method (str, optional): The linkage method of the clustering. Defaults to "single".
+
+    Raises:
+        ValueError: If the linkage method is not valid.
+
+    Returns:
+        Series: The weight of each ticker, in the quasi-diagonal order. They add up to one.
+    """
+    tickers = list(correlation.columns)
+    volatilities = volatilities.reindex(tickers).to_numpy(dtype=np.float64) if isinstance(volatilities, Series) else np.asarray(volatilities, dtype=np.float64)
+    correlation_array = np.nan_to_num(correlation.to_numpy(dtype=np.float64))
+    np.fill_diagonal(correlation_array, 1.0)
+    # The tickers without a volatility get the median one, so they are allocated as an average asset.
+    valid = np.isfinite(volatilities) & (volatilities > 0)
+    volatilities = np.where(valid, volatilities, np.median(volatilities[valid]) if valid.any() else 1.0)
+    order = quasi_diagonal_order(correlation=correlation_array, linkage_method=linkage_method)
+    weights = recursive_bisection(correlation=correlation_array[np.ix_(order, order)], volatilities=volatilities[order])
+    return pd.Series(data=weights, index=pd.Index([tickers[position] for position in order], name="Ticker"), name="Weight")
+
+def _daily_returns_statistics(tickers: List[str], time_period: str) -> Tuple[DataFrame, Series]:
+    """Calculates the correlation and the volatility of the daily returns of tickers from the shared price store.
+
+    The tickers can trade on different calendars (cryptocurrencies on weekends), so
+    each ticker only has returns on its own trading days, from its previous close,
+    and the correlation of two tickers is estimated on the days where both have a return.
+
+    Args:
+        tickers (List[str]): The tickers.
+        time_period (str): The time period of the returns.
+
+    Returns:
+        Tuple[DataFrame, Series]: The correlation matrix and the volatility of each ticker.
+    """
+    price_matrix = get_price_store().price_matrix(tickers=tickers, time_period=time_period).dropna(how="all")
+    prices = price_matrix.ffill().to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        daily_returns = prices[1:]/prices[:-1] - 1
+    daily_returns[np.isnan(price_matrix.to_numpy(dtype=np.float64)[1:])] = np.nan
+    daily_returns = pd.DataFrame(data=daily_returns, columns=price_matrix.columns)
+    with timed("matrix.correlation"):
+        
+        correlation = daily_returns.corr()
+    return correlation, daily_returns.std(ddof=1)
+
+def portfolio_hrp_allocation(portfolio: Portfolio, time_period: str = "1y", linkage_method: str = "single", value: Optional[float] = None, base_currency: str = "USD") -> DataFrame:
+    """Allocates a portfolio with hierarchical risk parity on the correlations of the daily returns of its assets.
+
+    The assets are clustered on the correlations of their returns rather than of
+    their price levels (Portfolio.correlation_between_assets), since two trending
+    prices are correlated whether or not their returns move together.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str, optional): The time period of the correlations and of the volatilities. Defaults to "1y".
+        linkage_method (str, optional): The linkage method of the clustering. Defaults to "single".
+        value (Optional[float], optional): The value to allocate. Defaults to None (the current valuation of the portfolio).
+        base_currency (str, optional): The currency of the value. Defaults to "USD".
+
+    Raises:
+        ValueError: If the time period or the linkage method is not valid.
+        TypeError: If the inputs are not a Portfolio and a str.
+
+    Returns:
+        DataFrame: A table with the tickers as rows, in the quasi-diagonal order, and the weight (%),
+        the target value and the target amount of each ticker as columns.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(time_period, str):
+        
+        if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+            
+            raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+        columns = ["Weight (%)", f"Target value ({base_currency})", "Target amount"]
+        if len(portfolio.assets) == 0:
+            
+            return pd.DataFrame(columns=columns, dtype=np.float64)
+        correlation, volatilities = _daily_returns_statistics(tickers=list(dict.fromkeys(asset.ticker for asset in portfolio.assets)), time_period=time_period)
+        weights = hrp_weights(correlation=correlation, volatilities=volatilities, linkage_method=linkage_method)
+        currencies_by_ticker = {asset.ticker: asset.currency for asset in portfolio.assets}
+        price_store = get_price_store()
+        last_prices = price_store.convert_to_base_currency(price_matrix=price_store.price_matrix(tickers=list(weights.index), time_period="5d"), currencies=[currencies_by_ticker[ticker] for ticker in weights.index], base_currency=base_currency).ffill()
+        last_prices = last_prices.to_numpy(dtype=np.float64)[-1]
+        if value is None:
+            
+            amounts_by_ticker = pd.Series([asset.amount for asset in portfolio.assets], index=[asset.ticker for asset in portfolio.assets]).groupby(level=0).sum()
+            value = float(np.nansum(amounts_by_ticker.reindex(weights.index).to_numpy()*last_prices))
+        target_values = weights.to_numpy()*value
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            target_amounts = np.where(last_prices > 0, target_values/last_prices, np.nan)
+        allocation = pd.DataFrame(data={columns[0]: weights.to_numpy()*100, columns[1]: target_values, columns[2]: target_amounts}, index=weights.index)
+        return allocation.round(4)
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio and a str.")
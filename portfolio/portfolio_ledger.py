@@ -0,0 +1,286 @@
+import bisect
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pandas import DataFrame, Series
+from typing import Dict, List, NamedTuple, Optional, Union
+
+
+class Transaction(NamedTuple):
+    """Transaction class
+
+    A buy or a sell of quantity shares at price, a split of ratio new shares
+    per old share (2.0 for a 2-for-1 split) or a dividend of price per share.
+    """
+
+    date: datetime
+    ticker: str
+    transaction_type: str
+    quantity: float = 0.0
+    price: float = 0.0
+    ratio: float = 1.0
+
+
+class TransactionLedger:
+    """Transaction ledger class
+
+    Keeps the transactions of a portfolio sorted by date and derives the
+    holdings as of any date from them. Every snapshot_interval transactions
+    the holdings are stored as a snapshot, so the holdings as of a date cost a
+    binary search on the date index, a snapshot load and the replay of less
+    than snapshot_interval transactions. A transaction recorded before the
+    last snapshot only invalidates the snapshots that follow it.
+    """
+
+    VALIDS_TRANSACTION_TYPES = ["buy", "sell", "split", "dividend"]
+
+    def __init__(self, snapshot_interval: int = 256) -> None:
+        """
+        Args:
+            snapshot_interval (int, optional): The number of transactions between two snapshots. Defaults to 256.
+
+        Raises:
+            TypeError: If snapshot_interval is not an int.
+            ValueError: If snapshot_interval is not positive.
+        """
+        if isinstance(snapshot_interval, int):
+            
+            if snapshot_interval <= 0:
+                
+                raise ValueError("The snapshot_interval must be positive.")
+            self.snapshot_interval = snapshot_interval
+        else:
+            
+            raise TypeError("Invalid type! The snapshot_interval must be an int.")
+        self.transactions: List[Transaction] = []
+        self._dates: List[pd.Timestamp] = []
+        self._tickers_codes: Dict[str, int] = {}
+        self._snapshots: List[np.ndarray] = [np.zeros(0)]
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    @property
+    def tickers(self) -> List[str]:
+        """The tickers of the ledger, in the order of the columns of the holdings matrix."""
+        return list(self._tickers_codes.keys())
+
+    def record(self, transaction: Transaction) -> None:
+        """Records a transaction. Transactions of the same date keep the order in which they were recorded.
+
+        Args:
+            transaction (Transaction): The transaction.
+
+        Raises:
+            ValueError: If the transaction type is not valid, the quantity is negative or the split ratio is not positive.
+            TypeError: If the input is not a Transaction.
+        """
+        if isinstance(transaction, Transaction):
+            
+            if transaction.transaction_type not in TransactionLedger.VALIDS_TRANSACTION_TYPES:
+                
+                raise ValueError(f"Invalid transaction type! The valids transaction types are {TransactionLedger.VALIDS_TRANSACTION_TYPES}.")
+            if transaction.quantity < 0 or transaction.price < 0:
+                
+                raise ValueError("The quantity and the price of a transaction must not be negative.")
+            if transaction.transaction_type == "split" and transaction.ratio <= 0:
+                
+                raise ValueError("The ratio of a split must be positive.")
+            date = pd.Timestamp(transaction.date)
+            position = bisect.bisect_right(self._dates, date)
+            self._dates.insert(position, date)
+            self.transactions.insert(position, transaction._replace(date=date))
+            if transaction.ticker not in self._tickers_codes:
+                
+                self._tickers_codes[transaction.ticker] = len(self._tickers_codes)
+            del self._snapshots[position//self.snapshot_interval + 1:]
+        else:
+            
+            raise TypeError("Invalid type! The input must be a Transaction.")
+
+    def remove_ticker(self, ticker: str) -> None:
+        """Removes every transaction of a ticker.
+
+        Args:
+            ticker (str): The ticker.
+        """
+        if ticker in self._tickers_codes:
+            
+            kept_positions = [position for position, transaction in enumerate(self.transactions) if transaction.ticker != ticker]
+            self.transactions = [self.transactions[position] for position in kept_positions]
+            self._dates = [self._dates[position] for position in kept_positions]
+            self._tickers_codes = {kept_ticker: code for code, kept_ticker in enumerate(kept_ticker for kept_ticker in self._tickers_codes if kept_ticker != ticker)}
+            self._snapshots = [np.zeros(0)]
+
+    def _apply(self, holdings: np.ndarray, transaction: Transaction) -> None:
+        """Applies a transaction to a holdings vector in place.
+
+        Args:
+            holdings (np.ndarray): The shares held of each ticker.
+            transaction (Transaction): The transaction.
+        """
+        code = self._tickers_codes[transaction.ticker]
+        if transaction.transaction_type == "buy":
+            
+            holdings[code] += transaction.quantity
+        elif transaction.transaction_type == "sell":
+            
+            holdings[code] -= transaction.quantity
+        elif transaction.transaction_type == "split":
+            
+            holdings[code] *= transaction.ratio
+
+    def _state_at(self, position: int) -> np.ndarray:
+        """Derives the holdings after the first transactions from the closest snapshot.
+
+        Args:
+            position (int): The number of transactions applied.
+
+        Returns:
+            np.ndarray: The shares held of each ticker.
+        """
+        snapshot_index = position//self.snapshot_interval
+        while len(self._snapshots) <= snapshot_index:
+            
+            holdings = self._load_snapshot(snapshot_index=len(self._snapshots) - 1)
+            start = (len(self._snapshots) - 1)*self.snapshot_interval
+            for transaction in self.transactions[start:start + self.snapshot_interval]:
+                
+                self._apply(holdings=holdings, transaction=transaction)
+            self._snapshots.append(holdings)
+        holdings = self._load_snapshot(snapshot_index=snapshot_index)
+        for transaction in self.transactions[snapshot_index*self.snapshot_interval:position]:
+            
+            self._apply(holdings=holdings, transaction=transaction)
+        return holdings
+
+    def _load_snapshot(self, snapshot_index: int) -> np.ndarray:
+        """Copies a snapshot, with zeros for the tickers recorded after it.
+
+        Args:
+            snapshot_index (int): The index of the snapshot.
+
+        Returns:
+            np.ndarray: The shares held of each ticker.
+        """
+        snapshot = self._snapshots[snapshot_index]
+        holdings = np.zeros(len(self._tickers_codes))
+        holdings[:len(snapshot)] = snapshot
+        return holdings
+
+    def holdings_as_of(self, date: Optional[Union[datetime, str]] = None) -> Dict[str, float]:
+        """Derives the holdings at the end of a date.
+
+        Args:
+            date (Optional[Union[datetime, str]], optional): The date. Defaults to None (after every transaction).
+
+        Returns:
+            Dict[str, float]: The shares held of each ticker, without the tickers no longer held.
+        """
+        position = len(self._dates) if date is None else bisect.bisect_right(self._dates, pd.Timestamp(date))
+        holdings = self._state_at(position=position)
+        return {ticker: float(holdings[code]) for ticker, code in self._tickers_codes.items() if holdings[code] != 0}
+
+    def _event_matrices(self) -> tuple:
+        """Builds the cumulative matrices of the transactions, with transactions as rows and tickers as columns.
+
+        The shares are counted in units of the shares before the first split, so
+        the buys and the sells add up with a single cumulative sum and the
+        splits with a cumulative sum of their logarithms.
+
+        Returns:
+            tuple: The transaction dates, the cumulative units, the cumulative log split factors and the raw shares held.
+        """
+        num_transactions, num_tickers = len(self.transactions), len(self._tickers_codes)
+        codes = np.array([self._tickers_codes[transaction.ticker] for transaction in self.transactions], dtype=np.int64)
+        types = np.array([transaction.transaction_type for transaction in self.transactions])
+        quantities = np.array([transaction.quantity for transaction in self.transactions], dtype=np.float64)
+        ratios = np.array([transaction.ratio for transaction in self.transactions], dtype=np.float64)
+        rows = np.arange(num_transactions)
+        log_splits = np.zeros((num_transactions, num_tickers))
+        log_splits[rows, codes] = np.where(types == "split", np.log(ratios), 0.0)
+        cumulative_log_splits = np.cumsum(log_splits, axis=0)
+        units = np.zeros((num_transactions, num_tickers))
+        units[rows, codes] = np.select([types == "buy", types == "sell"], [quantities, -quantities], 0.0)/np.exp(cumulative_log_splits[rows, codes])
+        cumulative_units = np.cumsum(units, axis=0)
+        shares = cumulative_units*np.exp(cumulative_log_splits)
+        dates = np.array(self._dates, dtype="datetime64[ns]")
+        return dates, cumulative_units, cumulative_log_splits, shares
+
+    def holdings_matrix(self, dates: Union[pd.DatetimeIndex, List[datetime]], split_adjusted: bool = False) -> DataFrame:
+        """Builds the holdings at the end of many dates in one vectorized pass.
+
+        Args:
+            dates (Union[pd.DatetimeIndex, List[datetime]]): The sorted dates.
+            split_adjusted (bool, optional): If the shares must be counted in units of the last split, to match
+            split-adjusted prices. Defaults to False (shares held on each date).
+
+        Returns:
+            DataFrame: A table with dates as rows and tickers as columns.
+        """
+        dates = pd.DatetimeIndex(dates)
+        if len(self.transactions) == 0:
+            
+            return pd.DataFrame(index=dates, columns=self.tickers, dtype=np.float64)
+        event_dates, cumulative_units, cumulative_log_splits, shares = self._event_matrices()
+        positions = np.searchsorted(event_dates, dates.to_numpy(dtype="datetime64[ns]"), side="right") - 1
+        if split_adjusted:
+            
+            holdings = cumulative_units[positions]*np.exp(cumulative_log_splits[-1])
+        else:
+            
+            holdings = shares[positions]
+        holdings[positions < 0] = 0.0
+        return pd.DataFrame(data=holdings, index=dates, columns=self.tickers)
+
+    def dividends_matrix(self, dates: Union[pd.DatetimeIndex, List[datetime]]) -> DataFrame:
+        """Builds the dividends received on many dates. A dividend paid between two dates is counted on the later one.
+
+        Args:
+            dates (Union[pd.DatetimeIndex, List[datetime]]): The sorted dates.
+
+        Returns:
+            DataFrame: A table with the cash received, with dates as rows and tickers as columns.
+        """
+        dates = pd.DatetimeIndex(dates)
+        dividends = np.zeros((len(dates), len(self._tickers_codes)))
+        rows = np.array([position for position, transaction in enumerate(self.transactions) if transaction.transaction_type == "dividend"], dtype=np.int64)
+        if len(rows) != 0:
+            
+            event_dates, _, _, shares = self._event_matrices()
+            codes = np.array([self._tickers_codes[self.transactions[row].ticker] for row in rows], dtype=np.int64)
+            amounts = np.array([self.transactions[row].price for row in rows], dtype=np.float64)
+            buckets = np.searchsorted(dates.to_numpy(dtype="datetime64[ns]"), event_dates[rows], side="left")
+            inside = buckets < len(dates)
+            np.add.at(dividends, (buckets[inside], codes[inside]), (shares[rows, codes]*amounts)[inside])
+        return pd.DataFrame(data=dividends, index=dates, columns=self.tickers)
+
+
+def time_weighted_returns(holdings: DataFrame, prices: DataFrame, dividends: Optional[DataFrame] = None) -> Series:
+    """Calculates the cumulative time-weighted return of a portfolio whose holdings change over time.
+
+    Each day is valued with the holdings of the end of the previous day, so
+    the buys and the sells do not count as returns, and the daily returns are
+    chained. The holdings must be in the units of the prices (split-adjusted
+    holdings with split-adjusted prices).
+
+    Args:
+        holdings (DataFrame): The holdings with dates as rows and tickers as columns.
+        prices (DataFrame): The prices on the same dates and tickers.
+        dividends (Optional[DataFrame], optional): The dividends received on the same dates and tickers. Defaults to None.
+
+    Returns:
+        Series: The cumulative return (%) on each date.
+    """
+    holdings_array = holdings.to_numpy()
+    prices_array = np.nan_to_num(prices.ffill().to_numpy())
+    start_values = np.sum(holdings_array[:-1]*prices_array[:-1], axis=1)
+    end_values = np.sum(holdings_array[:-1]*prices_array[1:], axis=1)
+    if dividends is not None:
+        
+        end_values = end_values + dividends.to_numpy()[1:].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        
+        daily_returns = np.where(start_values > 0, end_values/start_values - 1, 0.0)
+    cumulative_returns = np.concatenate([[0.0], np.cumprod(1 + daily_returns) - 1])*100
+    return pd.Series(data=cumulative_returns, index=holdings.index, name="Time-weighted return (%)")
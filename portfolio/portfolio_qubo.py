@@ -0,0 +1,118 @@
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+from tools.instrumentation import timed
+from tools.lazy_imports import LazyModule
+from typing import NamedTuple, Optional, Union
+
+sparse = LazyModule("scipy.sparse")
+
+
+class Qubo(NamedTuple):
+    """Qubo class
+
+    The penalized QUBO of a portfolio optimization: the energy of a binary
+    selection x is offset + linear @ x + x @ quadratic @ x, with quadratic
+    upper triangular, as in the objective built by QuadraticProgramToQubo.
+    """
+
+    quadratic: Union[np.ndarray, "sparse.csr_matrix"]
+    linear: np.ndarray
+    offset: float
+    penalty: float
+
+
+def qubo_penalty(mu: np.ndarray, sigma: np.ndarray, risk_factor: float) -> float:
+    """Calculates the default penalty of the budget constraint.
+
+    It is the penalty chosen by the LinearEqualityToPenalty converter of
+    qiskit_optimization for an integer constraint: one plus the range of the
+    linear and of the quadratic terms of the objective over binary variables,
+    so no infeasible selection can have a lower energy than a feasible one.
+
+    Args:
+        mu (np.ndarray): The expected returns.
+        sigma (np.ndarray): The covariance matrix.
+        risk_factor (float): The risk factor.
+
+    Returns:
+        float: The penalty.
+    """
+    risk = risk_factor*np.asarray(sigma, dtype=np.float64)
+    upper_terms = np.triu(risk + risk.T, k=1)
+    return float(1.0 + np.abs(mu).sum() + np.abs(np.diag(risk)).sum() + np.abs(upper_terms).sum())
+
+def portfolio_qubo(mu: np.ndarray, sigma: np.ndarray, risk_factor: float, budget: int, penalty: Optional[float] = None, sparse_format: bool = False) -> Qubo:
+    """Builds the penalized QUBO of the portfolio optimization directly from the returns statistics.
+
+    The problem is to minimize risk_factor * x @ sigma @ x - mu @ x over the
+    binary selections with budget assets. The budget constraint is added to
+    the objective as penalty * (sum(x) - budget)^2, whose expansion adds the
+    penalty to every quadratic term, -2 * penalty * budget to every linear term
+    and penalty * budget^2 to the offset. The terms are the ones produced by
+    PortfolioOptimization.to_quadratic_program and QuadraticProgramToQubo, but
+    without building the QuadraticProgram objects term by term.
+
+    Args:
+        mu (np.ndarray): The expected returns.
+        sigma (np.ndarray): The covariance matrix.
+        risk_factor (float): The risk factor.
+        budget (int): The number of assets to select.
+        penalty (Optional[float], optional): The penalty of the budget constraint. Defaults to None (qubo_penalty).
+        sparse_format (bool, optional): If the quadratic terms must be a CSR matrix. Defaults to False (dense array).
+
+    Raises:
+        ValueError: If mu and sigma have different sizes.
+
+    Returns:
+        Qubo: The quadratic terms, the linear terms, the offset and the penalty.
+    """
+    mu = np.asarray(mu, dtype=np.float64).ravel()
+    sigma = np.atleast_2d(np.asarray(sigma, dtype=np.float64))
+    if sigma.shape != (len(mu), len(mu)):
+        
+        raise ValueError("The covariance matrix must be a square matrix with the size of the expected returns.")
+    if penalty is None:
+        
+        penalty = qubo_penalty(mu=mu, sigma=sigma, risk_factor=risk_factor)
+    with timed("matrix.qubo"):
+        
+        risk = risk_factor*sigma
+        quadratic = np.triu(risk + risk.T + 2*penalty, k=1)
+        quadratic[np.diag_indices_from(quadratic)] = np.diag(risk) + penalty
+        linear = -mu - 2*penalty*budget
+        offset = float(penalty*budget**2)
+        if sparse_format:
+            
+            quadratic = sparse.csr_matrix(quadratic)
+    return Qubo(quadratic=quadratic, linear=linear, offset=offset, penalty=float(penalty))
+
+def all_selections(num_assets: int) -> np.ndarray:
+    """Lists every binary selection of the assets, in the order of the basis states of the eigenvectors.
+
+    Args:
+        num_assets (int): The number of assets.
+
+    Returns:
+        np.ndarray: The 2^num_assets selections as rows. The asset j is selected in the row i if the bit j of i is set.
+    """
+    return (np.arange(2**num_assets)[:, None] >> np.arange(num_assets)[None, :]) & 1
+
+def evaluate_qubo(qubo: Qubo, selections: np.ndarray) -> np.ndarray:
+    """Calculates the energy of many selections at once.
+
+    Args:
+        qubo (Qubo): The QUBO.
+        selections (np.ndarray): The binary selections as rows, or a single selection.
+
+    Returns:
+        np.ndarray: The energy of each selection.
+    """
+    selections = np.atleast_2d(np.asarray(selections, dtype=np.float64))
+    with timed("matrix.qubo_evaluation"):
+        
+        quadratic_terms = np.asarray(qubo.quadratic.T @ selections.T).T
+        energies = qubo.offset + selections @ qubo.linear + np.einsum("ij,ij->i", quadratic_terms, selections)
+    return energies
@@ -0,0 +1,487 @@
+import sys
+
+sys.path.append("../")
+
+import asyncio
+import json
+import numpy as np
+from asset import Asset
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from http import HTTPStatus
+from market_data import PriceStore, set_price_store
+from portfolio import Portfolio
+from tools.instrumentation import export_metrics, increment, timed
+from typing import Any, Callable, Dict, Optional, Tuple
+from .portfolio_heuristics import VALIDS_HEURISTIC_METHODS, solve_qubo
+from .portfolio_qubo import portfolio_qubo
+from .portfolio_tools import _eigensolver_result, _mean_covariance, _portfolio_valuation, show_portfolio_returns_for_all_time_periods
+
+
+VALIDS_OPTIMIZATION_METHODS = ["numpy", "vqe", "qaoa"] + VALIDS_HEURISTIC_METHODS
+
+
+def _portfolio_from_payload(payload: dict) -> Portfolio:
+    """Creates a portfolio from the JSON body of a request.
+
+    Args:
+        payload (dict): The body. For instance: {"portfolio": [{"name": "Apple", "ticker": "AAPL",
+        "category": "stocks", "amount": 10, "currency": "USD"}]}
+
+    Raises:
+        ValueError: If the portfolio is missing or empty, or a position is not an object.
+
+    Returns:
+        Portfolio: The portfolio. The positions without a currency get the one inferred from the ticker.
+    """
+    positions = payload.get("portfolio")
+    if not isinstance(positions, list) or len(positions) == 0:
+        
+        raise ValueError("The body must have a non-empty portfolio list.")
+    if not all(isinstance(position, dict) for position in positions):
+        
+        raise ValueError("Every position of the portfolio must be a JSON object.")
+    assets = [Asset(name=position.get("name", position["ticker"]), ticker=position["ticker"], category=position.get("category", "stocks"), amount=float(position["amount"]), currency=position.get("currency")) for position in positions]
+    return Portfolio(assets=assets)
+
+def _request_key(path: str, portfolio: Portfolio, payload: dict) -> str:
+    """Builds the key of a computation from the normalized portfolio and the parameters of the request.
+
+    Two bodies that only differ on the asset names, on the categories or on an
+    explicit currency equal to the inferred one share the same key.
+
+    Args:
+        path (str): The path of the request.
+        portfolio (Portfolio): The portfolio of the request.
+        payload (dict): The body of the request.
+
+    Returns:
+        str: The key.
+    """
+    positions = [[asset.ticker, asset.amount, asset.currency] for asset in portfolio.assets]
+    parameters = {name: value for name, value in payload.items() if name != "portfolio"}
+    return path + json.dumps([positions, parameters], sort_keys=True)
+
+def _to_json_number(value: float) -> Optional[float]:
+    """Converts a number to a JSON number, NaN and infinities becoming null.
+
+    Args:
+        value (float): The number.
+
+    Returns:
+        Optional[float]: The number or None.
+    """
+    return float(value) if np.isfinite(value) else None
+
+def _valuation_job(portfolio: Portfolio, base_currency: str) -> dict:
+    """Calculates the current valuation of a portfolio.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        base_currency (str): The currency of the valuation.
+
+    Returns:
+        dict: The response body.
+    """
+    return {"base_currency": base_currency, "valuation": _to_json_number(_portfolio_valuation(portfolio=portfolio, base_currency=base_currency))}
+
+def _returns_job(portfolio: Portfolio) -> dict:
+    """Calculates the returns of a portfolio for all time periods.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+
+    Returns:
+        dict: The response body.
+    """
+    show_portfolio_returns_for_all_time_periods(portfolio=portfolio)
+    return {"returns": {time_period: _to_json_number(value) for time_period, value in portfolio.portfolio_return_dict.items()}}
+
+def _correlation_job(portfolio: Portfolio, time_period: str) -> dict:
+    """Calculates the correlation between the assets of a portfolio.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str): The time period of the prices.
+
+    Returns:
+        dict: The response body.
+    """
+    correlation = portfolio.correlation_between_assets(time_period=time_period)
+    matrix = [[_to_json_number(value) for value in row] for row in correlation.to_numpy()]
+    return {"tickers": list(correlation.columns), "matrix": matrix}
+
+def _optimization_job(mu: np.ndarray, sigma: np.ndarray, method: str, risk_factor: float, budget: int, maxiter: Optional[int]) -> dict:
+    """Solves the portfolio optimization of returns statistics in a solver process.
+
+    Args:
+        mu (np.ndarray): The mean vector of the returns.
+        sigma (np.ndarray): The covariance matrix of the returns.
+        method (str): The solver (numpy, vqe, qaoa, annealing or tabu).
+        risk_factor (float): The risk factor.
+        budget (int): The number of assets to select.
+        maxiter (Optional[int]): The number of max iterations of the variational solvers or of the heuristics.
+
+    Returns:
+        dict: The selection and its value.
+    """
+    if method in VALIDS_HEURISTIC_METHODS:
+        
+        # The solver pool already spreads the requests over the cores, so the restarts run in this process.
+        qubo = portfolio_qubo(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget)
+        result = solve_qubo(qubo=qubo, budget=budget, method=method, maxiter=maxiter, workers=1)
+    else:
+        
+        result = _eigensolver_result(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget, method=method, maxiter=maxiter)
+    return {"selection": [int(value) for value in result.x], "value": _to_json_number(result.fval)}
+
+
+class AnalyticsService:
+    """Analytics HTTP service class
+
+    Serves the valuation, the returns, the correlation and the optimization of
+    portfolios as JSON over HTTP with asyncio. Identical requests that arrive
+    while the first one is running share its result. The analytics run one at
+    a time in a data thread (the shared price store is not thread-safe), the
+    solvers run in a process pool, at most max_concurrency computations run
+    at once and above max_pending distinct computations the service answers
+    503 instead of queueing more work.
+
+    Endpoints:
+        GET /health, GET /metrics (Prometheus text format),
+        POST /valuation {"portfolio": [...], "base_currency": "USD"},
+        POST /returns {"portfolio": [...]},
+        POST /correlation {"portfolio": [...], "time_period": "1y"},
+        POST /optimization {"portfolio": [...], "start_date": "2020-01-01", "end_date": "2021-01-01",
+        "risk_factor": 0.5, "budget": 2, "method": "numpy", "maxiter": 100}
+    """
+
+    def __init__(self, price_store: Optional[PriceStore] = None, host: str = "127.0.0.1", port: int = 8080, max_concurrency: int = 4, max_pending: int = 64, solver_workers: Optional[int] = None, max_body_bytes: int = 1_000_000) -> None:
+        """
+        Args:
+            price_store (Optional[PriceStore], optional): The price store of the service. Defaults to None (shared price store).
+            host (str, optional): The host. Defaults to "127.0.0.1".
+            port (int, optional): The port, 0 to pick a free one. Defaults to 8080.
+            max_concurrency (int, optional): The number of computations running at once. Defaults to 4.
+            max_pending (int, optional): The number of distinct computations admitted at once. Defaults to 64.
+            solver_workers (Optional[int], optional): The number of solver processes. Defaults to None (number of CPUs).
+            max_body_bytes (int, optional): The maximum size of a request body. Defaults to 1_000_000.
+
+        Raises:
+            TypeError: If the inputs are not a PriceStore, a str and ints.
+            ValueError: If the limits are not positive.
+        """
+        if (isinstance(price_store, PriceStore) or price_store is None) and isinstance(host, str) and isinstance(port, int) and isinstance(max_concurrency, int) and isinstance(max_pending, int):
+            
+            if max_concurrency <= 0 or max_pending <= 0:
+                
+                raise ValueError("The max_concurrency and the max_pending must be positive.")
+            if price_store is not None:
+                
+                set_price_store(price_store=price_store)
+            self.host = host
+            self.port = port
+            self.max_concurrency = max_concurrency
+            self.max_pending = max_pending
+            self.solver_workers = solver_workers
+            self.max_body_bytes = max_body_bytes
+            self._routes: Dict[Tuple[str, str], Callable[[dict, Portfolio], Any]] = {
+                ("POST", "/valuation"): self._valuation,
+                ("POST", "/returns"): self._returns,
+                ("POST", "/correlation"): self._correlation,
+                ("POST", "/optimization"): self._optimization,
+            }
+            self._in_flight: Dict[str, asyncio.Future] = {}
+            self._semaphore: Optional[asyncio.Semaphore] = None
+            self._data_executor: Optional[ThreadPoolExecutor] = None
+            self._solver_executor: Optional[ProcessPoolExecutor] = None
+            self._server: Optional[asyncio.AbstractServer] = None
+        else:
+            
+            raise TypeError("Invalid types! This class expects a PriceStore, a str and ints.")
+
+    async def handle(self, method: str, path: str, body: bytes = b"") -> Tuple[int, Any]:
+        """Answers a request without a socket. For instance: await service.handle("POST", "/returns", body)
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path.
+            body (bytes, optional): The JSON body. Defaults to b"".
+
+        Returns:
+            Tuple[int, Any]: The status code and the response body (a dict, or a str for /metrics).
+        """
+        increment("service.requests")
+        if path == "/health" and method == "GET":
+            
+            return 200, {"status": "ok", "in_flight": len(self._in_flight)}
+        if path == "/metrics" and method == "GET":
+            
+            return 200, export_metrics(export_format="prometheus")
+        route = self._routes.get((method, path))
+        if route is None:
+            
+            if any(route_path == path for _, route_path in self._routes):
+                
+                return 405, {"error": f"The method {method} is not allowed."}
+            return 404, {"error": f"The path {path} was not found."}
+        try:
+            
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                
+                raise ValueError("The body must be a JSON object.")
+            portfolio = _portfolio_from_payload(payload=payload)
+            key = _request_key(path=path, portfolio=portfolio, payload=payload)
+            if key not in self._in_flight and len(self._in_flight) >= self.max_pending:
+                
+                increment("service.rejected")
+                return 503, {"error": "Too many pending requests, try again later."}
+            return 200, await self._coalesced(key=key, factory=partial(route, payload, portfolio))
+        except (ValueError, TypeError, KeyError) as error:
+            
+            return 400, {"error": str(error)}
+        except ImportError as error:
+            
+            return 501, {"error": f"Missing dependency: {error}"}
+        except Exception as error:
+            
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+    async def _coalesced(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Runs a computation, or waits for the identical computation already running.
+
+        Args:
+            key (str): The path, the normalized portfolio and the parameters of the request.
+            factory (Callable[[], Any]): Creates the coroutine of the computation.
+
+        Returns:
+            Any: The response body.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            
+            task = asyncio.ensure_future(self._limited(factory=factory))
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._forget, key))
+        else:
+            
+            increment("service.coalesced")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        """Removes a finished computation from the in-flight computations.
+
+        Args:
+            key (str): The key of the computation.
+            task (asyncio.Future): The finished computation.
+        """
+        if self._in_flight.get(key) is task:
+            
+            del self._in_flight[key]
+
+    async def _limited(self, factory: Callable[[], Any]) -> Any:
+        """Runs a computation once one of the max_concurrency slots is free.
+
+        Args:
+            factory (Callable[[], Any]): Creates the coroutine of the computation.
+
+        Returns:
+            Any: The response body.
+        """
+        if self._semaphore is None:
+            
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            
+            with timed("service.computation"):
+                
+                return await factory()
+
+    async def _in_data_thread(self, function: Callable[..., Any], **kwargs) -> Any:
+        """Runs an analytics function in the data thread.
+
+        Args:
+            function (Callable[..., Any]): The function.
+            **kwargs: The arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        if self._data_executor is None:
+            
+            self._data_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics-data")
+        return await asyncio.get_running_loop().run_in_executor(self._data_executor, partial(function, **kwargs))
+
+    async def _valuation(self, payload: dict, portfolio: Portfolio) -> dict:
+        """Answers POST /valuation.
+
+        Args:
+            payload (dict): The body of the request.
+            portfolio (Portfolio): The portfolio of the request.
+
+        Returns:
+            dict: The response body.
+        """
+        base_currency = payload.get("base_currency", "USD")
+        if not isinstance(base_currency, str):
+            
+            raise TypeError("The base_currency must be a str.")
+        return await self._in_data_thread(_valuation_job, portfolio=portfolio, base_currency=base_currency)
+
+    async def _returns(self, payload: dict, portfolio: Portfolio) -> dict:
+        """Answers POST /returns.
+
+        Args:
+            payload (dict): The body of the request.
+            portfolio (Portfolio): The portfolio of the request.
+
+        Returns:
+            dict: The response body.
+        """
+        return await self._in_data_thread(_returns_job, portfolio=portfolio)
+
+    async def _correlation(self, payload: dict, portfolio: Portfolio) -> dict:
+        """Answers POST /correlation.
+
+        Args:
+            payload (dict): The body of the request.
+            portfolio (Portfolio): The portfolio of the request.
+
+        Returns:
+            dict: The response body.
+        """
+        time_period = payload.get("time_period", "1y")
+        if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+            
+            raise ValueError(f"Invalid time period! The valids time periods are {Portfolio.VALIDS_TIME_PERIODS}.")
+        return await self._in_data_thread(_correlation_job, portfolio=portfolio, time_period=time_period)
+
+    async def _optimization(self, payload: dict, portfolio: Portfolio) -> dict:
+        """Answers POST /optimization in the solver process pool.
+
+        Args:
+            payload (dict): The body of the request.
+            portfolio (Portfolio): The portfolio of the request.
+
+        Returns:
+            dict: The response body.
+        """
+        method = payload.get("method", "numpy")
+        if method not in VALIDS_OPTIMIZATION_METHODS:
+            
+            raise ValueError(f"Invalid method! The valids methods are {VALIDS_OPTIMIZATION_METHODS}.")
+        start_date = datetime.strptime(payload["start_date"], "%Y-%m-%d")
+        end_date = datetime.strptime(payload["end_date"], "%Y-%m-%d")
+        budget = int(payload.get("budget", max(1, len(portfolio.assets)//2)))
+        maxiter = payload.get("maxiter")
+        # The statistics come from the shared price store in the data thread, so the solver processes only receive arrays.
+        mu, sigma = await self._in_data_thread(_mean_covariance, input_portfolio=portfolio, start_date=start_date, end_date=end_date)
+        if self._solver_executor is None:
+            
+            self._solver_executor = ProcessPoolExecutor(max_workers=self.solver_workers)
+        job = partial(_optimization_job, mu=mu, sigma=sigma, method=method, risk_factor=float(payload.get("risk_factor", 0.5)), budget=budget, maxiter=None if maxiter is None else int(maxiter))
+        result = await asyncio.get_running_loop().run_in_executor(self._solver_executor, job)
+        return {"tickers": [asset.ticker for asset in portfolio.assets], **result}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads one HTTP/1.1 request from a connection, answers it and closes the connection.
+
+        Args:
+            reader (asyncio.StreamReader): The reader of the connection.
+            writer (asyncio.StreamWriter): The writer of the connection.
+        """
+        try:
+            
+            request_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+            method, target, _ = request_line.split(" ", 2)
+            content_length = 0
+            while True:
+                
+                header_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+                if header_line == "":
+                    
+                    break
+                name, _, value = header_line.partition(":")
+                if name.strip().lower() == "content-length":
+                    
+                    content_length = int(value.strip())
+            if content_length > self.max_body_bytes:
+                
+                status, payload = 413, {"error": "The body is too large."}
+            else:
+                
+                body = await reader.readexactly(content_length) if content_length > 0 else b""
+                status, payload = await self.handle(method=method, path=target.split("?", 1)[0], body=body)
+        except (ValueError, asyncio.IncompleteReadError):
+            
+            status, payload = 400, {"error": "Malformed HTTP request."}
+        if isinstance(payload, str):
+            
+            content_type, content = "text/plain; version=0.0.4", payload.encode()
+        else:
+            
+            content_type, content = "application/json", json.dumps(payload).encode()
+        headers = f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: {content_type}\r\nContent-Length: {len(content)}\r\nConnection: close\r\n"
+        if status == 503:
+            
+            headers += "Retry-After: 1\r\n"
+        writer.write(headers.encode("latin-1") + b"\r\n" + content)
+        try:
+            
+            await writer.drain()
+        finally:
+            
+            writer.close()
+
+    async def start(self) -> None:
+        """Starts listening. With port 0, the port picked by the system is stored in self.port."""
+        self._server = await asyncio.start_server(self._handle_connection, host=self.host, port=self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Starts listening, if needed, and serves until the task is cancelled."""
+        if self._server is None:
+            
+            await self.start()
+        try:
+            
+            await self._server.serve_forever()
+        finally:
+            
+            await self.close()
+
+    async def close(self) -> None:
+        """Stops listening and shuts the executors down."""
+        if self._server is not None:
+            
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for executor in (self._data_executor, self._solver_executor):
+            
+            if executor is not None:
+                
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._data_executor, self._solver_executor = None, None
+
+
+def run_service(price_store: Optional[PriceStore] = None, host: str = "127.0.0.1", port: int = 8080, max_concurrency: int = 4, max_pending: int = 64, solver_workers: Optional[int] = None) -> None:
+    """Runs the analytics HTTP service until it is interrupted.
+
+    Args:
+        price_store (Optional[PriceStore], optional): The price store of the service. Defaults to None (shared price store).
+        host (str, optional): The host. Defaults to "127.0.0.1".
+        port (int, optional): The port. Defaults to 8080.
+        max_concurrency (int, optional): The number of computations running at once. Defaults to 4.
+        max_pending (int, optional): The number of distinct computations admitted at once. Defaults to 64.
+        solver_workers (Optional[int], optional): The number of solver processes. Defaults to None (number of CPUs).
+    """
+    service = AnalyticsService(price_store=price_store, host=host, port=port, max_concurrency=max_concurrency, max_pending=max_pending, solver_workers=solver_workers)
+    try:
+        
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        
+        pass
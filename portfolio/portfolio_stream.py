@@ -0,0 +1,231 @@
+import sys
+
+sys.path.append("../")
+
+import asyncio
+import numpy as np
+import pandas as pd
+from market_data import get_price_store
+from market_data.streaming import Quote, QuoteFeed
+from pandas import DataFrame
+from portfolio import Portfolio
+from typing import Callable, Dict, Optional
+
+
+def _is_finite(value: Optional[float]) -> bool:
+    """Checks if a value is a finite number.
+
+    Args:
+        value (Optional[float]): The value.
+
+    Returns:
+        bool: True if the value is a finite number, else False.
+    """
+    return value is not None and bool(np.isfinite(value))
+
+
+class LivePortfolioValuation:
+    """Live portfolio valuation class
+
+    Keeps the valuation and the profit and loss of every position up to date
+    while quotes arrive. Each quote updates a single position, so the cost of
+    a tick does not depend on the size of the portfolio. The quotes are in the
+    quote currency of each asset and the valuation is in the base currency,
+    with the exchange rates fixed when the valuation starts.
+
+    The positions start from their last stored closes, and the quotes with a
+    price that is not a finite number are skipped. A position without a price
+    or without an exchange rate is left out of the valuation, and complete
+    tells if the valuation covers every position.
+    """
+
+    def __init__(self, portfolio: Portfolio, reference_prices: Optional[Dict[str, float]] = None, base_currency: str = "USD", fx_rates: Optional[Dict[str, float]] = None, last_prices: Optional[Dict[str, float]] = None) -> None:
+        """
+        Args:
+            portfolio (Portfolio): The portfolio that we want to follow.
+            reference_prices (Optional[Dict[str, float]], optional): The prices used to calculate the profit and loss
+            of each ticker. Defaults to None (the first price of each ticker, its last close or else its first quote).
+            base_currency (str, optional): The currency of the valuation. Defaults to "USD".
+            fx_rates (Optional[Dict[str, float]], optional): The value of one unit of each quote currency in the base currency.
+            Defaults to None (the last rates of the shared price store).
+            last_prices (Optional[Dict[str, float]], optional): The prices that the valuation starts from, in the quote
+            currency of each ticker. Defaults to None (the last closes of the shared price store).
+
+        Raises:
+            TypeError: If the inputs are not a Portfolio and a dict.
+        """
+        if isinstance(portfolio, Portfolio) and (isinstance(reference_prices, dict) or reference_prices is None):
+            
+            self.portfolio = portfolio
+            self.tickers = [asset.ticker for asset in portfolio.assets]
+            self._positions: Dict[str, list] = {}
+            for position, ticker in enumerate(self.tickers):
+                
+                self._positions.setdefault(ticker, []).append(position)
+            self.base_currency = base_currency
+            currencies_list = [asset.currency for asset in portfolio.assets]
+            if fx_rates is None and any(currency != base_currency for currency in currencies_list):
+                
+                last_rates = get_price_store().fx_matrix(currencies=currencies_list, base_currency=base_currency, time_period="5d").ffill().to_numpy()[-1]
+                fx_rates = dict(zip(currencies_list, last_rates))
+            fx_rates = {} if fx_rates is None else fx_rates
+            self.fx_rates = [1.0 if currency == base_currency else float(fx_rates.get(currency, np.nan)) for currency in currencies_list]
+            self.amounts = [asset.amount*fx_rate for asset, fx_rate in zip(portfolio.assets, self.fx_rates)]
+            if last_prices is None and len(self.tickers) != 0:
+                
+                close_prices = get_price_store().price_matrix(tickers=list(dict.fromkeys(self.tickers)), field="Close", time_period="5d").ffill()
+                last_prices = close_prices.iloc[-1].to_dict() if len(close_prices.index) != 0 else {}
+            last_prices = {} if last_prices is None else last_prices
+            self.last_prices = [None]*len(self.tickers)
+            self.reference_prices = [None]*len(self.tickers)
+            if reference_prices is not None:
+                
+                for position, ticker in enumerate(self.tickers):
+                    
+                    if _is_finite(reference_prices.get(ticker)):
+                        
+                        self.reference_prices[position] = reference_prices.get(ticker)
+            self.valuation = 0.0
+            self.pnl = 0.0
+            self._missing_positions = len(self.tickers)
+            for position, ticker in enumerate(self.tickers):
+                
+                self._apply_price(position=position, price=last_prices.get(ticker))
+            self.ticks_processed = 0
+            self.ticks_skipped = 0
+            self.last_timestamp: Optional[int] = None
+        else:
+            
+            raise TypeError("Invalid types! This class expects a Portfolio and a dict.")
+
+    def update(self, quote: Quote) -> None:
+        """Applies a quote to the valuation and to the profit and loss.
+
+        Args:
+            quote (Quote): The quote.
+        """
+        self.ticks_processed += 1
+        if not _is_finite(quote.price):
+            
+            self.ticks_skipped += 1
+            return
+        self.last_timestamp = quote.timestamp
+        for position in self._positions.get(quote.ticker, ()):
+            
+            self._apply_price(position=position, price=quote.price)
+
+    @property
+    def complete(self) -> bool:
+        """If every position has a price and an exchange rate, so the valuation is not a partial sum."""
+        return self._missing_positions == 0
+
+    def _apply_price(self, position: int, price: Optional[float]) -> None:
+        """Moves a position to a new price. Prices and amounts that are not finite numbers are skipped.
+
+        Args:
+            position (int): The position.
+            price (Optional[float]): The new price, in the quote currency of the position.
+        """
+        amount = self.amounts[position]
+        if not _is_finite(price) or not _is_finite(amount):
+            
+            return
+        last_price = self.last_prices[position]
+        if self.reference_prices[position] is None:
+            
+            self.reference_prices[position] = price
+        if last_price is None:
+            
+            self.valuation += amount*price
+            self.pnl += amount*(price - self.reference_prices[position])
+            self._missing_positions -= 1
+        else:
+            
+            self.valuation += amount*(price - last_price)
+            self.pnl += amount*(price - last_price)
+        self.last_prices[position] = price
+
+    async def run(self, feed: QuoteFeed, on_update: Optional[Callable[["LivePortfolioValuation", Quote], None]] = None, max_ticks: Optional[int] = None) -> int:
+        """Consumes a quote feed and keeps the valuation up to date.
+
+        Args:
+            feed (QuoteFeed): The quote feed.
+            on_update (Optional[Callable], optional): A function called after each quote. Defaults to None.
+            max_ticks (Optional[int], optional): The number of quotes after which the run stops. Defaults to None.
+
+        Raises:
+            TypeError: If the feed is not a QuoteFeed.
+
+        Returns:
+            int: The number of quotes consumed in this run.
+        """
+        if isinstance(feed, QuoteFeed):
+            
+            ticks = 0
+            async for quote in feed.stream():
+                
+                self.update(quote=quote)
+                ticks += 1
+                if on_update is not None:
+                    
+                    on_update(self, quote)
+                if max_ticks is not None and ticks >= max_ticks:
+                    
+                    break
+            return ticks
+        else:
+            
+            raise TypeError("Invalid type! The feed must be a QuoteFeed.")
+
+    def positions_pnl(self) -> DataFrame:
+        """Builds a table with the current price, value and profit and loss of each position.
+
+        Returns:
+            DataFrame: A table with the positions of the portfolio. The last price is in the quote currency
+            and the value and the profit and loss are in the base currency.
+        """
+        data = []
+        for position, asset in enumerate(self.portfolio.assets):
+            
+            last_price = self.last_prices[position]
+            reference_price = self.reference_prices[position]
+            if last_price is None:
+                
+                data.append([asset.name, asset.ticker, asset.amount, None, None, None])
+            else:
+                
+                amount = self.amounts[position]
+                data.append([asset.name, asset.ticker, asset.amount, last_price, amount*last_price, amount*(last_price - reference_price)])
+        columns_list = ["Asset", "Ticker", "Amount", "Last Price", f"Value ({self.base_currency})", f"P&L ({self.base_currency})"]
+        positions_pd = pd.DataFrame(data=data, columns=columns_list)
+        return positions_pd
+
+
+def run_live_valuation(portfolio: Portfolio, feed: QuoteFeed, reference_prices: Optional[Dict[str, float]] = None, max_ticks: Optional[int] = None, base_currency: str = "USD") -> LivePortfolioValuation:
+    """Runs a live valuation of the portfolio until the feed ends. It blocks, so it is meant for scripts.
+
+    Inside a running event loop (a Jupyter notebook, for instance) use
+    await LivePortfolioValuation(portfolio).run(feed) instead.
+
+    Args:
+        portfolio (Portfolio): The portfolio that we want to follow.
+        feed (QuoteFeed): The quote feed.
+        reference_prices (Optional[Dict[str, float]], optional): The prices used to calculate the profit and loss. Defaults to None.
+        max_ticks (Optional[int], optional): The number of quotes after which the run stops. Defaults to None.
+        base_currency (str, optional): The currency of the valuation. Defaults to "USD".
+
+    Raises:
+        RuntimeError: If it is called from a running event loop.
+
+    Returns:
+        LivePortfolioValuation: The valuation after the last quote.
+    """
+    try:
+        
+        asyncio.get_running_loop()
+    except RuntimeError:
+        
+        live_valuation = LivePortfolioValuation(portfolio=portfolio, reference_prices=reference_prices, base_currency=base_currency)
+        asyncio.run(live_valuation.run(feed=feed, max_ticks=max_ticks))
+        return live_valuation
+    raise RuntimeError("run_live_valuation cannot run inside an event loop (a Jupyter notebook, for instance). Use await LivePortfolioValuation(portfolio).run(feed) instead.")
@@ -4,22 +4,31 @@ sys.path.append("../")
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+from functools import partial
 from pandas import DataFrame
-from typing import Optional
+from typing import Optional, Tuple, TYPE_CHECKING
 from portfolio import Portfolio
-from datetime import date, datetime, timedelta
-from qiskit import Aer
-from qiskit.algorithms import VQE, QAOA, NumPyMinimumEigensolver
-from qiskit.algorithms.optimizers import Optimizer, OptimizerResult
-from qiskit.algorithms.optimizers import COBYLA
-from qiskit.circuit.library import TwoLocal
-from qiskit.utils import QuantumInstance
-from qiskit_finance.applications.optimization import PortfolioOptimization
-from qiskit_finance.data_providers import YahooDataProvider
-from qiskit_optimization.algorithms import MinimumEigenOptimizer
-from qiskit_optimization.converters import QuadraticProgramToQubo
-from qiskit_optimization.problems import QuadraticProgram
+from datetime import datetime
+from market_data import get_memo_cache, get_price_store, memo_key, period_boundary_prices, returns_for_all_time_periods
+from tools.instrumentation import increment, timed
+from tools.lazy_imports import LazyModule
+from .portfolio_factor_model import fit_factor_covariance
+from .portfolio_heuristics import HeuristicResult, solve_qubo
+from .portfolio_qubo import Qubo, all_selections, evaluate_qubo, portfolio_qubo
+
+if TYPE_CHECKING:
+    
+    from qiskit.algorithms.optimizers import Optimizer, OptimizerResult
+    from qiskit_optimization.algorithms import MinimumEigenOptimizationResult
+    from qiskit_optimization.problems import QuadraticProgram
+
+qiskit = LazyModule("qiskit")
+qiskit_algorithms = LazyModule("qiskit.algorithms")
+qiskit_optimizers = LazyModule("qiskit.algorithms.optimizers")
+qiskit_circuit_library = LazyModule("qiskit.circuit.library")
+qiskit_utils = LazyModule("qiskit.utils")
+finance_applications = LazyModule("qiskit_finance.applications.optimization")
+optimization_algorithms = LazyModule("qiskit_optimization.algorithms")
 
 
 def _calculate_returns_for_all_time_periods(portfolio: Portfolio) -> None:
@@ -32,95 +41,67 @@ def _calculate_returns_for_all_time_periods(portfolio: Portfolio) -> None:
         None
     """
     tickers_list = [asset.ticker for asset in portfolio.assets]
-    assets_amounts_dict = {asset.ticker: asset.amount for asset in portfolio.assets}
-    for time_period in Portfolio.VALIDS_TIME_PERIODS:
+    assets_amounts = np.array([asset.amount for asset in portfolio.assets])
+    price_matrix = get_price_store().price_matrix(tickers=tickers_list, time_period="max")
+    first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=Portfolio.VALIDS_TIME_PERIODS)
+    with timed("analytics.portfolio_returns"):
         
-        portfolio_return = 0
-        first_portfolio_valuation = 0
-        last_portfolio_valuation = 0
-        if time_period == "1d":
-            
-            end = date.today()
-            if date.weekday(end) == 0:
-                
-                start = end - timedelta(days=4)
-            elif date.weekday(end) == 5:
-                
-                start = end - timedelta(days=2)
-            elif date.weekday(end) == 6:
-                
-                start = end - timedelta(days=3)
-            else:
-                
-                start = end - timedelta(days=2)
-                if date.weekday(start) == 5:
-                    
-                    start = start - timedelta(days=1)
-                elif date.weekday(start) == 6:
-                    
-                    start = start - timedelta(days=2)
-            end_date = end.strftime("%Y-%m-%d")
-            start_date = start.strftime("%Y-%m-%d")
-            data = yf.download(tickers_list, start=start_date, end=end_date, progress=False)
-            data.dropna()
-            for ticker in tickers_list:
-                
-                first_portfolio_valuation += assets_amounts_dict[ticker]*data["Adj Close"][ticker][0]
-                last_portfolio_valuation += assets_amounts_dict[ticker]*data["Adj Close"][ticker][-1]
-            portfolio_return = np.round(((last_portfolio_valuation-first_portfolio_valuation)/first_portfolio_valuation)*100, 2)
-            portfolio.portfolio_return_dict[time_period] = portfolio_return
-        else:
-            
-            data = yf.download(tickers_list, period=time_period, progress=False)
-            data.dropna()
-            for ticker in tickers_list:
-                
-                first_portfolio_valuation += assets_amounts_dict[ticker]*data["Adj Close"][ticker][0]
-                last_portfolio_valuation += assets_amounts_dict[ticker]*data["Adj Close"][ticker][-1]
-            portfolio_return = np.round(((last_portfolio_valuation-first_portfolio_valuation)/first_portfolio_valuation)*100, 2)
-            portfolio.portfolio_return_dict[time_period] = portfolio_return
+        first_portfolio_valuation = first_prices.to_numpy() @ assets_amounts
+        last_portfolio_valuation = last_prices.to_numpy() @ assets_amounts
+        portfolio_returns = np.round(((last_portfolio_valuation-first_portfolio_valuation)/first_portfolio_valuation)*100, 2)
+    for time_period, portfolio_return in zip(Portfolio.VALIDS_TIME_PERIODS, portfolio_returns):
+        
+        portfolio.portfolio_return_dict[time_period] = portfolio_return
             
-def _index_to_selection(i: int, num_assets: int) -> np.array:
-    """Creates an array of selected indexes.
+def _count_solver_evaluation(counter_name: str, eval_count: int, parameters: np.ndarray, mean: float, std: float) -> None:
+    """Counts one evaluation of a variational algorithm. It is used as the callback of VQE and QAOA.
 
     Args:
-        i (int): An index.
-        num_assets (int): The number of assets.
+        counter_name (str): The name of the counter.
+        eval_count (int): The number of evaluations done.
+        parameters (np.ndarray): The parameters of the evaluation.
+        mean (float): The mean value of the evaluation.
+        std (float): The standard deviation of the evaluation.
+    """
+    increment(counter_name)
 
-    Returns:
-        np.array: An array of indexes.
+def _print_samples(selections: np.ndarray, values: np.ndarray, probabilities: np.ndarray) -> None:
+    """Prints the full result table of a portfolio optimization.
+
+    Args:
+        selections (np.ndarray): The selections as rows, in the order of the table.
+        values (np.ndarray): The value of each selection.
+        probabilities (np.ndarray): The probability of each selection.
     """
-    s = "{0:b}".format(i).rjust(num_assets)
-    x = np.array([1 if s[i] == "1" else 0 for i in reversed(range(num_assets))])
-    return x
+    print("\n----------------- Full result ---------------------")
+    print("selection\tvalue\t\tprobability")
+    print("---------------------------------------------------")
+    
+    for selection, value, probability in zip(selections, values, probabilities):
+        
+        print("%10s\t%.4f\t\t%.4f" % (selection, value, probability))
 
-def _print_result(quadratic_program: QuadraticProgram, result: OptimizerResult, num_assets: int) -> None:
+def _print_result(result: "OptimizerResult", qubo: Qubo) -> None:
     """Prints the result of the portfolio optimization.
 
     Args:
-        quadratic_program (QuadraticProgram): The quadratic program that defines the problem.
         result (OptimizerResult): The result obtained in the optimization process.
-        num_assets (int): The number of assets in the portfolio.
+        qubo (Qubo): The penalized QUBO of the problem.
     """
     selection = result.x
     value = result.fval
     print(f"Optimal: selection {selection}, value {np.round(value, 4)}")
     
-    eigenstate = result.min_eigen_solver_result.eigenstate
-    eigenvector = eigenstate if isinstance(eigenstate, np.ndarray) else eigenstate.to_matrix()
-    probabilities = np.abs(eigenvector) ** 2
-    i_sorted = reversed(np.argsort(probabilities))
-    print("\n----------------- Full result ---------------------")
-    print("selection\tvalue\t\tprobability")
-    print("---------------------------------------------------")
-    
-    for i in i_sorted:
-        
-        x = _index_to_selection(i, num_assets)
-        value = QuadraticProgramToQubo().convert(quadratic_program).objective.evaluate(x)
-        probability = probabilities[i]
-        print("%10s\t%.4f\t\t%.4f" % (x, value, probability))
+    with timed("solver.result_report"):
         
+        eigenstate = result.min_eigen_solver_result.eigenstate
+        eigenvector = eigenstate if isinstance(eigenstate, np.ndarray) else eigenstate.to_matrix()
+        probabilities = np.abs(eigenvector) ** 2
+        selections = all_selections(num_assets=len(qubo.linear))
+        values = evaluate_qubo(qubo=qubo, selections=selections)
+        i_sorted = np.argsort(probabilities)[::-1]
+        _print_samples(selections=selections[i_sorted], values=values[i_sorted], probabilities=probabilities[i_sorted])
+            
 def market_benchmark_index_return() -> DataFrame:
     """Creates a table with the returns of the benchmarks.
 
@@ -130,51 +111,78 @@ def market_benchmark_index_return() -> DataFrame:
     columns_list = ["Name", "Ticker"]
     time_period_list = [f"Return (%) - {time_period}" for time_period in Portfolio.VALIDS_TIME_PERIODS]
     columns_list.extend(time_period_list)
+    benchmarks_tickers = list(Portfolio.MARKET_BENCHMARKS_TICKERS_DICT.values())
+    benchmarks_matrix = get_price_store().price_matrix(tickers=benchmarks_tickers, time_period="max")
+    benchmarks_returns = returns_for_all_time_periods(price_matrix=benchmarks_matrix, time_periods=Portfolio.VALIDS_TIME_PERIODS)
     data_benchmark_index = []
     for name, ticker in Portfolio.MARKET_BENCHMARKS_TICKERS_DICT.items():
         
         index_info = [name, ticker]
-        for time_period in Portfolio.VALIDS_TIME_PERIODS:
-            
-            if time_period == "1d":
-                
-                end = date.today()
-                if date.weekday(end) == 0:
-                    
-                    start = end - timedelta(days=4)
-                elif date.weekday(end) == 5:
-                    
-                    start = end - timedelta(days=2)
-                elif date.weekday(end) == 6:
-                    
-                    start = end - timedelta(days=3)
-                else:
-                    
-                    start = end - timedelta(days=2)
-                    if date.weekday(start) == 5:
-                        
-                        start = start - timedelta(days=1)
-                    elif date.weekday(start) == 6:
-                        
-                        start = start - timedelta(days=2)
-                end_date = end.strftime("%Y-%m-%d")
-                start_date = start.strftime("%Y-%m-%d")
-                data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-                data.dropna()
-                benchmark_return = np.round(((data["Adj Close"][-1] - data["Adj Close"][0])/data["Adj Close"][0])*100, 2)
-                index_info.append(benchmark_return)
-            else:
-                
-                data = yf.download(ticker, period=time_period, progress=False)
-                data.dropna()
-                benchmark_return = np.round(((data["Adj Close"][-1] - data["Adj Close"][0])/data["Adj Close"][0])*100, 2)
-                index_info.append(benchmark_return)
+        index_info.extend(benchmarks_returns[ticker].tolist())
         data_benchmark_index.append(index_info)
     pd_benchmarks_returns = pd.DataFrame(data=data_benchmark_index, columns=columns_list)
     return pd_benchmarks_returns
+
+def portfolio_benchmark_comparison(portfolio: Portfolio, time_period: str, benchmark: str = "S&P 500", rolling_window: int = 21) -> DataFrame:
+    """Compares the portfolio with a market benchmark day by day.
+
+    The portfolio and the benchmark prices come from one aligned matrix of the
+    shared price store, so the benchmark history is downloaded only once.
+
+    Args:
+        portfolio (Portfolio): The portfolio that we want to compare.
+        time_period (str): The time period of the comparison.
+        benchmark (str, optional): The benchmark name in Portfolio.MARKET_BENCHMARKS_TICKERS_DICT. Defaults to "S&P 500".
+        rolling_window (int, optional): The number of days used to estimate the rolling beta. Defaults to 21.
+
+    Raises:
+        ValueError: If the time period is not valid.
+        ValueError: If the benchmark is not valid.
+        TypeError: If the inputs are not a Portfolio, a str, a str and an int.
+
+    Returns:
+        DataFrame: A table with the cumulative returns, the excess return, the relative drawdown and the rolling beta.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(time_period, str) and isinstance(benchmark, str) and isinstance(rolling_window, int):
+        
+        if len(portfolio.assets) != 0:
+            
+            if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+                
+                raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+            if benchmark not in Portfolio.MARKET_BENCHMARKS_TICKERS_DICT:
+                
+                raise ValueError(f"Invalid benchmark! The valids benchmarks are {list(Portfolio.MARKET_BENCHMARKS_TICKERS_DICT.keys())}.")
+            tickers_list = [asset.ticker for asset in portfolio.assets]
+            benchmark_ticker = Portfolio.MARKET_BENCHMARKS_TICKERS_DICT[benchmark]
+            assets_amounts = np.array([asset.amount for asset in portfolio.assets])
+            aligned_matrix = get_price_store().price_matrix(tickers=tickers_list + [benchmark_ticker], time_period=time_period).ffill().bfill()
+            portfolio_value = aligned_matrix[tickers_list].to_numpy() @ assets_amounts
+            benchmark_value = aligned_matrix[benchmark_ticker].to_numpy()
+            portfolio_growth = portfolio_value/portfolio_value[0]
+            benchmark_growth = benchmark_value/benchmark_value[0]
+            relative_growth = portfolio_growth/benchmark_growth
+            relative_drawdown = relative_growth/np.maximum.accumulate(relative_growth) - 1
+            daily_returns = pd.DataFrame(data={"portfolio": portfolio_value, "benchmark": benchmark_value}).pct_change()
+            rolling_beta = daily_returns["portfolio"].rolling(rolling_window).cov(daily_returns["benchmark"])/daily_returns["benchmark"].rolling(rolling_window).var()
+            comparison_pd = pd.DataFrame(data={
+                "Date": aligned_matrix.index,
+                "Portfolio Return (%)": np.round((portfolio_growth - 1)*100, 2),
+                f"{benchmark} Return (%)": np.round((benchmark_growth - 1)*100, 2),
+                "Excess Return (%)": np.round((portfolio_growth - benchmark_growth)*100, 2),
+                "Relative Drawdown (%)": np.round(relative_drawdown*100, 2),
+                "Rolling Beta": np.round(rolling_beta.to_numpy(), 4),
+            })
+            return comparison_pd
+        else:
+            
+            print("The portfolio assets list is empty!")
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio, a str, a str and an int.")
             
          
-def numpy_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int) -> None:
+def numpy_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, verbose: bool = True) -> Optional["MinimumEigenOptimizationResult"]:
     """Run a portfolio optimization with MinimumEigenOptimizer.
 
     Args:
@@ -183,20 +191,25 @@ def numpy_portfolio_optimization(input_portfolio: Portfolio, start_date: datetim
         end_date (datetime): The end date for getting data in the Yahoo Finance API.
         risk_factor (float): The risk factor. 
         budget (int): The budget that we have.
+        verbose (bool, optional): If the result must be printed. Defaults to True.
 
     Raises:
         TypeError: If the inputs are not equal to a Portfolio, a datetime, a datetime, a float and a int.
+
+    Returns:
+        Optional[MinimumEigenOptimizationResult]: The result of the optimization, None if the assets list is empty.
     """
     if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int):
         
         num_assets = len(input_portfolio.assets)
         if num_assets != 0:
             
-            quadratic_program = _set_quadratic_program(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date, risk_factor=risk_factor, budget=budget)
-            exact_mes = NumPyMinimumEigensolver()
-            exact_eigensolver = MinimumEigenOptimizer(exact_mes)
-            result = exact_eigensolver.solve(quadratic_program)
-            _print_result(quadratic_program=quadratic_program, result=result, num_assets=num_assets)
+            mu, sigma = _mean_covariance(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date)
+            result = _eigensolver_result(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget, method="numpy")
+            if verbose:
+                
+                _print_result(result=result, qubo=portfolio_qubo(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget))
+            return result
         else:
             
             print("Empty assets list!")
@@ -204,7 +217,7 @@ def numpy_portfolio_optimization(input_portfolio: Portfolio, start_date: datetim
         
         raise TypeError("Invalid types! This function expects a Portfolio, a datetime, a datetime, a float and an int.")
 
-def vqe_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, optimizer: Optional[Optimizer] = None, maxiter: Optional[int] = None) -> None:
+def vqe_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, optimizer: Optional["Optimizer"] = None, maxiter: Optional[int] = None, verbose: bool = True) -> Optional["MinimumEigenOptimizationResult"]:
     """Run a portfolio optimization with VQE (quantum computing). 
 
     Args:
@@ -215,29 +228,25 @@ def vqe_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime,
         budget (int): The budget that we have.
         optimizer (Optional[Optimizer], optional): The optimizer that we want to use in the VQE. Defaults to None.
         maxiter (Optional[int], optional): The number of max iterations of the optimizer. Defaults to None.
+        verbose (bool, optional): If the result must be printed. Defaults to True.
 
     Raises:
         TypeError: If the inputs are not equal to a Portfolio, a datetime, a datetime, a float, an int, a Optimizer and an int.
+
+    Returns:
+        Optional[MinimumEigenOptimizationResult]: The result of the optimization, None if the assets list is empty.
     """
-    if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int) and (isinstance(optimizer, Optimizer) or optimizer is None) and (isinstance(maxiter, int) or maxiter is None):
+    if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int) and (isinstance(optimizer, qiskit_optimizers.Optimizer) or optimizer is None) and (isinstance(maxiter, int) or maxiter is None):
         
         num_assets = len(input_portfolio.assets)
         if num_assets != 0:
             
-            quadratic_program = _set_quadratic_program(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date, risk_factor=risk_factor, budget=budget)
-            backend = Aer.get_backend("statevector_simulator")
-            quantum_instance = QuantumInstance(backend=backend)
-            if maxiter is None:
+            mu, sigma = _mean_covariance(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date)
+            result = _eigensolver_result(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget, method="vqe", optimizer=optimizer, maxiter=maxiter)
+            if verbose:
                 
-                maxiter = 200
-            if optimizer is None:
-                
-                optimizer = COBYLA(maxiter=maxiter)
-            circuit = TwoLocal(num_qubits=num_assets, rotation_blocks="ry", entanglement_blocks="cz", reps=3, entanglement="full")
-            vqe_mes = VQE(circuit, optimizer=optimizer, quantum_instance=quantum_instance)
-            vqe = MinimumEigenOptimizer(vqe_mes)
-            result = vqe.solve(quadratic_program)
-            _print_result(quadratic_program=quadratic_program, result=result, num_assets=num_assets)
+                _print_result(result=result, qubo=portfolio_qubo(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget))
+            return result
         else:
             
             print("Empty assets list!")
@@ -245,7 +254,7 @@ def vqe_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime,
         
         raise TypeError("Invalid types! This function expects a Portfolio, a datetime, a datetime, a float, an int, an Optimizer and an int.")
 
-def qaoa_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, optimizer: Optional[Optimizer] = None, maxiter: Optional[int] = None) -> None:
+def qaoa_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, optimizer: Optional["Optimizer"] = None, maxiter: Optional[int] = None, verbose: bool = True) -> Optional["MinimumEigenOptimizationResult"]:
     """Run a portfolio optimization with QAOA (quantum computing).
 
     Args:
@@ -256,29 +265,25 @@ def qaoa_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime
         budget (int): The budget that we have.
         optimizer (Optional[Optimizer], optional): The optimizer that we want to use in the VQE. Defaults to None.
         maxiter (Optional[int], optional): The number of max iterations of the optimizer. Defaults to None.
+        verbose (bool, optional): If the result must be printed. Defaults to True.
 
     Raises:
         TypeError: If the inputs are not equal to a Portfolio, a datetime, a datetime, a float, an int, a Optimizer and an int.
+
+    Returns:
+        Optional[MinimumEigenOptimizationResult]: The result of the optimization, None if the assets list is empty.
     """
-    if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int) and (isinstance(optimizer, Optimizer) or optimizer is None) and (isinstance(maxiter, int) or maxiter is None):
+    if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int) and (isinstance(optimizer, qiskit_optimizers.Optimizer) or optimizer is None) and (isinstance(maxiter, int) or maxiter is None):
         
         num_assets = len(input_portfolio.assets)
         if num_assets != 0:
             
-            quadratic_program = _set_quadratic_program(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date, risk_factor=risk_factor, budget=budget)
-            backend = Aer.get_backend("statevector_simulator")
-            backend = Aer.get_backend("statevector_simulator")
-            quantum_instance = QuantumInstance(backend=backend)
-            if maxiter is None:
+            mu, sigma = _mean_covariance(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date)
+            result = _eigensolver_result(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget, method="qaoa", optimizer=optimizer, maxiter=maxiter)
+            if verbose:
                 
-                maxiter = 200
-            if optimizer is None:
-                
-                optimizer = COBYLA(maxiter=maxiter)
-            qaoa_mes = QAOA(optimizer=optimizer, reps=3, quantum_instance=quantum_instance)
-            qaoa = MinimumEigenOptimizer(qaoa_mes)
-            result = qaoa.solve(quadratic_program)
-            _print_result(quadratic_program=quadratic_program, result=result, num_assets=num_assets)
+                _print_result(result=result, qubo=portfolio_qubo(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget))
+            return result
         else:
             
             print("Empty assets list!")
@@ -286,56 +291,228 @@ def qaoa_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime
         
         raise TypeError("Invalid types! This function expects a Portfolio, a datetime, a datetime, a float, an int, an Optimizer and an int.")
     
-def portfolio_current_valuation(portfolio: Portfolio) -> None:
+def heuristic_portfolio_optimization(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int, method: str = "annealing", num_restarts: int = 32, maxiter: Optional[int] = None, workers: Optional[int] = None, seed: Optional[int] = None, num_factors: Optional[int] = None, verbose: bool = True) -> Optional[HeuristicResult]:
+    """Run a portfolio optimization with a classical heuristic (simulated annealing or tabu search).
+
+    It solves the same QUBO as the other optimizers, but its cost grows with
+    the number of assets instead of the number of selections, so it scales to
+    portfolios that are too large for the eigensolvers. Only the selections of
+    exactly budget assets are visited and the restarts run in parallel processes.
+
+    Args:
+        input_portfolio (Portfolio): The portfolio that we want to optimize.
+        start_date (datetime): The start date for getting data in the Yahoo Finance API.
+        end_date (datetime): The end date for getting data in the Yahoo Finance API.
+        risk_factor (float): The risk factor.
+        budget (int): The budget that we have.
+        method (str, optional): The heuristic (annealing or tabu). Defaults to "annealing".
+        num_restarts (int, optional): The number of independent runs. Defaults to 32.
+        maxiter (Optional[int], optional): The number of sweeps (annealing) or of swaps (tabu) of each run. Defaults to None.
+        workers (Optional[int], optional): The number of processes. Defaults to None (in-process for small problems,
+        see solve_qubo).
+        seed (Optional[int], optional): The seed of the random generators. Defaults to None.
+        num_factors (Optional[int], optional): The number of factors of the covariance model. Defaults to None (sample covariance).
+        verbose (bool, optional): If the result must be printed. Defaults to True.
+
+    Raises:
+        ValueError: If the method is not valid or the budget is larger than the number of assets.
+        TypeError: If the inputs are not equal to a Portfolio, a datetime, a datetime, a float, an int, a str and an int.
+
+    Returns:
+        Optional[HeuristicResult]: The result of the optimization, None if the assets list is empty.
+    """
+    if isinstance(input_portfolio, Portfolio) and isinstance(start_date, datetime) and isinstance(end_date, datetime) and isinstance(risk_factor, float) and isinstance(budget, int) and isinstance(method, str) and isinstance(num_restarts, int):
+        
+        num_assets = len(input_portfolio.assets)
+        if num_assets != 0:
+            
+            mu, sigma = _mean_covariance(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date, num_factors=num_factors)
+            qubo = portfolio_qubo(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget)
+            with timed(f"solver.{method}"):
+                
+                result = solve_qubo(qubo=qubo, budget=budget, method=method, num_restarts=num_restarts, maxiter=maxiter, workers=workers, seed=seed)
+            if verbose:
+                
+                print(f"Optimal: selection {result.x}, value {np.round(result.fval, 4)}")
+                _print_samples(selections=result.selections, values=result.values, probabilities=result.probabilities)
+            return result
+        else:
+            
+            print("Empty assets list!")
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio, a datetime, a datetime, a float, an int, a str and an int.")
+    
+def _portfolio_valuation(portfolio: Portfolio, base_currency: str) -> float:
+    """Calculates the current valuation of a portfolio in the base currency.
+
+    The last prices are memoized for the time to live of the "1d" window and
+    downloaded again once it expires.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        base_currency (str): The currency of the valuation.
+
+    Returns:
+        float: The valuation rounded to cents.
+    """
+    tickers_list = [asset.ticker for asset in portfolio.assets]
+    currencies_list = [asset.currency for asset in portfolio.assets]
+    assets_amounts = np.array([asset.amount for asset in portfolio.assets])
+    price_store = get_price_store()
+    memo_cache = get_memo_cache()
+    key = memo_key("last_prices", price_store.provider.name, tickers_list, "1d", "1d", tuple(currencies_list), base_currency)
+    last_prices = memo_cache.get(key)
+    if last_prices is None:
+        
+        price_store.invalidate(tickers=tickers_list)
+        price_matrix = price_store.price_matrix(tickers=tickers_list, field="Close", time_period="5d")
+        converted_matrix = price_store.convert_to_base_currency(price_matrix=price_matrix, currencies=currencies_list, base_currency=base_currency)
+        last_prices = converted_matrix.ffill().to_numpy()[-1]
+        memo_cache.put(key, last_prices, ttl=memo_cache.ttl_for(window="1d"))
+    return float(np.round(last_prices @ assets_amounts, 2))
+
+def portfolio_current_valuation(portfolio: Portfolio, base_currency: str = "USD") -> None:
     """Prints the current valuation of the portfolio.
 
+    Every position is converted from its quote currency to the base currency
+    before the valuation is summed.
+
     Args:
         portfolio (Portfolio): The Portfolio that we want to know the current valuation.
+        base_currency (str, optional): The currency of the valuation. Defaults to "USD".
 
     Raises:
-        TypeError: If the input is not a Portfolio.
+        TypeError: If the inputs are not a Portfolio and a str.
     """
-    if isinstance(portfolio, Portfolio):
+    if isinstance(portfolio, Portfolio) and isinstance(base_currency, str):
         
         if len(portfolio.assets) != 0:
             
-            assets_amount = {asset.ticker: asset.amount for asset in portfolio.assets}
-            portfolio_valuation = 0
-            for asset in portfolio.assets:
-                
-                data = yf.download(asset.ticker, period="1d", progress=False)
-                data.dropna()
-                portfolio_valuation += np.round(assets_amount[asset.ticker]*data["Adj Close"][0], 2)
-            print(f"Current portfolio valuation in USD: ${portfolio_valuation:.2f}")
+            portfolio_valuation = _portfolio_valuation(portfolio=portfolio, base_currency=base_currency)
+            print(f"Current portfolio valuation in {base_currency}: {portfolio_valuation:.2f}")
         else:
             
             print("The portfolio assets list is empty!")
     else:
         
-        raise TypeError("Invalid type! This functions expects a Portfolio.")
+        raise TypeError("Invalid types! This functions expects a Portfolio and a str.")
+
+def _mean_covariance(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, num_factors: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the mean vector and the covariance matrix of the daily returns of the assets of a portfolio.
+
+    They are computed from the shared price store, as the YahooDataProvider of qiskit_finance does. The
+    assets can trade on different calendars (cryptocurrencies on weekends), so each asset only has returns
+    on its own trading days, from its previous close, and the covariance of two assets is estimated on the
+    days where both have a return.
 
-def _set_quadratic_program(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int) -> QuadraticProgram:
-    """Creates the quadratic program that defines the Portfolio optimization.
-    
     Args:
         input_portfolio (Portfolio): The portfolio that we want to optimize.
         start_date (datetime): The start date for getting data in the Yahoo Finance API.
         end_date (datetime): The end date for getting data in the Yahoo Finance API.
+        num_factors (Optional[int], optional): The number of factors of a statistical factor model of the covariance,
+        which is well conditioned when the assets are many compared to the dates. Defaults to None (sample covariance).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The mean vector and the covariance matrix.
+    """
+    tickers_list = [asset.ticker for asset in input_portfolio.assets]
+    price_matrix = get_price_store().price_matrix(tickers=tickers_list, start_date=start_date.strftime("%Y-%m-%d"), end_date=end_date.strftime("%Y-%m-%d"))
+    with timed("estimation.mean_covariance"):
+        
+        prices = price_matrix.ffill().to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            
+            period_returns = prices[1:]/prices[:-1] - 1
+        period_returns[np.isnan(price_matrix.to_numpy(dtype=np.float64)[1:])] = np.nan
+        mu = np.nanmean(period_returns, axis=0)
+        if num_factors is None:
+            
+            sigma = pd.DataFrame(period_returns).cov().to_numpy()
+        else:
+            
+            sigma = fit_factor_covariance(returns=period_returns, num_factors=num_factors).to_dense()
+    return mu, sigma
+
+def _eigensolver_result(mu: np.ndarray, sigma: np.ndarray, risk_factor: float, budget: int, method: str = "numpy", optimizer: Optional["Optimizer"] = None, maxiter: Optional[int] = None) -> "MinimumEigenOptimizationResult":
+    """Solves the portfolio optimization of returns statistics with MinimumEigenOptimizer.
+
+    Args:
+        mu (np.ndarray): The mean vector of the returns.
+        sigma (np.ndarray): The covariance matrix of the returns.
+        risk_factor (float): The risk factor.
+        budget (int): The budget that we have.
+        method (str, optional): The eigensolver (numpy, vqe or qaoa). Defaults to "numpy".
+        optimizer (Optional[Optimizer], optional): The optimizer of the variational eigensolvers. Defaults to None (COBYLA).
+        maxiter (Optional[int], optional): The number of max iterations of the optimizer. Defaults to None (200).
+
+    Returns:
+        MinimumEigenOptimizationResult: The result of the optimization.
+    """
+    quadratic_program = _quadratic_program(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget)
+    if method == "numpy":
+        
+        eigensolver = qiskit_algorithms.NumPyMinimumEigensolver()
+    else:
+        
+        backend = qiskit.Aer.get_backend("statevector_simulator")
+        quantum_instance = qiskit_utils.QuantumInstance(backend=backend)
+        if maxiter is None:
+            
+            maxiter = 200
+        if optimizer is None:
+            
+            optimizer = qiskit_optimizers.COBYLA(maxiter=maxiter)
+        if method == "vqe":
+            
+            circuit = qiskit_circuit_library.TwoLocal(num_qubits=len(mu), rotation_blocks="ry", entanglement_blocks="cz", reps=3, entanglement="full")
+            eigensolver = qiskit_algorithms.VQE(circuit, optimizer=optimizer, quantum_instance=quantum_instance, callback=partial(_count_solver_evaluation, "solver.vqe.evaluations"))
+        else:
+            
+            eigensolver = qiskit_algorithms.QAOA(optimizer=optimizer, reps=3, quantum_instance=quantum_instance, callback=partial(_count_solver_evaluation, "solver.qaoa.evaluations"))
+    minimum_eigen_optimizer = optimization_algorithms.MinimumEigenOptimizer(eigensolver)
+    with timed(f"solver.{method}"):
+        
+        result = minimum_eigen_optimizer.solve(quadratic_program)
+    return result
+
+def _quadratic_program(mu: np.ndarray, sigma: np.ndarray, risk_factor: float, budget: int) -> "QuadraticProgram":
+    """Creates the quadratic program that defines the Portfolio optimization from the returns statistics.
+
+    Args:
+        mu (np.ndarray): The mean vector of the returns.
+        sigma (np.ndarray): The covariance matrix of the returns.
         risk_factor (float): The risk factor.
         budget (int): The budget that we have.
 
     Returns:
         QuadraticProgram: The quadratic program that defines the optimization problem.
     """
-    tickers_list = [asset.ticker for asset in input_portfolio.assets]
-    data = YahooDataProvider(tickers=tickers_list, start=start_date, end=end_date)
-    data.run()
-    mu = data.get_period_return_mean_vector()
-    sigma = data.get_period_return_covariance_matrix()
-    portfolio = PortfolioOptimization(expected_returns=mu, covariances=sigma, risk_factor=risk_factor, budget=budget)
-    quadratic_program = portfolio.to_quadratic_program()
+    with timed("matrix.quadratic_program"):
+        
+        portfolio = finance_applications.PortfolioOptimization(expected_returns=mu, covariances=sigma, risk_factor=risk_factor, budget=budget)
+        quadratic_program = portfolio.to_quadratic_program()
     return quadratic_program
 
+def _set_quadratic_program(input_portfolio: Portfolio, start_date: datetime, end_date: datetime, risk_factor: float, budget: int) -> "QuadraticProgram":
+    """Creates the quadratic program that defines the Portfolio optimization.
+
+    The mean vector and the covariance matrix of the daily returns are computed
+    from the shared price store, as the YahooDataProvider of qiskit_finance does.
+
+    Args:
+        input_portfolio (Portfolio): The portfolio that we want to optimize.
+        start_date (datetime): The start date for getting data in the Yahoo Finance API.
+        end_date (datetime): The end date for getting data in the Yahoo Finance API.
+        risk_factor (float): The risk factor.
+        budget (int): The budget that we have.
+
+    Returns:
+        QuadraticProgram: The quadratic program that defines the optimization problem.
+    """
+    mu, sigma = _mean_covariance(input_portfolio=input_portfolio, start_date=start_date, end_date=end_date)
+    return _quadratic_program(mu=mu, sigma=sigma, risk_factor=risk_factor, budget=budget)
+
 def show_portfolio_returns_for_all_time_periods(portfolio: Portfolio) -> DataFrame:
     """Creates a table with the returns of the portfolio for all time periods.
 
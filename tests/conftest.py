@@ -0,0 +1,18 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from market_data import PriceStore, SyntheticPriceProvider, set_price_store
+
+
+MIXED_CATEGORIES = {"BTC-USD": "cryptocurrency", "ETH-USD": "cryptocurrency"}
+
+
+@pytest.fixture
+def price_store() -> PriceStore:
+    """A shared price store over synthetic prices, with crypto tickers that trade on weekends."""
+    store = PriceStore(SyntheticPriceProvider(categories=MIXED_CATEGORIES))
+    set_price_store(price_store=store)
+    return store
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tools.decimation import decimate, lttb_indices, minmax_indices
+
+
+def _series(num_points=10000):
+    rng = np.random.default_rng(5)
+    values = rng.standard_normal(num_points).cumsum()
+    values[1234] = 500.0
+    values[8765] = -500.0
+    return pd.Series(values, index=pd.date_range("2000-01-01", periods=num_points, freq="h"))
+
+
+def test_minmax_keeps_the_extremes_of_every_bucket():
+    y = _series().to_numpy()
+    indices = minmax_indices(y=y, target_points=102)
+    assert len(indices) <= 102 and indices[0] == 0 and indices[-1] == len(y) - 1
+    assert 1234 in indices and 8765 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_the_target_points_and_the_spikes():
+    series = _series()
+    indices = lttb_indices(x=np.arange(len(series), dtype=np.float64), y=series.to_numpy(), target_points=200)
+    assert len(indices) == 200 and indices[0] == 0 and indices[-1] == len(series) - 1
+    assert 1234 in indices and 8765 in indices
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_decimate_tables_with_gaps(method):
+    series = _series()
+    table = pd.DataFrame({"A": series, "B": series.where(series.index.hour != 3)})
+    decimated = decimate(data=table, target_points=100, method=method)
+    assert len(decimated) <= 2*100 and decimated.index.is_monotonic_increasing
+    assert decimated["A"].max() == 500.0 and decimated["A"].min() == -500.0
+    assert isinstance(decimate(data=series, target_points=100, method=method), pd.Series)
+    # Short series are returned as they are.
+    pd.testing.assert_series_equal(decimate(data=series.iloc[:50], target_points=100, method=method), series.iloc[:50])
+    with pytest.raises(ValueError):
+        
+        decimate(data=series, target_points=100, method="mean")
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tools.files import iter_data_chunks, load_data
+
+
+def _long_table():
+    dates = pd.bdate_range("2022-01-03", "2023-12-29")
+    return pd.DataFrame({
+        "Date": np.repeat(dates, 2),
+        "Ticker": np.tile(["AAA", "BBB"], len(dates)),
+        "Close": np.arange(2*len(dates), dtype=float),
+    })
+
+
+def _store(table, tmp_path, file_format, date_index):
+    stored = table.set_index("Date") if date_index else table
+    if date_index == "unnamed":
+        
+        stored = stored.rename_axis(None)
+    path = tmp_path / f"data.{file_format}"
+    if file_format == "csv":
+        
+        stored.to_csv(path, index=date_index is not None)
+    elif file_format == "parquet":
+        
+        stored.to_parquet(path)
+    else:
+        
+        (stored.reset_index() if date_index else stored).to_feather(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("file_format, date_index", [("csv", None), ("csv", "named"), ("parquet", None), ("parquet", "named"), ("parquet", "unnamed"), ("feather", None), ("feather", "named"), ("feather", "unnamed")])
+def test_load_data_filters_and_shape_do_not_depend_on_the_format(tmp_path, file_format, date_index):
+    table = _long_table()
+    path = _store(table=table, tmp_path=tmp_path, file_format=file_format, date_index=date_index)
+    expected = table[(table["Date"] >= "2023-01-01") & (table["Ticker"] == "BBB")].reset_index(drop=True)
+    loaded = load_data(path, tickers=["BBB"], start_date="2023-01-01").reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded[["Date", "Ticker", "Close"]], expected, check_dtype=False)
+    # The predicate columns are read even when they are not loaded.
+    close = load_data(path, columns=["Close"], tickers=["BBB"], start_date="2023-01-01")
+    assert list(close.columns) == ["Close"]
+    np.testing.assert_array_equal(close["Close"].to_numpy(), expected["Close"].to_numpy())
+    chunks = list(iter_data_chunks(path, chunk_size=97, columns=["Close"], tickers=["BBB"], start_date="2023-01-01"))
+    np.testing.assert_array_equal(pd.concat(chunks)["Close"].to_numpy(), expected["Close"].to_numpy())
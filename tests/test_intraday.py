@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from market_data.intraday import IntradayBars
+
+
+def _minute_panel():
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2023-03-01 14:30", periods=390, freq="1min")
+    fields = {}
+    close = pd.DataFrame(100 + rng.standard_normal((len(index), 3)).cumsum(axis=0), index=index, columns=["AAA", "BBB", "CCC"])
+    # BBB has gaps and CCC has no bars at all.
+    close.loc[close.index[rng.random(len(index)) < 0.3], "BBB"] = np.nan
+    close["CCC"] = np.nan
+    fields["Open"] = close + rng.standard_normal(close.shape)*0.1
+    fields["High"] = np.maximum(fields["Open"], close) + 0.2
+    fields["Low"] = np.minimum(fields["Open"], close) - 0.2
+    fields["Close"] = close
+    fields["Volume"] = pd.DataFrame(rng.integers(1, 1000, close.shape), index=index, columns=close.columns).where(close.notna())
+    return pd.concat(fields, axis=1)
+
+
+@pytest.mark.parametrize("interval", ["5m", "15m", "1h"])
+def test_resample_matches_pandas(interval):
+    panel = _minute_panel()
+    bars = IntradayBars.from_panel(panel=panel, interval="1m")
+    resampled = bars.resample(interval=interval)
+    assert resampled.interval == interval and resampled.offsets[-1] == len(resampled)
+    for ticker in ["AAA", "BBB"]:
+        
+        minute_bars = bars.ticker_bars(ticker=ticker).set_index("Date")
+        expected = minute_bars.groupby(minute_bars.index.floor(pd.Timedelta(seconds={"5m": 300, "15m": 900, "1h": 3600}[interval]))).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+        result = resampled.ticker_bars(ticker=ticker).set_index("Date")
+        pd.testing.assert_frame_equal(result, expected, check_names=False, check_freq=False)
+    assert len(resampled.ticker_bars(ticker="CCC")) == 0
+
+
+def test_resample_rejects_finer_intervals():
+    bars = IntradayBars.from_panel(panel=_minute_panel(), interval="5m")
+    with pytest.raises(ValueError):
+        
+        bars.resample(interval="1m")
@@ -0,0 +1,23 @@
+import matplotlib
+from asset import Asset
+from portfolio import Portfolio
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from tools.plot_tools import plot_dashboard
+
+
+def test_dashboard_loads_the_prices_once(price_store, monkeypatch):
+    portfolio = Portfolio(assets=[Asset(name=ticker, ticker=ticker, category=category, amount=5.0, currency="USD") for ticker, category in [("AAA", "stocks"), ("BBB", "bonds"), ("BTC-USD", "cryptocurrency")]])
+    fields = []
+    price_matrix = price_store.price_matrix
+
+    def counted_price_matrix(*args, **kwargs):
+        
+        fields.append(kwargs.get("field", "Adj Close"))
+        return price_matrix(*args, **kwargs)
+    monkeypatch.setattr(price_store, "price_matrix", counted_price_matrix)
+    figure = plot_dashboard(portfolio=portfolio, time_period="1y")
+    assert sorted(fields) == ["Adj Close", "Volume"]
+    plt.close(figure)
@@ -0,0 +1,17 @@
+import pandas as pd
+from asset import Asset
+from portfolio import Portfolio
+from portfolio.portfolio_batch import batch_portfolio_analytics
+
+
+def _portfolio(tickers):
+    return Portfolio(assets=[Asset(name=ticker, ticker=ticker, category="stocks", amount=10.0, currency="USD") for ticker in tickers])
+
+
+def test_batch_returns_do_not_depend_on_the_universe(price_store):
+    time_periods = ["1d", "5d", "1mo", "1y"]
+    columns = [f"Return (%) - {time_period}" for time_period in time_periods]
+    stocks_only = batch_portfolio_analytics(portfolios={"stocks": _portfolio(["AAA", "BBB"])}, time_periods=time_periods)
+    mixed_universe = batch_portfolio_analytics(portfolios={"stocks": _portfolio(["AAA", "BBB"]), "crypto": _portfolio(["BTC-USD"])}, time_periods=time_periods)
+    pd.testing.assert_series_equal(mixed_universe.loc["stocks", columns], stocks_only.loc["stocks", columns])
+    assert (mixed_universe.loc["stocks", columns] != 0).all()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from asset import Asset
+from portfolio import Portfolio
+from portfolio.portfolio_exposure import batch_exposure, portfolio_exposure
+
+
+def _portfolio(positions):
+    return Portfolio(assets=[Asset(name=ticker, ticker=ticker, category=category, amount=amount, currency="USD") for ticker, category, amount in positions])
+
+
+def test_batch_exposure_matches_portfolio_exposure(price_store):
+    portfolios = {
+        "stocks": _portfolio([("AAA", "stocks", 10.0), ("BBB", "stocks", 5.0), ("CCC", "bonds", 20.0)]),
+        "mixed": _portfolio([("AAA", "stocks", 3.0), ("BTC-USD", "cryptocurrency", 0.5), ("ETH-USD", "cryptocurrency", 2.0)]),
+    }
+    batch = batch_exposure(portfolios=portfolios, time_period="1y")
+    for name, portfolio in portfolios.items():
+        
+        exposure = portfolio_exposure(portfolio=portfolio, time_period="1y")
+        for figure in exposure.columns:
+            
+            expected = exposure[figure]
+            np.testing.assert_allclose(batch.loc[name, figure].reindex(expected.index).to_numpy(), expected.to_numpy(), atol=0.011)
+    # Each portfolio adds up on its own groups.
+    np.testing.assert_allclose(batch["Weight (%)"].sum(axis=1), 100.0, atol=0.02)
+    np.testing.assert_allclose(batch["Risk contribution (%)"].sum(axis=1), 100.0, atol=0.02)
+
+
+def test_batch_exposure_of_empty_portfolios(price_store):
+    batch = batch_exposure(portfolios={"empty": Portfolio(assets=[])})
+    assert list(batch.index) == ["empty"] and batch.columns.nlevels == 2
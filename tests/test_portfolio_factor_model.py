@@ -0,0 +1,44 @@
+import numpy as np
+from portfolio.portfolio_factor_model import FactorCovariance, fit_factor_covariance
+from scipy import sparse
+
+
+def _factor_covariance():
+    rng = np.random.default_rng(2)
+    return FactorCovariance(loadings=rng.standard_normal((40, 3)), factor_variances=np.array([4e-4, 2e-4, 1e-4]), specific_variances=rng.uniform(1e-4, 4e-4, size=40))
+
+
+def test_woodbury_solve_matches_the_dense_inverse():
+    covariance = _factor_covariance()
+    dense = covariance.to_dense()
+    right_hand_side = np.random.default_rng(3).standard_normal((40, 2))
+    np.testing.assert_allclose(covariance.solve(right_hand_side=right_hand_side), np.linalg.solve(dense, right_hand_side), rtol=1e-8)
+    np.testing.assert_allclose(covariance.solve(right_hand_side=right_hand_side[:, 0]), np.linalg.solve(dense, right_hand_side[:, 0]), rtol=1e-8)
+
+
+def test_products_match_the_dense_matrix():
+    covariance = _factor_covariance()
+    dense = covariance.to_dense()
+    weights = np.random.default_rng(4).dirichlet(np.ones(40), size=5)
+    np.testing.assert_allclose(covariance.matvec(weights=weights), weights @ dense)
+    np.testing.assert_allclose(covariance.variance(weights=weights), np.einsum("ij,jk,ik->i", weights, dense, weights))
+    np.testing.assert_allclose(covariance.variance(weights=sparse.csr_matrix(weights)), covariance.variance(weights=weights))
+    assert np.isclose(covariance.risk_contributions(weights=weights[0]).sum(), 100.0)
+
+
+def test_mean_variance_weights_are_the_constrained_optimum():
+    covariance = _factor_covariance()
+    expected_returns = np.random.default_rng(6).normal(5e-4, 2e-4, size=40)
+    weights = covariance.mean_variance_weights(expected_returns=expected_returns, risk_factor=2.0)
+    dense = covariance.to_dense()
+    # The optimality conditions of the budget constrained problem: 2 * risk_factor * sigma @ w - mu is the same for every asset.
+    assert np.isclose(weights.sum(), 1.0)
+    gradient = 2*2.0*dense @ weights - expected_returns
+    np.testing.assert_allclose(gradient, np.full(40, gradient.mean()), atol=1e-10)
+
+
+def test_fit_recovers_the_sample_variances():
+    returns = np.random.default_rng(8).standard_normal((120, 30))*0.01
+    covariance = fit_factor_covariance(returns=returns, num_factors=5)
+    assert covariance.num_factors == 5
+    np.testing.assert_allclose(np.diag(covariance.to_dense()), returns.var(axis=0, ddof=1))
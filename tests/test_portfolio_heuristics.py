@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from portfolio import portfolio_heuristics
+from portfolio.portfolio_heuristics import solve_qubo
+from portfolio.portfolio_qubo import portfolio_qubo
+
+
+def _qubo(num_assets, budget):
+    rng = np.random.default_rng(7)
+    factors = rng.normal(size=(num_assets, num_assets))
+    return portfolio_qubo(mu=rng.normal(scale=1e-3, size=num_assets), sigma=factors @ factors.T*1e-4, risk_factor=0.5, budget=budget)
+
+
+def test_small_problems_are_solved_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        
+        raise AssertionError("A process pool was started for a small problem.")
+    monkeypatch.setattr(portfolio_heuristics, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(portfolio_heuristics.os, "cpu_count", lambda: 4)
+    result = solve_qubo(qubo=_qubo(num_assets=12, budget=4), budget=4, seed=0)
+    assert result.x.sum() == 4
+    with pytest.raises(AssertionError):
+        
+        solve_qubo(qubo=_qubo(num_assets=12, budget=4), budget=4, seed=0, parallel_threshold=1)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from asset import Asset
+from market_data import get_price_store
+from portfolio import Portfolio, portfolio_hrp_allocation
+from portfolio.portfolio_hrp import _daily_returns_statistics
+
+
+def _own_calendar_returns(ticker, time_period):
+    prices = get_price_store().price_matrix(tickers=[ticker], time_period=time_period)[ticker].dropna()
+    return prices.pct_change().dropna()
+
+
+def test_volatilities_do_not_depend_on_other_calendars(price_store):
+    correlation, volatilities = _daily_returns_statistics(tickers=["AAA", "BBB", "BTC-USD"], time_period="1y")
+    for ticker in ["AAA", "BBB", "BTC-USD"]:
+        
+        assert np.isclose(volatilities[ticker], _own_calendar_returns(ticker=ticker, time_period="1y").std(ddof=1))
+    # The clusters come from the correlation of the returns, not of the price levels.
+    returns = pd.concat([_own_calendar_returns(ticker=ticker, time_period="1y") for ticker in ["AAA", "BBB"]], axis=1).dropna()
+    assert np.isclose(correlation.loc["AAA", "BBB"], np.corrcoef(returns.to_numpy().T)[0, 1])
+
+
+def test_hrp_allocation_weights_add_up(price_store):
+    assets = [Asset(name=ticker, ticker=ticker, category="stocks", amount=1.0, currency="USD") for ticker in ["AAA", "BBB", "BTC-USD"]]
+    allocation = portfolio_hrp_allocation(portfolio=Portfolio(assets=assets), time_period="1y")
+    assert sorted(allocation.index) == ["AAA", "BBB", "BTC-USD"]
+    assert np.isclose(allocation["Weight (%)"].sum(), 100.0, atol=1e-3)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from portfolio.portfolio_ledger import Transaction, TransactionLedger
+
+
+def _ledger():
+    rng = np.random.default_rng(9)
+    ledger = TransactionLedger(snapshot_interval=4)
+    dates = pd.bdate_range("2023-01-02", periods=60)
+    tickers = ["AAA", "BBB", "CCC"]
+    # The transactions are recorded out of order, so the snapshots are invalidated along the way.
+    for position in rng.permutation(60):
+        
+        ticker = tickers[position % 3]
+        transaction_type = rng.choice(["buy", "buy", "sell", "split", "dividend"])
+        ledger.record(Transaction(date=dates[position], ticker=ticker, transaction_type=transaction_type, quantity=float(rng.integers(1, 10)), price=1.5, ratio=float(rng.choice([2.0, 0.5, 3.0]))))
+    return ledger, dates
+
+
+def _replay(transactions, date):
+    holdings = {}
+    for transaction in transactions:
+        
+        if transaction.date > date:
+            
+            break
+        shares = holdings.get(transaction.ticker, 0.0)
+        if transaction.transaction_type == "buy":
+            
+            holdings[transaction.ticker] = shares + transaction.quantity
+        elif transaction.transaction_type == "sell":
+            
+            holdings[transaction.ticker] = shares - transaction.quantity
+        elif transaction.transaction_type == "split":
+            
+            holdings[transaction.ticker] = shares*transaction.ratio
+    return holdings
+
+
+def test_cumulative_holdings_match_the_replay():
+    ledger, dates = _ledger()
+    holdings = ledger.holdings_matrix(dates=dates)
+    for date in dates:
+        
+        replayed = _replay(transactions=ledger.transactions, date=date)
+        as_of = ledger.holdings_as_of(date=date)
+        for ticker in ledger.tickers:
+            
+            assert np.isclose(holdings.loc[date, ticker], replayed.get(ticker, 0.0))
+            assert np.isclose(as_of.get(ticker, 0.0), replayed.get(ticker, 0.0))
+
+
+def test_split_adjusted_holdings_and_dividends():
+    ledger, dates = _ledger()
+    holdings = ledger.holdings_matrix(dates=dates)
+    adjusted = ledger.holdings_matrix(dates=dates, split_adjusted=True)
+    later_splits = {ticker: 1.0 for ticker in ledger.tickers}
+    for date in dates[::-1]:
+        
+        for ticker in ledger.tickers:
+            
+            assert np.isclose(adjusted.loc[date, ticker], holdings.loc[date, ticker]*later_splits[ticker])
+        for transaction in ledger.transactions:
+            
+            if transaction.date == date and transaction.transaction_type == "split":
+                
+                later_splits[transaction.ticker] *= transaction.ratio
+    dividends = ledger.dividends_matrix(dates=dates)
+    for transaction in ledger.transactions:
+        
+        if transaction.transaction_type == "dividend":
+            
+            assert np.isclose(dividends.loc[transaction.date, transaction.ticker], 1.5*holdings.loc[transaction.date, transaction.ticker])
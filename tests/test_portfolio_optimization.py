@@ -0,0 +1,31 @@
+import numpy as np
+from asset import Asset
+from datetime import datetime, timedelta
+from portfolio import Portfolio
+from portfolio.portfolio_tools import _mean_covariance, heuristic_portfolio_optimization
+
+END_DATE = datetime.today()
+START_DATE = END_DATE - timedelta(days=365)
+
+
+def _portfolio(tickers):
+    return Portfolio(assets=[Asset(name=ticker, ticker=ticker, category="stocks", amount=1.0, currency="USD") for ticker in tickers])
+
+
+def test_mean_covariance_of_a_single_calendar_matches_the_sample_statistics(price_store):
+    tickers = ["AAA", "BBB", "CCC"]
+    mu, sigma = _mean_covariance(input_portfolio=_portfolio(tickers), start_date=START_DATE, end_date=END_DATE)
+    prices = price_store.price_matrix(tickers=tickers, start_date=START_DATE.strftime("%Y-%m-%d"), end_date=END_DATE.strftime("%Y-%m-%d")).to_numpy()
+    returns = prices[1:]/prices[:-1] - 1
+    np.testing.assert_allclose(mu, returns.mean(axis=0))
+    np.testing.assert_allclose(sigma, np.cov(returns, rowvar=False))
+
+
+def test_mean_covariance_of_mixed_calendars_is_finite(price_store):
+    portfolio = _portfolio(["AAA", "BBB", "BTC-USD", "ETH-USD"])
+    mu, sigma = _mean_covariance(input_portfolio=portfolio, start_date=START_DATE, end_date=END_DATE)
+    assert np.isfinite(mu).all() and np.isfinite(sigma).all()
+    np.testing.assert_allclose(sigma, sigma.T)
+    result = heuristic_portfolio_optimization(input_portfolio=portfolio, start_date=START_DATE, end_date=END_DATE, risk_factor=0.5, budget=2, workers=1, seed=0, verbose=False)
+    assert np.isfinite(result.fval)
+    assert result.x.sum() == 2
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from portfolio.portfolio_heuristics import solve_qubo
+from portfolio.portfolio_qubo import all_selections, evaluate_qubo, portfolio_qubo
+
+
+def _statistics(num_assets):
+    rng = np.random.default_rng(11)
+    returns = rng.normal(5e-4, 1e-2, size=(250, num_assets))
+    return returns.mean(axis=0), np.cov(returns, rowvar=False)
+
+
+@pytest.mark.parametrize("sparse_format", [False, True])
+def test_qubo_expansion_matches_the_penalized_objective(sparse_format):
+    mu, sigma = _statistics(num_assets=6)
+    qubo = portfolio_qubo(mu=mu, sigma=sigma, risk_factor=0.5, budget=3, sparse_format=sparse_format)
+    selections = all_selections(num_assets=6)
+    objective = 0.5*np.einsum("ij,jk,ik->i", selections, sigma, selections) - selections @ mu
+    np.testing.assert_allclose(evaluate_qubo(qubo=qubo, selections=selections), objective + qubo.penalty*(selections.sum(axis=1) - 3)**2)
+
+
+def test_qubo_minimum_is_the_best_feasible_selection():
+    mu, sigma = _statistics(num_assets=8)
+    qubo = portfolio_qubo(mu=mu, sigma=sigma, risk_factor=0.5, budget=3)
+    selections = all_selections(num_assets=8)
+    energies = evaluate_qubo(qubo=qubo, selections=selections)
+    feasible = selections.sum(axis=1) == 3
+    objective = 0.5*np.einsum("ij,jk,ik->i", selections, sigma, selections) - selections @ mu
+    best = selections[feasible][np.argmin(objective[feasible])]
+    np.testing.assert_array_equal(selections[np.argmin(energies)], best)
+    for method in ["annealing", "tabu"]:
+        
+        result = solve_qubo(qubo=qubo, budget=3, method=method, seed=0)
+        np.testing.assert_array_equal(result.x, best)
+        assert np.isclose(result.fval, energies.min())
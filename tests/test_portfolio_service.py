@@ -0,0 +1,32 @@
+import asyncio
+import json
+import pytest
+from portfolio.portfolio_service import AnalyticsService
+
+
+@pytest.fixture
+def service(price_store):
+    service = AnalyticsService(price_store=price_store, solver_workers=1)
+    yield service
+    asyncio.run(service.close())
+
+
+def _request(service, path, payload):
+    return asyncio.run(service.handle("POST", path, json.dumps(payload).encode()))
+
+
+def test_optimization_uses_the_service_price_store(service, price_store):
+    payload = {"portfolio": [{"ticker": ticker, "amount": 1} for ticker in ["AAA", "BBB", "BTC-USD", "ETH-USD"]], "start_date": "2024-01-01", "end_date": "2025-01-01", "budget": 2, "method": "annealing", "maxiter": 20}
+    columns_before = len(price_store.panel.columns)
+    status, body = _request(service, "/optimization", payload)
+    assert status == 200
+    assert body["tickers"] == ["AAA", "BBB", "BTC-USD", "ETH-USD"]
+    assert sum(body["selection"]) == 2 and body["value"] is not None
+    assert len(price_store.panel.columns) > columns_before
+
+
+@pytest.mark.parametrize("positions", [["AAA"], [1, 2], [None]])
+def test_positions_that_are_not_objects_are_rejected(service, positions):
+    status, body = _request(service, "/valuation", {"portfolio": positions})
+    assert status == 400
+    assert "object" in body["error"]
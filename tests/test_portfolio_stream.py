@@ -0,0 +1,36 @@
+import numpy as np
+from asset import Asset
+from market_data.streaming import Quote
+from portfolio import Portfolio
+from portfolio.portfolio_stream import LivePortfolioValuation
+
+
+def _portfolio():
+    return Portfolio(assets=[
+        Asset(name="AAA", ticker="AAA", category="stocks", amount=10.0, currency="USD"),
+        Asset(name="BTC", ticker="BTC-USD", category="cryptocurrency", amount=0.5, currency="USD"),
+        Asset(name="EEE", ticker="EEE", category="stocks", amount=4.0, currency="EUR"),
+    ])
+
+
+def test_valuation_starts_from_the_last_closes(price_store):
+    live_valuation = LivePortfolioValuation(portfolio=_portfolio(), fx_rates={"EUR": 1.1})
+    closes = price_store.price_matrix(tickers=["AAA", "BTC-USD", "EEE"], field="Close", time_period="5d").ffill().iloc[-1]
+    assert live_valuation.complete
+    assert np.isclose(live_valuation.valuation, 10*closes["AAA"] + 0.5*closes["BTC-USD"] + 4*1.1*closes["EEE"])
+    assert live_valuation.pnl == 0.0
+
+
+def test_non_finite_quotes_and_rates_are_skipped():
+    live_valuation = LivePortfolioValuation(portfolio=_portfolio(), fx_rates={"EUR": float("nan")}, last_prices={})
+    assert not live_valuation.complete and live_valuation.valuation == 0.0
+    live_valuation.update(Quote(timestamp=1, ticker="AAA", price=100.0))
+    live_valuation.update(Quote(timestamp=2, ticker="AAA", price=float("nan")))
+    live_valuation.update(Quote(timestamp=3, ticker="BTC-USD", price=20000.0))
+    live_valuation.update(Quote(timestamp=4, ticker="EEE", price=50.0))
+    live_valuation.update(Quote(timestamp=5, ticker="AAA", price=101.0))
+    assert live_valuation.ticks_skipped == 1 and live_valuation.last_timestamp == 5
+    assert live_valuation.valuation == 10*101.0 + 0.5*20000.0
+    assert live_valuation.pnl == 10.0
+    # EEE has no exchange rate, so the valuation stays a partial sum.
+    assert not live_valuation.complete
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from market_data.price_store import period_boundary_prices, period_start_positions, returns_for_all_time_periods
+
+
+STOCKS = ["AAA", "BBB"]
+
+
+def _mixed_calendar_matrix() -> pd.DataFrame:
+    """A stock that trades on weekdays and a cryptocurrency that trades every day, from Monday to the next Monday."""
+    index = pd.date_range("2024-01-01", "2024-01-15", freq="D")
+    crypto = np.arange(len(index), dtype=np.float64) + 100
+    stock = np.where(index.dayofweek < 5, np.arange(len(index), dtype=np.float64) + 10, np.nan)
+    return pd.DataFrame({"STOCK": stock, "CRYPTO": crypto}, index=index)
+
+
+def test_row_based_periods_count_each_ticker_own_rows():
+    price_matrix = _mixed_calendar_matrix()
+    first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=["1d", "5d"])
+    # The stock's previous close is the Friday (day 12), not its forward-filled close on Sunday.
+    assert first_prices.loc["1d", "STOCK"] == 10 + 11
+    assert first_prices.loc["1d", "CRYPTO"] == 100 + 13
+    # Five stock closes back from Monday the 15th: Tuesday the 9th to Monday the 15th.
+    assert first_prices.loc["5d", "STOCK"] == 10 + 8
+    assert first_prices.loc["5d", "CRYPTO"] == 100 + 10
+    assert last_prices["STOCK"] == 10 + 14
+    assert last_prices["CRYPTO"] == 100 + 14
+
+
+def test_date_based_periods_start_on_each_ticker_first_price():
+    price_matrix = _mixed_calendar_matrix().loc["2024-01-06":]
+    positions = period_start_positions(price_matrix=price_matrix, time_period="max")
+    # The table starts on a Saturday, the stock on the Monday after it.
+    assert list(positions) == [2, 0]
+
+
+def test_ticker_without_prices_gets_nan():
+    price_matrix = _mixed_calendar_matrix().assign(EMPTY=np.nan)
+    first_prices, last_prices = period_boundary_prices(price_matrix=price_matrix, time_periods=["1d", "1mo"])
+    assert first_prices["EMPTY"].isna().all()
+    assert np.isnan(last_prices["EMPTY"])
+
+
+@pytest.mark.parametrize("time_period", ["1d", "5d", "1mo", "1y", "ytd", "max"])
+def test_returns_do_not_depend_on_other_calendars(price_store, time_period):
+    stocks_only = returns_for_all_time_periods(price_matrix=price_store.price_matrix(tickers=STOCKS, time_period="max"), time_periods=[time_period])
+    mixed = returns_for_all_time_periods(price_matrix=price_store.price_matrix(tickers=STOCKS + ["BTC-USD"], time_period="max"), time_periods=[time_period])
+    pd.testing.assert_frame_equal(mixed[STOCKS], stocks_only[STOCKS])
+
+
+def test_price_matrix_keeps_the_rows_of_every_calendar(price_store):
+    price_matrix = price_store.price_matrix(tickers=STOCKS + ["BTC-USD"], time_period="5d")
+    assert price_matrix["AAA"].notna().sum() >= 5
+    assert price_matrix["BTC-USD"].notna().sum() >= 5
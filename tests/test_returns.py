@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from asset import Asset
+from asset.asset_tools import asset_return_for_all_time_periods
+from market_data.price_store import period_boundary_prices
+from portfolio import Portfolio
+from portfolio.portfolio_tools import _calculate_returns_for_all_time_periods
+
+
+def _assets(tickers):
+    return [Asset(name=ticker, ticker=ticker, category="stocks", amount=float(position + 1), currency="USD") for position, ticker in enumerate(tickers)]
+
+
+def test_asset_returns_do_not_depend_on_other_calendars(price_store):
+    stocks_only = asset_return_for_all_time_periods(assets_list=_assets(["AAA", "BBB"]))
+    mixed = asset_return_for_all_time_periods(assets_list=_assets(["AAA", "BBB", "BTC-USD"]))
+    pd.testing.assert_frame_equal(mixed.iloc[:2].reset_index(drop=True), stocks_only)
+
+
+@pytest.mark.parametrize("time_period", ["1d", "5d", "1mo", "1y"])
+def test_portfolio_returns_use_each_ticker_own_boundaries(price_store, time_period):
+    tickers = ["AAA", "BTC-USD"]
+    portfolio = Portfolio(assets=_assets(tickers))
+    _calculate_returns_for_all_time_periods(portfolio=portfolio)
+    amounts = np.array([1.0, 2.0])
+    first_values, last_values = 0.0, 0.0
+    for ticker, amount in zip(tickers, amounts):
+        
+        # Each ticker alone, so no other calendar can move its boundaries.
+        first_prices, last_prices = period_boundary_prices(price_matrix=price_store.price_matrix(tickers=[ticker], time_period="max"), time_periods=[time_period])
+        first_values += amount*first_prices.iloc[0, 0]
+        last_values += amount*last_prices.iloc[0]
+    expected = np.round((last_values - first_values)/first_values*100, 2)
+    assert portfolio.portfolio_return_dict[time_period] == pytest.approx(expected)
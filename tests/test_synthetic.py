@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from market_data.synthetic import _simulate_log_returns, generate_synthetic_panel, trading_calendar
+
+
+@pytest.mark.parametrize("year, num_days", [(2021, 252), (2022, 251), (2023, 250), (2024, 252)])
+def test_nyse_calendar_has_the_published_number_of_sessions(year, num_days):
+    assert len(trading_calendar(category="stocks", start_date=f"{year}-01-01", end_date=f"{year}-12-31")) == num_days
+
+
+def test_nyse_calendar_holidays():
+    calendar = trading_calendar(category="etf", start_date="2021-12-01", end_date="2023-12-31")
+    # Good Friday, Juneteenth observed on a Monday and Christmas observed on a Monday are closed.
+    for holiday in ["2022-04-15", "2022-06-20", "2022-12-26", "2023-04-07", "2023-06-19"]:
+        
+        assert pd.Timestamp(holiday) not in calendar
+    # New Year's Day on a Saturday is not observed on the Friday before.
+    assert pd.Timestamp("2021-12-31") in calendar
+    assert not calendar.dayofweek.isin([5, 6]).any()
+
+
+def test_calendars_of_the_other_categories():
+    crypto = trading_calendar(category="cryptocurrency", start_date="2023-01-01", end_date="2023-12-31")
+    currency = trading_calendar(category="currency", start_date="2023-01-01", end_date="2023-12-31")
+    assert len(crypto) == 365
+    assert len(currency) == 260 and pd.Timestamp("2023-12-25") in currency
+
+
+def test_gbm_and_garch_log_returns():
+    shocks = np.random.default_rng(0).standard_normal((5, 2))
+    volatility = np.array([0.01, 0.02])
+    np.testing.assert_allclose(_simulate_log_returns(shocks=shocks, volatility=volatility, model="gbm", garch_alpha=0.1, garch_beta=0.8), shocks*volatility)
+    # Without GARCH weights the variance stays at its long-run value.
+    np.testing.assert_allclose(_simulate_log_returns(shocks=shocks, volatility=volatility, model="garch", garch_alpha=0.0, garch_beta=0.0), shocks*volatility)
+    log_returns = _simulate_log_returns(shocks=shocks, volatility=volatility, model="garch", garch_alpha=0.1, garch_beta=0.8)
+    variance = volatility**2
+    for day in range(len(shocks)):
+        
+        np.testing.assert_allclose(log_returns[day], np.sqrt(variance)*shocks[day])
+        variance = volatility**2*0.1 + 0.1*log_returns[day]**2 + 0.8*variance
+
+
+@pytest.mark.parametrize("model", ["gbm", "garch"])
+def test_panel_is_deterministic_and_consistent(model):
+    categories = {"BTC-USD": "cryptocurrency"}
+    panel = generate_synthetic_panel(tickers=["AAA", "BTC-USD"], start_date="2023-01-01", end_date="2023-12-31", categories=categories, model=model, seed=3)
+    alone = generate_synthetic_panel(tickers=["AAA"], start_date="2023-01-01", end_date="2023-12-31", model=model, seed=3)
+    # A ticker's series only depends on the seed and on its ticker.
+    pd.testing.assert_series_equal(panel["Close"]["AAA"].dropna(), alone["Close"]["AAA"].dropna())
+    assert panel["Close"]["AAA"].notna().sum() == 250 and panel["Close"]["BTC-USD"].notna().sum() == 365
+    for ticker in ["AAA", "BTC-USD"]:
+        
+        bars = panel.xs(ticker, axis=1, level=1).dropna()
+        assert (bars["High"] >= bars[["Open", "Close"]].max(axis=1)).all()
+        assert (bars["Low"] <= bars[["Open", "Close"]].min(axis=1)).all()
+        assert (bars["Low"] > 0).all() and (bars["Volume"] > 0).all()
+    with pytest.raises(ValueError):
+        
+        generate_synthetic_panel(tickers=["AAA"], start_date="2023-01-01", end_date="2023-12-31", model="heston")
@@ -1,4 +1,36 @@
 """_summary_
 """
-from .files import store_data, load_data_from_csv
-from .plot_tools import plot_assets_close_price_custom_date, plot_assets_close_price_time_period, plot_assets_liquidity, plot_assets_matrix_correlation, plot_assets_pie_chart, plot_assets_category_pie_chart
\ No newline at end of file
+from .lazy_imports import LazyModule, lazy_package_attribute, lazy_package_dir
+
+_LAZY_ATTRIBUTES = {
+    "decimate": ".decimation",
+    "store_data": ".files",
+    "load_data_from_csv": ".files",
+    "load_data": ".files",
+    "append_partitioned_data": ".files",
+    "iter_data_chunks": ".files",
+    "price_panel_to_table": ".files",
+    "plot_assets_close_price_custom_date": ".plot_tools",
+    "plot_assets_close_price_time_period": ".plot_tools",
+    "plot_assets_liquidity": ".plot_tools",
+    "plot_assets_matrix_correlation": ".plot_tools",
+    "plot_assets_pie_chart": ".plot_tools",
+    "plot_assets_category_pie_chart": ".plot_tools",
+    "plot_portfolio_value": ".plot_tools",
+    "plot_dashboard": ".plot_tools",
+    "set_figure_settings": ".plot_tools",
+    "Profiler": ".instrumentation",
+    "enable_instrumentation": ".instrumentation",
+    "export_metrics": ".instrumentation",
+    "metrics_snapshot": ".instrumentation",
+    "reset_metrics": ".instrumentation",
+    "write_portfolio_report": ".report_tools",
+    "generate_batch_reports": ".report_tools",
+}
+
+
+def __getattr__(name):
+    return lazy_package_attribute(package_name=__name__, package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES, name=name)
+
+def __dir__():
+    return lazy_package_dir(package_globals=globals(), lazy_attributes=_LAZY_ATTRIBUTES)
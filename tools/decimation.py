@@ -0,0 +1,111 @@
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, Series
+from typing import Union
+
+
+VALIDS_DECIMATION_METHODS = ["minmax", "lttb"]
+
+
+def minmax_indices(y: np.ndarray, target_points: int) -> np.ndarray:
+    """Selects the minimum and the maximum of equal-size buckets of a series.
+
+    Args:
+        y (np.ndarray): The values of the series without NaN.
+        target_points (int): The maximum number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted positions of the points to keep, first and last points included.
+    """
+    num_points = len(y)
+    if num_points <= target_points or target_points < 4:
+        
+        return np.arange(num_points)
+    num_buckets = (target_points - 2)//2
+    bucket_size = int(np.ceil((num_points - 2)/num_buckets))
+    inner = y[1:-1]
+    padding = num_buckets*bucket_size - len(inner)
+    low = np.concatenate([inner, np.full(padding, np.inf)]).reshape(num_buckets, bucket_size)
+    high = np.concatenate([inner, np.full(padding, -np.inf)]).reshape(num_buckets, bucket_size)
+    offsets = np.arange(num_buckets)*bucket_size + 1
+    argmin = low.argmin(axis=1) + offsets
+    argmax = high.argmax(axis=1) + offsets
+    indices = np.concatenate([[0], argmin, argmax, [num_points - 1]])
+    indices = indices[indices < num_points]
+    return np.unique(indices)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, target_points: int) -> np.ndarray:
+    """Selects the points of a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (np.ndarray): The x values of the series, increasing and without NaN.
+        y (np.ndarray): The y values of the series without NaN.
+        target_points (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted positions of the points to keep, first and last points included.
+    """
+    num_points = len(y)
+    if num_points <= target_points or target_points < 3:
+        
+        return np.arange(num_points)
+    edges = np.linspace(1, num_points - 1, target_points - 1).astype(np.int64)
+    indices = np.empty(target_points, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = num_points - 1
+    previous = 0
+    for bucket in range(target_points - 2):
+        
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else num_points
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        areas = np.abs((x[previous] - next_x)*(y[start:end] - y[previous]) - (x[previous] - x[start:end])*(next_y - y[previous]))
+        previous = start + int(areas.argmax())
+        indices[bucket + 1] = previous
+    return indices
+
+def decimate(data: Union[DataFrame, Series], target_points: int, method: str = "minmax") -> Union[DataFrame, Series]:
+    """Reduces every series of a table to about target_points points while keeping its visual extremes.
+
+    The rows kept are the union of the rows selected for each column, so the
+    result can still be plotted with a shared index.
+
+    Args:
+        data (Union[DataFrame, Series]): A table with dates as rows and one series per column.
+        target_points (int): The number of points to keep for each series.
+        method (str, optional): The decimation method (minmax or lttb). Defaults to "minmax".
+
+    Raises:
+        ValueError: If the method is not valid.
+        TypeError: If the inputs are not a DataFrame or a Series and an int.
+
+    Returns:
+        Union[DataFrame, Series]: The decimated table.
+    """
+    if isinstance(data, (DataFrame, Series)) and isinstance(target_points, int):
+        
+        if method not in VALIDS_DECIMATION_METHODS:
+            
+            raise ValueError(f"Invalid method! The valids decimation methods are {VALIDS_DECIMATION_METHODS}.")
+        if len(data) <= target_points:
+            
+            return data
+        frame = data.to_frame() if isinstance(data, Series) else data
+        x = frame.index.asi8.astype(np.float64) if isinstance(frame.index, DatetimeIndex) else np.arange(len(frame), dtype=np.float64)
+        values = frame.to_numpy(dtype=np.float64)
+        keep = np.zeros(len(frame), dtype=bool)
+        for column in range(values.shape[1]):
+            
+            valid_positions = np.flatnonzero(~np.isnan(values[:, column]))
+            y = values[valid_positions, column]
+            if method == "minmax":
+                
+                selected = minmax_indices(y=y, target_points=target_points)
+            else:
+                
+                selected = lttb_indices(x=x[valid_positions], y=y, target_points=target_points)
+            keep[valid_positions[selected]] = True
+        return data.iloc[np.flatnonzero(keep)]
+    else:
+        
+        raise TypeError("Invalid types! This function expects a DataFrame or a Series and an int.")
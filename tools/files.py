@@ -1,7 +1,20 @@
+import os
 import pandas as pd
+import uuid
 from pandas import DataFrame
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
+from urllib.parse import quote
+
+
+VALIDS_FILE_FORMATS = {
+    "csv": "csv",
+    "parquet": "parquet",
+    "feather": "feather",
+    "hdf5": "h5",
+}
+VALIDS_DATE_PARTITIONS = ["year", "month"]
+INDEX_DATE_COLUMNS = ["__index_level_0__", "index"]
 
 
 def load_data_from_csv(file_path: str) -> DataFrame:
@@ -24,16 +37,21 @@ def load_data_from_csv(file_path: str) -> DataFrame:
         
         raise TypeError("Invalid type! The file_path must be a str.")
 
-def store_data(data: DataFrame, file_name: Optional[str] = None) -> None:
-    """Stores data obtained in the Yahoo Finance API in a .csv file.
+def store_data(data: DataFrame, file_name: Optional[str] = None, file_format: str = "csv") -> None:
+    """Stores data obtained in the Yahoo Finance API in a .csv, .parquet, .feather or .h5 file.
 
     Args:
         data (DataFrame): The DataFrame with the data we want to store.
         file_name (Optional[str], optional): The name that we want to give for the file. Defaults to None.
+        file_format (str, optional): The file format (csv, parquet, feather or hdf5). Defaults to "csv".
 
     Raises:
+        ValueError: If the file format is not valid.
         TypeError: If file_name is not a str.
     """
+    if file_format not in VALIDS_FILE_FORMATS:
+        
+        raise ValueError(f"Invalid file format! The valids file formats are {list(VALIDS_FILE_FORMATS.keys())}.")
     if file_name is None:
         
         datetime_str_list = str(datetime.now()).split(" ")
@@ -41,10 +59,465 @@ def store_data(data: DataFrame, file_name: Optional[str] = None) -> None:
         year = date[0]
         month = date[1]
         day = date[2]
-        data.to_csv(f"csv_files/asset_data_{year}_{month}_{day}.csv")
-    elif isinstance(file_name, str):
+        file_name = f"asset_data_{year}_{month}_{day}"
+    elif not isinstance(file_name, str):
+        
+        raise TypeError("Invalid type! The file_name must be a str.")
+    os.makedirs("csv_files" if file_format == "csv" else "data_files", exist_ok=True)
+    if file_format == "csv":
         
         data.to_csv(f"csv_files/{file_name}.csv")
+    elif file_format == "parquet":
+        
+        data.to_parquet(f"data_files/{file_name}.parquet")
+    elif file_format == "feather":
+        
+        data.reset_index().to_feather(f"data_files/{file_name}.feather")
+    else:
+        
+        data.to_hdf(f"data_files/{file_name}.h5", key="data", format="table", data_columns=True)
+
+def price_panel_to_table(panel: DataFrame) -> DataFrame:
+    """Converts a price panel with a (field, ticker) column index to a long table.
+
+    Args:
+        panel (DataFrame): A table with a (field, ticker) column index and a DatetimeIndex.
+
+    Returns:
+        DataFrame: A table with the Date and Ticker columns followed by one column per price field.
+    """
+    table = panel.stack(level=1).reset_index()
+    table.columns = ["Date", "Ticker"] + list(table.columns[2:])
+    table["Date"] = pd.to_datetime(table["Date"])
+    table.columns.name = None
+    return table
+
+def append_partitioned_data(data: DataFrame, root_path: str, date_partition: str = "year", file_format: str = "parquet") -> List[str]:
+    """Appends a long price table to a dataset partitioned by ticker and date.
+
+    The files already stored are never rewritten: each call adds new part files
+    under root_path/Ticker=<ticker>/<date_partition>=<value>/.
+
+    Args:
+        data (DataFrame): A table with at least the Date and Ticker columns.
+        root_path (str): The folder of the dataset.
+        date_partition (str, optional): The date partition (year or month). Defaults to "year".
+        file_format (str, optional): The file format of the parts (parquet or feather). Defaults to "parquet".
+
+    Raises:
+        ValueError: If the date partition or the file format is not valid.
+        ValueError: If the table does not have the Date and Ticker columns.
+        TypeError: If the inputs are not a DataFrame and a str.
+
+    Returns:
+        List[str]: The paths of the new part files.
+    """
+    if isinstance(data, DataFrame) and isinstance(root_path, str):
+        
+        if date_partition not in VALIDS_DATE_PARTITIONS:
+            
+            raise ValueError(f"Invalid date partition! The valids date partitions are {VALIDS_DATE_PARTITIONS}.")
+        if file_format not in ["parquet", "feather"]:
+            
+            raise ValueError("Invalid file format! The partitioned datasets support the parquet and feather formats.")
+        if "Date" not in data.columns or "Ticker" not in data.columns:
+            
+            raise ValueError("The table must have the Date and Ticker columns.")
+        data = data.copy()
+        data["Date"] = pd.to_datetime(data["Date"])
+        if date_partition == "year":
+            
+            data[date_partition] = data["Date"].dt.year
+        else:
+            
+            data[date_partition] = data["Date"].dt.year*100 + data["Date"].dt.month
+        part_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.{VALIDS_FILE_FORMATS[file_format]}"
+        paths = []
+        for (ticker, partition_value), part in data.groupby(["Ticker", date_partition], sort=False):
+            
+            folder = os.path.join(root_path, f"Ticker={quote(str(ticker), safe='')}", f"{date_partition}={partition_value}")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, part_name)
+            part = part.drop(columns=["Ticker", date_partition]).sort_values("Date").reset_index(drop=True)
+            if file_format == "parquet":
+                
+                part.to_parquet(path, index=False)
+            else:
+                
+                part.to_feather(path)
+            paths.append(path)
+        return paths
+    else:
+        
+        raise TypeError("Invalid types! This function expects a DataFrame and a str.")
+
+def _dataset_filter(dataset_schema_names: List[str], tickers: Optional[List[str]], start_date: Optional[str], end_date: Optional[str], date_field: Optional[str] = "Date"):
+    """Builds the pyarrow filter expression of a partitioned dataset.
+
+    Args:
+        dataset_schema_names (List[str]): The columns of the dataset, partition keys included.
+        tickers (Optional[List[str]]): The tickers that we want to load.
+        start_date (Optional[str]): The start date (format:yyyy-mm-dd).
+        end_date (Optional[str]): The end date (format:yyyy-mm-dd), included.
+        date_field (Optional[str], optional): The column of the dates, or None if the dataset has no dates. Defaults to "Date".
+
+    Returns:
+        Optional[pyarrow.dataset.Expression]: The filter, or None if there is nothing to filter.
+    """
+    import pyarrow.dataset as ds
+
+    expression = None
+    conditions = []
+    if tickers is not None and "Ticker" in dataset_schema_names:
+        
+        conditions.append(ds.field("Ticker").isin(tickers))
+    if start_date is not None and date_field is not None:
+        
+        start = pd.Timestamp(start_date)
+        conditions.append(ds.field(date_field) >= start.to_pydatetime())
+        if "year" in dataset_schema_names:
+            
+            conditions.append(ds.field("year") >= start.year)
+        elif "month" in dataset_schema_names:
+            
+            conditions.append(ds.field("month") >= start.year*100 + start.month)
+    if end_date is not None and date_field is not None:
+        
+        end = pd.Timestamp(end_date)
+        conditions.append(ds.field(date_field) <= end.to_pydatetime())
+        if "year" in dataset_schema_names:
+            
+            conditions.append(ds.field("year") <= end.year)
+        elif "month" in dataset_schema_names:
+            
+            conditions.append(ds.field("month") <= end.year*100 + end.month)
+    for condition in conditions:
+        
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def _open_dataset(path: str, file_format: str):
+    """Opens a file or a partitioned folder as a pyarrow dataset.
+
+    Args:
+        path (str): The path to the file or to the folder of the dataset.
+        file_format (str): The file format (parquet or feather).
+
+    Returns:
+        pyarrow.dataset.Dataset: The dataset.
+    """
+    import pyarrow.dataset as ds
+
+    pyarrow_format = "ipc" if file_format == "feather" else file_format
+    if os.path.isdir(path):
+        
+        return ds.dataset(path, format=pyarrow_format, partitioning="hive")
+    else:
+        
+        return ds.dataset(path, format=pyarrow_format)
+
+def load_data(path: str, columns: Optional[List[str]] = None, tickers: Optional[List[str]] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, file_format: Optional[str] = None) -> DataFrame:
+    """Loads only the requested columns and rows of a stored file or partitioned dataset.
+
+    The parquet and feather datasets only read the partitions and the columns
+    that are needed, and .h5 files are queried with a where clause.
+
+    Args:
+        path (str): The path to the file or to the folder of a partitioned dataset.
+        columns (Optional[List[str]], optional): The columns that we want to load. Defaults to None (all columns).
+        tickers (Optional[List[str]], optional): The tickers that we want to load. Defaults to None (all tickers).
+        start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+        end_date (Optional[str], optional): The end date (format:yyyy-mm-dd), included. Defaults to None.
+        file_format (Optional[str], optional): The file format. Defaults to None (inferred from the path).
+
+    Raises:
+        ValueError: If the file format is not valid.
+        TypeError: If path is not a str.
+
+    Returns:
+        DataFrame: A table with the loaded data.
+    """
+    if isinstance(path, str):
+        
+        if file_format is None:
+            
+            file_format = _infer_file_format(path=path)
+        if file_format == "csv":
+            
+            header = list(pd.read_csv(path, nrows=0).columns)
+            read_columns = _read_columns(columns=columns, available_columns=header, tickers=tickers, start_date=start_date, end_date=end_date)
+            data_pd = pd.read_csv(path, usecols=read_columns, parse_dates=_csv_date_columns(header=header, columns=read_columns))
+            data_pd = _filter_rows(data=data_pd, tickers=tickers, start_date=start_date, end_date=end_date)
+        elif file_format == "hdf5":
+            
+            where, date_field = _hdf_where(path=path, tickers=tickers, start_date=start_date, end_date=end_date)
+            data_pd = pd.read_hdf(path, key="data", columns=_hdf_columns(columns=columns, date_field=date_field), where=where)
+        elif file_format in ["parquet", "feather"]:
+            
+            dataset = _open_dataset(path=path, file_format=file_format)
+            date_field = _dataset_date_field(schema=dataset.schema)
+            expression = _dataset_filter(dataset_schema_names=dataset.schema.names, tickers=tickers, start_date=start_date, end_date=end_date, date_field=date_field)
+            data_pd = dataset.to_table(columns=_dataset_columns(dataset_schema_names=dataset.schema.names, columns=columns, date_field=date_field), filter=expression).to_pandas()
+        else:
+            
+            raise ValueError(f"Invalid file format! The valids file formats are {list(VALIDS_FILE_FORMATS.keys())}.")
+        data_pd = _date_as_column(data=data_pd)
+        return data_pd if columns is None else data_pd[columns]
+    else:
+        
+        raise TypeError("Invalid type! The path must be a str.")
+
+def iter_data_chunks(path: str, chunk_size: int = 100000, columns: Optional[List[str]] = None, tickers: Optional[List[str]] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, file_format: Optional[str] = None) -> Iterator[DataFrame]:
+    """Iterates over a stored file or partitioned dataset in chunks, so files larger than memory can be processed.
+
+    Args:
+        path (str): The path to the file or to the folder of a partitioned dataset.
+        chunk_size (int, optional): The maximum number of rows of each chunk. Defaults to 100000.
+        columns (Optional[List[str]], optional): The columns that we want to load. Defaults to None (all columns).
+        tickers (Optional[List[str]], optional): The tickers that we want to load. Defaults to None (all tickers).
+        start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+        end_date (Optional[str], optional): The end date (format:yyyy-mm-dd), included. Defaults to None.
+        file_format (Optional[str], optional): The file format. Defaults to None (inferred from the path).
+
+    Raises:
+        ValueError: If the file format is not valid.
+        TypeError: If the inputs are not a str and an int.
+
+    Yields:
+        DataFrame: The next chunk of the data.
+    """
+    if isinstance(path, str) and isinstance(chunk_size, int):
+        
+        if file_format is None:
+            
+            file_format = _infer_file_format(path=path)
+        if file_format == "csv":
+            
+            header = list(pd.read_csv(path, nrows=0).columns)
+            read_columns = _read_columns(columns=columns, available_columns=header, tickers=tickers, start_date=start_date, end_date=end_date)
+            for chunk in pd.read_csv(path, usecols=read_columns, chunksize=chunk_size, parse_dates=_csv_date_columns(header=header, columns=read_columns)):
+                
+                chunk = _filter_rows(data=chunk, tickers=tickers, start_date=start_date, end_date=end_date)
+                yield chunk if columns is None else chunk[columns]
+        elif file_format == "hdf5":
+            
+            where, date_field = _hdf_where(path=path, tickers=tickers, start_date=start_date, end_date=end_date)
+            for chunk in pd.read_hdf(path, key="data", columns=_hdf_columns(columns=columns, date_field=date_field), where=where, chunksize=chunk_size):
+                
+                chunk = _date_as_column(data=chunk)
+                yield chunk if columns is None else chunk[columns]
+        elif file_format in ["parquet", "feather"]:
+            
+            dataset = _open_dataset(path=path, file_format=file_format)
+            date_field = _dataset_date_field(schema=dataset.schema)
+            expression = _dataset_filter(dataset_schema_names=dataset.schema.names, tickers=tickers, start_date=start_date, end_date=end_date, date_field=date_field)
+            for batch in dataset.to_batches(columns=_dataset_columns(dataset_schema_names=dataset.schema.names, columns=columns, date_field=date_field), filter=expression, batch_size=chunk_size):
+                
+                if batch.num_rows != 0:
+                    
+                    chunk = _date_as_column(data=batch.to_pandas())
+                    yield chunk if columns is None else chunk[columns]
+        else:
+            
+            raise ValueError(f"Invalid file format! The valids file formats are {list(VALIDS_FILE_FORMATS.keys())}.")
     else:
         
-        raise TypeError("Invalid type! The file_name must be a str.")
\ No newline at end of file
+        raise TypeError("Invalid types! This function expects a str and an int.")
+
+def _infer_file_format(path: str) -> str:
+    """Infers the file format from the path.
+
+    Args:
+        path (str): The path to the file or to the folder of a partitioned dataset.
+
+    Returns:
+        str: The file format. Folders are read as parquet datasets unless they only have .feather parts.
+    """
+    if os.path.isdir(path):
+        
+        for _, _, files_names in os.walk(path):
+            
+            for file_name in files_names:
+                
+                return "feather" if file_name.endswith(".feather") else "parquet"
+        return "parquet"
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    for file_format, file_extension in VALIDS_FILE_FORMATS.items():
+        
+        if extension == file_extension:
+            
+            return file_format
+    return extension
+
+def _csv_date_columns(header: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """Lists the date columns of a .csv file that must be parsed, from its header.
+
+    Args:
+        header (List[str]): The columns of the file.
+        columns (Optional[List[str]]): The columns that are read.
+
+    Returns:
+        Optional[List[str]]: ["Date"] if the file has a Date column that is loaded, else None.
+    """
+    return ["Date"] if "Date" in header and (columns is None or "Date" in columns) else None
+
+def _filter_rows(data: DataFrame, tickers: Optional[List[str]], start_date: Optional[str], end_date: Optional[str]) -> DataFrame:
+    """Keeps the rows of a table that match the tickers and the date range.
+
+    Args:
+        data (DataFrame): A table with the Date and Ticker columns.
+        tickers (Optional[List[str]]): The tickers that we want to keep.
+        start_date (Optional[str]): The start date (format:yyyy-mm-dd).
+        end_date (Optional[str]): The end date (format:yyyy-mm-dd), included.
+
+    Returns:
+        DataFrame: The filtered table.
+    """
+    if tickers is not None and "Ticker" in data.columns:
+        
+        data = data[data["Ticker"].isin(tickers)]
+    if start_date is not None and "Date" in data.columns:
+        
+        data = data[pd.to_datetime(data["Date"]) >= pd.Timestamp(start_date)]
+    if end_date is not None and "Date" in data.columns:
+        
+        data = data[pd.to_datetime(data["Date"]) <= pd.Timestamp(end_date)]
+    return data
+
+def _read_columns(columns: Optional[List[str]], available_columns: List[str], tickers: Optional[List[str]], start_date: Optional[str], end_date: Optional[str]) -> Optional[List[str]]:
+    """Adds the Ticker and Date columns that the row filters need to the columns that are read.
+
+    Args:
+        columns (Optional[List[str]]): The columns that we want to load.
+        available_columns (List[str]): The columns of the file.
+        tickers (Optional[List[str]]): The tickers that we want to keep.
+        start_date (Optional[str]): The start date (format:yyyy-mm-dd).
+        end_date (Optional[str]): The end date (format:yyyy-mm-dd), included.
+
+    Returns:
+        Optional[List[str]]: The columns to read, or None to read all of them.
+    """
+    if columns is None:
+        
+        return None
+    predicate_columns = []
+    if tickers is not None:
+        
+        predicate_columns.append("Ticker")
+    if start_date is not None or end_date is not None:
+        
+        predicate_columns.append("Date")
+    return list(columns) + [name for name in predicate_columns if name in available_columns and name not in columns]
+
+def _hdf_where(path: str, tickers: Optional[List[str]], start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[str], str]:
+    """Builds the where clause of a .h5 table.
+
+    The dates are queried through the Date data column, or through the index when
+    the table was stored with its dates as the index.
+
+    Args:
+        path (str): The path to the file.
+        tickers (Optional[List[str]]): The tickers that we want to load.
+        start_date (Optional[str]): The start date (format:yyyy-mm-dd).
+        end_date (Optional[str]): The end date (format:yyyy-mm-dd), included.
+
+    Returns:
+        Tuple[Optional[str], str]: The where clause (None if there is nothing to filter) and the name of the date field.
+    """
+    with pd.HDFStore(path, mode="r") as store:
+        
+        date_field = "Date" if "Date" in (store.get_storer("data").data_columns or []) else "index"
+    where = []
+    if tickers is not None:
+        
+        where.append(f"Ticker in {list(tickers)}")
+    if start_date is not None:
+        
+        where.append(f"{date_field} >= '{start_date}'")
+    if end_date is not None:
+        
+        where.append(f"{date_field} <= '{end_date}'")
+    return (" & ".join(where) if len(where) != 0 else None, date_field)
+
+def _hdf_columns(columns: Optional[List[str]], date_field: str) -> Optional[List[str]]:
+    """Lists the columns to read from a .h5 table, leaving out the dates when they are the index.
+
+    Args:
+        columns (Optional[List[str]]): The columns that we want to load.
+        date_field (str): The name of the date field (Date or index).
+
+    Returns:
+        Optional[List[str]]: The columns to read, or None to read all of them.
+    """
+    if columns is None or date_field == "Date":
+        
+        return columns
+    return [name for name in columns if name != "Date"]
+
+def _dataset_date_field(schema) -> Optional[str]:
+    """Finds the column of the dates of a pyarrow dataset.
+
+    The dates are in the Date column, or in the __index_level_0__ (parquet) or
+    index (feather) column when the table was stored with an unnamed date index.
+
+    Args:
+        schema (pyarrow.Schema): The schema of the dataset.
+
+    Returns:
+        Optional[str]: The name of the date column, or None if the dataset has no dates.
+    """
+    import pyarrow as pa
+
+    if "Date" in schema.names:
+        
+        return "Date"
+    for name in INDEX_DATE_COLUMNS:
+        
+        if name in schema.names and (pa.types.is_timestamp(schema.field(name).type) or pa.types.is_date(schema.field(name).type)):
+            
+            return name
+    return None
+
+def _dataset_columns(dataset_schema_names: List[str], columns: Optional[List[str]], date_field: Optional[str]) -> List[str]:
+    """Lists the columns to read from a pyarrow dataset, reading the Date column from where it is stored.
+
+    Args:
+        dataset_schema_names (List[str]): The columns of the dataset, partition keys included.
+        columns (Optional[List[str]]): The columns that we want to load.
+        date_field (Optional[str]): The name of the date column.
+
+    Returns:
+        List[str]: The columns to read.
+    """
+    if columns is None:
+        
+        return [name for name in dataset_schema_names if name not in VALIDS_DATE_PARTITIONS]
+    return [date_field if name == "Date" and date_field is not None else name for name in columns]
+
+def _date_as_column(data: DataFrame) -> DataFrame:
+    """Moves the dates of a loaded table to a Date column, so every file format gives back the same shape.
+
+    Parquet and .h5 files give back a stored index as the index, and feather files
+    give back an unnamed index as an index column.
+
+    Args:
+        data (DataFrame): The loaded table.
+
+    Returns:
+        DataFrame: The table with a default index and its dates in the Date column.
+    """
+    if isinstance(data.index, pd.DatetimeIndex) or data.index.names != [None]:
+        
+        if isinstance(data.index, pd.DatetimeIndex) and data.index.name is None:
+            
+            data = data.rename_axis("Date")
+        data = data.reset_index()
+    if "Date" not in data.columns:
+        
+        for name in INDEX_DATE_COLUMNS:
+            
+            if name in data.columns and pd.api.types.is_datetime64_any_dtype(data[name]):
+                
+                data = data.rename(columns={name: "Date"})
+                break
+    return data
@@ -0,0 +1,218 @@
+import json
+import re
+import time
+from typing import Dict, Optional
+
+
+class _Metrics:
+    """Metrics registry class
+
+    Keeps the timers (count, total and maximum seconds) and the counters of
+    the instrumented hot paths. Nothing is recorded while it is disabled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.timers: Dict[str, list] = {}
+        self.counters: Dict[str, float] = {}
+
+    def add_duration(self, name: str, seconds: float) -> None:
+        """Adds the duration of one call to a timer.
+
+        Args:
+            name (str): The timer name.
+            seconds (float): The duration in seconds.
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+
+class _Timer:
+    """Timer class"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _metrics.add_duration(name=self.name, seconds=time.perf_counter() - self.start)
+
+
+class _DisabledTimer:
+    """Disabled timer class, shared by every call while the instrumentation is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_DisabledTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_metrics = _Metrics()
+_DISABLED_TIMER = _DisabledTimer()
+
+
+def enable_instrumentation(enabled: bool = True) -> None:
+    """Turns the recording of the metrics on or off.
+
+    Args:
+        enabled (bool, optional): If the metrics must be recorded. Defaults to True.
+    """
+    _metrics.enabled = bool(enabled)
+
+def instrumentation_enabled() -> bool:
+    """Checks if the metrics are being recorded.
+
+    Returns:
+        bool: True if the metrics are being recorded.
+    """
+    return _metrics.enabled
+
+def timed(name: str):
+    """Times a block of code. For instance: with timed("price_store.fetch"): ...
+
+    Args:
+        name (str): The timer name.
+
+    Returns:
+        A context manager that adds the duration of the block to the timer.
+    """
+    if _metrics.enabled:
+        
+        return _Timer(name)
+    return _DISABLED_TIMER
+
+def increment(name: str, value: float = 1) -> None:
+    """Adds a value to a counter.
+
+    Args:
+        name (str): The counter name.
+        value (float, optional): The value to add. Defaults to 1.
+    """
+    if _metrics.enabled:
+        
+        _metrics.counters[name] = _metrics.counters.get(name, 0) + value
+
+def reset_metrics() -> None:
+    """Clears every timer and counter."""
+    _metrics.timers.clear()
+    _metrics.counters.clear()
+
+def metrics_snapshot() -> dict:
+    """Copies the current timers and counters.
+
+    Returns:
+        dict: The timers (calls, total_seconds and max_seconds by name) and the counters.
+    """
+    timers = {name: {"calls": timer[0], "total_seconds": timer[1], "max_seconds": timer[2]} for name, timer in sorted(_metrics.timers.items())}
+    counters = dict(sorted(_metrics.counters.items()))
+    return {"timers": timers, "counters": counters}
+
+def _prometheus_name(name: str) -> str:
+    """Converts a metric name to a valid Prometheus metric name.
+
+    Args:
+        name (str): The metric name. For instance: price_store.fetch
+
+    Returns:
+        str: The Prometheus name. For instance: portfolio_price_store_fetch
+    """
+    return "portfolio_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+def export_metrics(export_format: str = "json", snapshot: Optional[dict] = None) -> str:
+    """Exports a snapshot of the metrics as JSON or as the Prometheus text format.
+
+    Args:
+        export_format (str, optional): The export format (json or prometheus). Defaults to "json".
+        snapshot (Optional[dict], optional): A snapshot of the metrics. Defaults to None (current metrics).
+
+    Raises:
+        ValueError: If the export format is not valid.
+
+    Returns:
+        str: The exported metrics.
+    """
+    if snapshot is None:
+        
+        snapshot = metrics_snapshot()
+    if export_format == "json":
+        
+        return json.dumps(snapshot, indent=2)
+    elif export_format == "prometheus":
+        
+        lines = []
+        for name, timer in snapshot["timers"].items():
+            
+            metric = _prometheus_name(name=name)
+            lines.append(f"# TYPE {metric}_seconds summary")
+            lines.append(f"{metric}_seconds_count {timer['calls']}")
+            lines.append(f"{metric}_seconds_sum {timer['total_seconds']:.9f}")
+            lines.append(f"# TYPE {metric}_seconds_max gauge")
+            lines.append(f"{metric}_seconds_max {timer['max_seconds']:.9f}")
+        for name, value in snapshot["counters"].items():
+            
+            metric = _prometheus_name(name=name)
+            lines.append(f"# TYPE {metric}_total counter")
+            lines.append(f"{metric}_total {value}")
+        return "\n".join(lines) + "\n"
+    else:
+        
+        raise ValueError("Invalid export format! The valids export formats are ['json', 'prometheus'].")
+
+
+class Profiler:
+    """Profiler class
+
+    Records the metrics of the hot paths called inside a with block. For instance:
+
+        with Profiler() as profiler:
+            show_portfolio_returns_for_all_time_periods(portfolio=portfolio)
+        print(profiler.export("prometheus"))
+    """
+
+    def __init__(self, reset: bool = True) -> None:
+        """
+        Args:
+            reset (bool, optional): If the metrics recorded before the block must be cleared. Defaults to True.
+        """
+        self.reset = reset
+        self.snapshot: Optional[dict] = None
+        self._was_enabled = False
+
+    def __enter__(self) -> "Profiler":
+        self._was_enabled = _metrics.enabled
+        if self.reset:
+            
+            reset_metrics()
+        enable_instrumentation(enabled=True)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.snapshot = metrics_snapshot()
+        enable_instrumentation(enabled=self._was_enabled)
+
+    def export(self, export_format: str = "json") -> str:
+        """Exports the metrics recorded by the block.
+
+        Args:
+            export_format (str, optional): The export format (json or prometheus). Defaults to "json".
+
+        Returns:
+            str: The exported metrics.
+        """
+        return export_metrics(export_format=export_format, snapshot=self.snapshot)
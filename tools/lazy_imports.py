@@ -0,0 +1,69 @@
+import importlib
+from types import ModuleType
+from typing import Any, Dict, List
+
+
+class LazyModule(ModuleType):
+    """Lazy module class
+
+    Stands for a module that is only imported when one of its attributes is
+    used for the first time, so heavy optional backends do not slow down the
+    import of the packages.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Args:
+            name (str): The full name of the module. For instance: qiskit.algorithms
+        """
+        super().__init__(name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        """Imports the module (only once, the import system caches it) and returns one of its attributes.
+
+        Args:
+            attribute (str): The attribute name.
+
+        Returns:
+            Any: The attribute of the imported module.
+        """
+        module = importlib.import_module(self.__name__)
+        return getattr(module, attribute)
+
+
+def lazy_package_attribute(package_name: str, package_globals: Dict[str, Any], lazy_attributes: Dict[str, str], name: str) -> Any:
+    """Resolves an attribute of a package from the submodule that defines it, importing the submodule on first use.
+
+    It is meant to be called from the module level __getattr__ of a package __init__.
+
+    Args:
+        package_name (str): The name of the package.
+        package_globals (Dict[str, Any]): The globals of the package, where the attribute is cached.
+        lazy_attributes (Dict[str, str]): The relative name of the submodule of each lazy attribute.
+        name (str): The attribute name.
+
+    Raises:
+        AttributeError: If the attribute is not a lazy attribute of the package.
+
+    Returns:
+        Any: The attribute.
+    """
+    if name in lazy_attributes:
+        
+        value = getattr(importlib.import_module(lazy_attributes[name], package_name), name)
+        package_globals[name] = value
+        return value
+    raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+
+def lazy_package_dir(package_globals: Dict[str, Any], lazy_attributes: Dict[str, str]) -> List[str]:
+    """Lists the attributes of a package, the lazy ones included.
+
+    Args:
+        package_globals (Dict[str, Any]): The globals of the package.
+        lazy_attributes (Dict[str, str]): The relative name of the submodule of each lazy attribute.
+
+    Returns:
+        List[str]: The sorted attribute names.
+    """
+    return sorted(set(package_globals) | set(lazy_attributes))
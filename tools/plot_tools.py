@@ -1,15 +1,145 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import pandas as pd
 import re
 import seaborn as sns
-import yfinance as yf
 from asset import Asset
+from asset.asset_liquidity import assets_liquidity, liquidity_columns
 from datetime import date, timedelta, datetime
+from market_data import get_price_store
+from market_data.price_store import period_start_positions
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from pandas import DataFrame, Series
 from portfolio import Portfolio
-from typing import Optional, List
+from portfolio.portfolio_exposure import portfolio_exposure
+from typing import Dict, Optional, List, Union
+from .decimation import decimate
 
 
-def plot_assets_close_price_custom_date(assets_list: List[Asset], start_date: str, end_date: Optional[str] = None, save_fig: Optional[bool] = False, fig_name: Optional[str] = None) -> None:
+FIGURE_SETTINGS = {
+    "folder": "figures",
+    "format": "jpg",
+    "dpi": 300,
+}
+# Two points per pixel column keep the minimum and the maximum drawn in it.
+DECIMATION_POINTS_PER_PIXEL = 2
+
+
+def set_figure_settings(folder: Optional[str] = None, fig_format: Optional[str] = None, dpi: Optional[int] = None) -> None:
+    """Changes the folder, the file format and the resolution used to save the figures.
+
+    Args:
+        folder (Optional[str], optional): The folder of the figures. Defaults to None (unchanged).
+        fig_format (Optional[str], optional): The file format. For instance: jpg, png, svg or pdf. Defaults to None (unchanged).
+        dpi (Optional[int], optional): The resolution in dots per inch. Defaults to None (unchanged).
+
+    Raises:
+        TypeError: If the inputs are not a str, a str and an int.
+    """
+    if (isinstance(folder, str) or folder is None) and (isinstance(fig_format, str) or fig_format is None) and (isinstance(dpi, int) or dpi is None):
+        
+        if folder is not None:
+            
+            FIGURE_SETTINGS["folder"] = folder
+        if fig_format is not None:
+            
+            FIGURE_SETTINGS["format"] = fig_format
+        if dpi is not None:
+            
+            FIGURE_SETTINGS["dpi"] = dpi
+    else:
+        
+        raise TypeError("Invalid types! This function expects a str, a str and an int.")
+
+def _default_fig_name(prefix: str) -> str:
+    """Creates the default name of a figure with the today date.
+
+    Args:
+        prefix (str): The beginning of the name.
+
+    Returns:
+        str: The name of the figure.
+    """
+    datetime_str_list = str(datetime.now()).split(" ")
+    date_extracted = datetime_str_list[0].split("-")
+    year = date_extracted[0]
+    month = date_extracted[1]
+    day = date_extracted[2]
+    return f"{prefix}_{year}_{month}_{day}"
+
+def _save_figure(figure: Figure, fig_name: str) -> None:
+    """Saves a figure with the folder, file format and resolution of FIGURE_SETTINGS.
+
+    Args:
+        figure (Figure): The figure.
+        fig_name (str): The name of the file without extension.
+    """
+    figure.savefig(f"{FIGURE_SETTINGS['folder']}/{fig_name}.{FIGURE_SETTINGS['format']}", dpi=FIGURE_SETTINGS["dpi"])
+
+def _close_price_matrix(tickers_list: List[str], data: Optional[DataFrame], time_period: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None) -> DataFrame:
+    """Obtains the close prices of the tickers from a prepared table or from the shared price store.
+
+    Args:
+        tickers_list (List[str]): The tickers.
+        data (Optional[DataFrame]): A prepared table of prices with dates as rows and tickers as columns.
+        time_period (Optional[str], optional): A time period valid in the Yahoo Finance API. Defaults to None.
+        start_date (Optional[str], optional): The start date (format:yyyy-mm-dd). Defaults to None.
+        end_date (Optional[str], optional): The end date (format:yyyy-mm-dd). Defaults to None.
+
+    Returns:
+        DataFrame: A table with dates as rows and tickers as columns.
+    """
+    if data is None:
+        
+        if start_date is not None:
+            
+            return get_price_store().price_matrix(tickers=tickers_list, start_date=start_date, end_date=end_date)
+        return get_price_store().price_matrix(tickers=tickers_list, time_period=time_period)
+    data = data.reindex(columns=tickers_list)
+    if start_date is not None:
+        
+        data = data.loc[pd.Timestamp(start_date):]
+        if end_date is not None:
+            
+            data = data.loc[:pd.Timestamp(end_date) - pd.Timedelta(days=1)]
+    elif time_period is not None:
+        
+        data = data.dropna(how="all")
+        if len(data.index) != 0:
+            
+            data = data.iloc[int(period_start_positions(price_matrix=data, time_period=time_period).min()):]
+    return data
+
+def _plot_lines(data: Union[DataFrame, Series], ax: Optional[Axes], decimation: Optional[str]) -> Axes:
+    """Draws one line per column, each one reduced to the number of points that the axes can show.
+
+    Args:
+        data (Union[DataFrame, Series]): A table with dates as rows and one series per column.
+        ax (Optional[Axes]): The axes where the lines are drawn. If None, a new figure is created.
+        decimation (Optional[str]): The decimation method (minmax or lttb), or None to draw every point.
+
+    Returns:
+        Axes: The axes with the lines.
+    """
+    if ax is None:
+        
+        ax = plt.figure().add_subplot()
+    if decimation is None:
+        
+        return data.plot(ax=ax)
+    target_points = max(int(ax.get_window_extent().width*DECIMATION_POINTS_PER_PIXEL), 4)
+    frame = data.to_frame() if isinstance(data, Series) else data
+    for column in frame.columns:
+        
+        series = decimate(data=frame[column].dropna(), target_points=target_points, method=decimation)
+        ax.plot(series.index, series.to_numpy(), label=str(column))
+    if isinstance(data, DataFrame):
+        
+        ax.legend(title=data.columns.name)
+    return ax
+
+def plot_assets_close_price_custom_date(assets_list: List[Asset], start_date: str, end_date: Optional[str] = None, save_fig: Optional[bool] = False, fig_name: Optional[str] = None, data: Optional[DataFrame] = None, ax: Optional[Axes] = None, decimation: Optional[str] = "minmax") -> None:
     """Creates a plot of the close price of the assets in a custom time period.
 
     Args:
@@ -18,10 +148,13 @@ def plot_assets_close_price_custom_date(assets_list: List[Asset], start_date: st
         end_date (Optional[str], optional): The end date. Defaults to None.
         save_fig (Optional[bool], optional): If we want to save the figure. Defaults to False.
         fig_name (Optional[str], optional): The name that we want to give for the plot. Defaults to None.
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (a new figure).
+        decimation (Optional[str], optional): The decimation method applied to long histories (minmax or lttb). Defaults to "minmax". Use None to draw every point.
 
     Raises:
-        ValueError: If the start_date is ahead 
-        ValueError: If the start_date is ahead 
+        ValueError: If the start_date is ahead
+        ValueError: If the start_date is ahead
         ValueError: Wrong input date format
         ValueError: Wrong input date format
         TypeError: If the inputs are not a List, a str, a str, a bool and a str.
@@ -42,26 +175,7 @@ def plot_assets_close_price_custom_date(assets_list: List[Asset], start_date: st
                         raise ValueError("The start_date can't be ahead from the today date.")
                     else:
                         
-                        data = yf.download(tickers_list, start=start_date, end=today_str, progress=False)
-                        data.dropna()
-                        sns.set()
-                        data["Adj Close"].plot()
-                        plt.title(f"Assets close price from {start_date} to {today_str}")
-                        plt.xlabel("Date")
-                        plt.ylabel("Close Price - $USD")
-                        if save_fig:
-                            
-                            if fig_name is None:
-                                
-                                datetime_str_list = str(datetime.now()).split(" ")
-                                date_extracted = datetime_str_list[0].split("-")
-                                year = date_extracted[0]
-                                month = date_extracted[1]
-                                day = date_extracted[2]
-                                plt.savefig(f"figures/assets_close_price_plot_custom_{year}_{month}_{day}.jpg", dpi=300)
-                            else:
-                                
-                                plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
+                        end_date_str = today_str
                 else:
                     
                     raise ValueError("Wrong date format! The date format for this function is yyyy-mm-dd.")
@@ -74,37 +188,30 @@ def plot_assets_close_price_custom_date(assets_list: List[Asset], start_date: st
                         raise ValueError("The start_date can't be ahead from the end date.")
                     else:
                         
-                        data = yf.download(tickers_list, start=start_date, end=end_date, progress=False)
-                        data.dropna()
-                        sns.set()
-                        data["Adj Close"].plot()
-                        plt.title(f"Assets close price from {start_date} to {end_date}")
-                        plt.xlabel("Date")
-                        plt.ylabel("Close Price - $USD")
-                        if save_fig:
-                            
-                            if fig_name is None:
-                                
-                                datetime_str_list = str(datetime.now()).split(" ")
-                                date_extracted = datetime_str_list[0].split("-")
-                                year = date_extracted[0]
-                                month = date_extracted[1]
-                                day = date_extracted[2]
-                                plt.savefig(f"figures/assets_close_price_plot_custom_{year}_{month}_{day}.jpg", dpi=300)
-                            else:
-                                
-                                plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
+                        end_date_str = end_date
                 else:
                     
                     raise ValueError("Wrong date format! The date format for this function is yyyy-mm-dd.")
+            close_prices = _close_price_matrix(tickers_list=tickers_list, data=data, start_date=start_date, end_date=end_date)
+            sns.set()
+            ax = _plot_lines(data=close_prices, ax=ax, decimation=decimation)
+            ax.set_title(f"Assets close price from {start_date} to {end_date_str}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Close Price - $USD")
+            if save_fig:
+                
+                if fig_name is None:
+                    
+                    fig_name = _default_fig_name(prefix="assets_close_price_plot_custom")
+                _save_figure(figure=ax.figure, fig_name=fig_name)
         else:
             
-            print("Empty assets list!")               
+            print("Empty assets list!")
     else:
         
         raise TypeError("Invalids types! This function expects a List, a str, a str, a bool and a str as input.")
 
-def plot_assets_close_price_time_period(assets_list: List[Asset], time_period: str, save_fig: Optional[bool] = False, fig_name: Optional[str] = None) -> None:
+def plot_assets_close_price_time_period(assets_list: List[Asset], time_period: str, save_fig: Optional[bool] = False, fig_name: Optional[str] = None, data: Optional[DataFrame] = None, ax: Optional[Axes] = None, decimation: Optional[str] = "minmax") -> None:
     """Creates a plot of the close price of the assets in a fixed time period.
 
     Args:
@@ -112,6 +219,9 @@ def plot_assets_close_price_time_period(assets_list: List[Asset], time_period: s
         time_period (str): The time period that we want to see the close price of the assets.
         save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False.
         fig_name (Optional[str], optional): The name that we want to give for the plot. Defaults to None.
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (a new figure).
+        decimation (Optional[str], optional): The decimation method applied to long histories (minmax or lttb). Defaults to "minmax". Use None to draw every point.
 
     Raises:
         TypeError: If the inputs are not equal to a List, a str, a bool and a str.
@@ -124,25 +234,18 @@ def plot_assets_close_price_time_period(assets_list: List[Asset], time_period: s
             tickers_list = [asset.ticker for asset in assets_list]
             if time_period in Portfolio.VALIDS_TIME_PERIODS:
                 
-                data = yf.download(tickers_list, period=time_period, progress=False)
+                close_prices = _close_price_matrix(tickers_list=tickers_list, data=data, time_period=time_period)
                 sns.set()
-                data["Adj Close"].plot()
-                plt.title(f"Assets close price in {time_period}")
-                plt.xlabel("Date")
-                plt.ylabel("Close Price - $USD")
+                ax = _plot_lines(data=close_prices, ax=ax, decimation=decimation)
+                ax.set_title(f"Assets close price in {time_period}")
+                ax.set_xlabel("Date")
+                ax.set_ylabel("Close Price - $USD")
                 if save_fig:
                     
                     if fig_name is None:
                         
-                        datetime_str_list = str(datetime.now()).split(" ")
-                        date_extracted = datetime_str_list[0].split("-")
-                        year = date_extracted[0]
-                        month = date_extracted[1]
-                        day = date_extracted[2]
-                        plt.savefig(f"figures/assets_close_price_plot_{year}_{month}_{day}.jpg", dpi=300)
-                    else:
-                        
-                        plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
+                        fig_name = _default_fig_name(prefix="assets_close_price_plot")
+                    _save_figure(figure=ax.figure, fig_name=fig_name)
             else:
                 
                 raise TypeError("Invalid type! The fig_name must be a str.")
@@ -152,18 +255,25 @@ def plot_assets_close_price_time_period(assets_list: List[Asset], time_period: s
     else:
         
         raise TypeError("Invalids types! The input of this functions must be a List, a str, a bool and a str.")
-    
-def plot_assets_liquidity(assets_list: List[Asset], input_date: Optional[str] = None, save_fig: Optional[bool] = False, fig_name: Optional[str] = None) -> None:
-    """Creates a bar plot with the assets liquidity.
+
+def plot_assets_liquidity(assets_list: List[Asset], input_date: Optional[str] = None, save_fig: Optional[bool] = False, fig_name: Optional[str] = None, data: Optional[DataFrame] = None, ax: Optional[Axes] = None, close_prices: Optional[DataFrame] = None, window: int = 20, metric: Optional[str] = None, base_currency: str = "USD") -> None:
+    """Creates a bar plot with the assets liquidity averaged over a window of trading days.
 
     Args:
         assets_list (List[Asset]): The assets list.
         input_date (Optional[str], optional): The date that we want to know the assets liquidity. Defaults to None.
         save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False.
         fig_name (Optional[str], optional): The name that we want to give for the plot. Defaults to None.
+        data (Optional[DataFrame], optional): A prepared table of volumes with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (the current axes).
+        close_prices (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        window (int, optional): The number of trading days of the averages. Defaults to 20.
+        metric (Optional[str], optional): The column of assets_liquidity that is drawn. Defaults to None (the ADV in the base currency).
+        base_currency (str, optional): The currency of the dollar volumes and of the values. Defaults to "USD".
 
     Raises:
         ValueError: If the start_date is in the future.
+        ValueError: If the metric is not valid.
         TypeError: If the inputs are not a List, str, bool and str.
         TypeError: If the fig_name is not a str.
     """
@@ -171,34 +281,12 @@ def plot_assets_liquidity(assets_list: List[Asset], input_date: Optional[str] =
         
         if len(assets_list) != 0:
             
-            tickers_list = [asset.ticker for asset in assets_list]
-            if input_date is None:
+            valids_metrics = liquidity_columns(base_currency=base_currency)
+            metric = valids_metrics[1] if metric is None else metric
+            if metric not in valids_metrics:
                 
-                today = date.today()
-                start = today - timedelta(days=1)
-                today_str = today.strftime("%Y-%m-%d")
-                start_str = start.strftime("%Y-%m-%d")
-                data = yf.download(tickers_list, start=start_str, end=today_str, progress=False)
-                assets_volume_list = [data["Volume"][ticker][0] for ticker in tickers_list]
-                sns.set()
-                sns.barplot(x=tickers_list, y=assets_volume_list)
-                plt.xlabel("Assets")
-                plt.ylabel("Transactions Volume ($USD)")
-                plt.title(f"Assets liquidity in {today_str}")
-                if save_fig:
-                    
-                    if fig_name is None:
-                        
-                        datetime_str_list = str(datetime.now()).split(" ")
-                        date_extracted = datetime_str_list[0].split("-")
-                        year = date_extracted[0]
-                        month = date_extracted[1]
-                        day = date_extracted[2]
-                        plt.savefig(f"figures/assets_liquidity_plot_{year}_{month}_{day}.jpg", dpi=300)
-                    else:
-                        
-                        plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
-            else:
+                raise ValueError(f"Invalid metric! The valids metrics are {valids_metrics}.")
+            if input_date is not None:
                 
                 if isinstance(re.match(r'\d{4}-\d{2}-\d{2}', input_date), re.Match):
                     
@@ -206,34 +294,21 @@ def plot_assets_liquidity(assets_list: List[Asset], input_date: Optional[str] =
                     if input_date > today:
                         
                         raise ValueError("The input_date can't be after today date.")
-                    else:
-                        
-                        end_date = date.fromisoformat(input_date)
-                        start = end_date - timedelta(days=1)
-                        start_str = start.strftime("%Y-%m-%d")
-                        data = yf.download(tickers_list, start=start_str, end=input_date, progress=False)
-                        assets_volume_list = [data["Volume"][ticker][0] for ticker in tickers_list]
-                        sns.set()
-                        sns.barplot(x=tickers_list, y=assets_volume_list)
-                        plt.xlabel("Assets")
-                        plt.ylabel("Transactions Volume ($USD)")
-                        plt.title(f"Assets liquidity in {input_date}")
-                        if save_fig:
-                            
-                            if fig_name is None:
-                                
-                                datetime_str_list = str(datetime.now()).split(" ")
-                                date_extracted = datetime_str_list[0].split("-")
-                                year = date_extracted[0]
-                                month = date_extracted[1]
-                                day = date_extracted[2]
-                                plt.savefig(f"figures/assets_liquidity_plot_{year}_{month}_{day}.jpg", dpi=300)
-                            else:
-                                
-                                plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
                 else:
                     
-                    raise TypeError("Invalid type! The fig_name must be a str.")            
+                    raise TypeError("Invalid type! The fig_name must be a str.")
+            liquidity = assets_liquidity(assets_list=assets_list, window=window, as_of=input_date, base_currency=base_currency, volume=data, close_prices=close_prices)
+            sns.set()
+            ax = sns.barplot(x=list(liquidity.index), y=liquidity[metric].to_numpy(), ax=ax)
+            ax.set_xlabel("Assets")
+            ax.set_ylabel(metric)
+            ax.set_title(f"Assets liquidity ({window}-day average) in {input_date or date.today().strftime('%Y-%m-%d')}")
+            if save_fig:
+                
+                if fig_name is None:
+                    
+                    fig_name = _default_fig_name(prefix="assets_liquidity_plot")
+                _save_figure(figure=ax.figure, fig_name=fig_name)
         else:
             
             print("Empty assets list!")
@@ -241,7 +316,7 @@ def plot_assets_liquidity(assets_list: List[Asset], input_date: Optional[str] =
         
         raise TypeError("Invalids types! The input of this function expects a List, str, bool, str.")
 
-def plot_assets_matrix_correlation(portfolio: Portfolio, time_period: str, save_fig: Optional[bool] = False, fig_name: Optional[str] = None) -> None:
+def plot_assets_matrix_correlation(portfolio: Portfolio, time_period: str, save_fig: Optional[bool] = False, fig_name: Optional[str] = None, data: Optional[DataFrame] = None, ax: Optional[Axes] = None) -> None:
     """Creates a matrix correlation of the assets in the portfolio.
 
     Args:
@@ -249,6 +324,8 @@ def plot_assets_matrix_correlation(portfolio: Portfolio, time_period: str, save_
         time_period (str): The time period to get data for the calculation the matrix correlation.
         save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False.
         fig_name (Optional[str], optional): The name we want to give for the plot. Defaults to None.
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (the current axes).
 
     Raises:
         TypeError: If the inputs are not a Portfolio, str, bool and str.
@@ -260,39 +337,37 @@ def plot_assets_matrix_correlation(portfolio: Portfolio, time_period: str, save_
             
             if time_period in Portfolio.VALIDS_TIME_PERIODS:
                 
-                assets_correlation = portfolio.correlation_between_assets(time_period=time_period)
+                if data is None:
+                    
+                    assets_correlation = portfolio.correlation_between_assets(time_period=time_period)
+                else:
+                    
+                    tickers_list = [asset.ticker for asset in portfolio.assets]
+                    assets_correlation = _close_price_matrix(tickers_list=tickers_list, data=data, time_period=time_period).corr()
                 sns.set()
-                sns.heatmap(assets_correlation, annot=True)
-                plt.title("Assets correlation matrix")
+                ax = sns.heatmap(assets_correlation, annot=True, ax=ax)
+                ax.set_title("Assets correlation matrix")
                 if save_fig:
                     
                     if fig_name is None:
                         
-                        datetime_str_list = str(datetime.now()).split(" ")
-                        date_extracted = datetime_str_list[0].split("-")
-                        year = date_extracted[0]
-                        month = date_extracted[1]
-                        day = date_extracted[2]
-                        plt.savefig(f"figures/correlation_matrix_{year}_{month}_{day}.jpg", dpi=300)
-                    elif isinstance(fig_name, str):
-                        
-                        plt.savefig(f"figures/{fig_name}.jpg", dpi=300)
-                    else:
-                        
-                        raise TypeError("Invalid type! The fig_name must be a str.")
+                        fig_name = _default_fig_name(prefix="correlation_matrix")
+                    _save_figure(figure=ax.figure, fig_name=fig_name)
         else:
             
             print("Empty assets list!")
     else:
         
         raise TypeError("Invalids types! This functions expects a Portfolio, a str, a bool and a str as input.")
-    
-def plot_assets_pie_chart(portfolio: Portfolio, save_fig: Optional[bool] = False) -> None:
+
+def plot_assets_pie_chart(portfolio: Portfolio, save_fig: Optional[bool] = False, data: Optional[DataFrame] = None, ax: Optional[Axes] = None) -> None:
     """Creates a pie chart of the assets allocation.
 
     Args:
         portfolio (Portfolio): The portfolio that we want to see the pie chart assets.
         save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False. Defaults to False.
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (the current axes).
 
     Raises:
         TypeError: If the inputs are not a Portfolio and a bool.
@@ -301,38 +376,43 @@ def plot_assets_pie_chart(portfolio: Portfolio, save_fig: Optional[bool] = False
         
         if len(portfolio.assets) != 0:
             
-            portfolio_value = 0.0
             labels = [asset.name for asset in portfolio.assets]
-            assets_amount = {asset.ticker: asset.amount for asset in portfolio.assets}
-            assets_value = []
-            for asset in portfolio.assets:
-                
-                data = yf.download(asset.ticker, period="1d", progress=False)
-                data.dropna()
-                assets_value.append(assets_amount[asset.ticker]*data["Adj Close"][0])
-                portfolio_value += np.round(assets_amount[asset.ticker]*data["Adj Close"][0], 2)
-            assets_value_np = np.array(assets_value)
+            tickers_list = [asset.ticker for asset in portfolio.assets]
+            currencies_list = [asset.currency for asset in portfolio.assets]
+            assets_amounts = np.array([asset.amount for asset in portfolio.assets])
+            price_store = get_price_store()
+            close_prices = _close_price_matrix(tickers_list=tickers_list, data=data, time_period="5d")
+            close_prices = price_store.convert_to_base_currency(price_matrix=close_prices, currencies=currencies_list)
+            assets_value_np = close_prices.ffill().to_numpy()[-1]*assets_amounts
+            portfolio_value = np.round(assets_value_np, 2).sum()
             assets_percentage = (assets_value_np/portfolio_value)*100
             colors = sns.color_palette('pastel')[0:len(assets_percentage)]
             sns.set()
-            plt.pie(assets_percentage, labels=labels, colors=colors, autopct='%.1f%%')
-            plt.title("Portfolio assets allocation")
+            if ax is None:
+                
+                ax = plt.gca()
+            ax.pie(assets_percentage, labels=labels, colors=colors, autopct='%.1f%%')
+            ax.set_title("Portfolio assets allocation")
             if save_fig:
                 
-                plt.savefig("figures/assets_percentage_pie_chart.jpg", dpi=300)
+                _save_figure(figure=ax.figure, fig_name="assets_percentage_pie_chart")
         else:
             
             print("The assets list of this portfolio is empty!")
     else:
         
         raise TypeError("Invalids types! This functions expects a Portfolio and a bool.")
-    
-def plot_assets_category_pie_chart(portfolio: Portfolio, save_fig: Optional[bool] = False) -> dict:
-    """Creates a pie chart of the assets category.
+
+def plot_assets_category_pie_chart(portfolio: Portfolio, save_fig: Optional[bool] = False, ax: Optional[Axes] = None, data: Optional[DataFrame] = None, grouping: Union[str, Dict[str, str]] = "category", exposure: Optional[DataFrame] = None) -> None:
+    """Creates a pie chart of the value of the portfolio by assets category or by any other grouping.
 
     Args:
         portfolio (Portfolio): The portfolio that we want to see the pie chart assets category.
         save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False.
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (the current axes).
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        grouping (Union[str, Dict[str, str]], optional): An attribute of the assets (category or currency) or the group of each ticker. Defaults to "category".
+        exposure (Optional[DataFrame], optional): A table returned by portfolio_exposure. Defaults to None (calculated from the portfolio).
 
     Raises:
         TypeError: If the inputs are not a Portfolio and a bool.
@@ -341,42 +421,121 @@ def plot_assets_category_pie_chart(portfolio: Portfolio, save_fig: Optional[bool
         
         if len(portfolio.assets) != 0:
             
-            num_assets = len(portfolio.assets)
-            category_count = {category: 0 for category in Asset.VALIDS_ASSET_CATEGORIES}
-            for asset in portfolio.assets:
+            if exposure is None:
                 
-                if asset.category.lower() == 'stocks':
-                    
-                    category_count['stocks'] = category_count['stocks'] + 1
-                elif asset.category.lower() == 'etf':
-                    
-                    category_count['etf'] = category_count['etf'] + 1
-                elif asset.category.lower() == 'reits':
-                    
-                    category_count['reits'] = category_count['reits'] + 1
-                elif asset.category.lower() == 'currency':
-                    
-                    category_count['currency'] = category_count['currency'] + 1
-                elif asset.category.lower() == 'cryptocurrency':
-                    
-                    category_count['cryptocurrency'] = category_count['cryptocurrency'] + 1
-                elif asset.category.lower() == 'funds':
-                    
-                    category_count['funds'] = category_count['funds'] + 1
-            labels = [key for key, value in category_count.items() if value != 0]
-            category_count_list = [count for _,count in category_count.items() if count > 0]
-            category_count_np = np.array(category_count_list)
-            category_percentage = (category_count_np/num_assets)*100
-            colors = sns.color_palette('pastel')[0:len(category_percentage)]
+                exposure = portfolio_exposure(portfolio=portfolio, grouping=grouping, time_period="5d", price_matrix=data)
+            exposure = exposure[exposure["Weight (%)"] > 0]
+            colors = sns.color_palette('pastel')[0:len(exposure)]
             sns.set()
-            plt.pie(category_percentage, labels=labels, colors=colors, autopct='%.2f%%')
-            plt.title("Portfolio assets category") 
+            if ax is None:
+                
+                ax = plt.gca()
+            ax.pie(exposure["Weight (%)"].to_numpy(), labels=list(exposure.index), colors=colors, autopct='%.2f%%')
+            ax.set_title("Portfolio assets category" if grouping == "category" else "Portfolio exposure")
             if save_fig:
                 
-                plt.savefig("figures/assets_category_percentage_pie_chart.jpg", dpi=300)
+                _save_figure(figure=ax.figure, fig_name="assets_category_percentage_pie_chart")
         else:
             
             print("The assets list of this portfolio is empty!")
     else:
         
         raise TypeError("Invalids types! This functions expects a Portfolio and a bool.")
+
+def plot_portfolio_value(portfolio: Portfolio, time_period: str, save_fig: Optional[bool] = False, fig_name: Optional[str] = None, data: Optional[DataFrame] = None, ax: Optional[Axes] = None, decimation: Optional[str] = "minmax") -> None:
+    """Creates a plot of the portfolio value (equity curve) in a fixed time period.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str): The time period that we want to see the portfolio value.
+        save_fig (Optional[bool], optional): If we want to save the plot. Defaults to False.
+        fig_name (Optional[str], optional): The name that we want to give for the plot. Defaults to None.
+        data (Optional[DataFrame], optional): A prepared table of close prices with dates as rows and tickers as columns. Defaults to None (shared price store).
+        ax (Optional[Axes], optional): The axes where the plot is drawn. Defaults to None (a new figure).
+        decimation (Optional[str], optional): The decimation method applied to long histories (minmax or lttb). Defaults to "minmax". Use None to draw every point.
+
+    Raises:
+        ValueError: If the time period is not valid.
+        TypeError: If the inputs are not a Portfolio, a str, a bool and a str.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(time_period, str) and isinstance(save_fig, bool) and (isinstance(fig_name, str) or fig_name is None):
+        
+        if len(portfolio.assets) != 0:
+            
+            if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+                
+                raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+            tickers_list = [asset.ticker for asset in portfolio.assets]
+            currencies_list = [asset.currency for asset in portfolio.assets]
+            assets_amounts = np.array([asset.amount for asset in portfolio.assets])
+            close_prices = _close_price_matrix(tickers_list=tickers_list, data=data, time_period=time_period)
+            close_prices = get_price_store().convert_to_base_currency(price_matrix=close_prices, currencies=currencies_list)
+            portfolio_value = pd.Series(data=close_prices.ffill().bfill().to_numpy() @ assets_amounts, index=close_prices.index, name="Portfolio")
+            sns.set()
+            ax = _plot_lines(data=portfolio_value, ax=ax, decimation=decimation)
+            ax.set_title(f"Portfolio value in {time_period}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Portfolio Value - $USD")
+            if save_fig:
+                
+                if fig_name is None:
+                    
+                    fig_name = _default_fig_name(prefix="portfolio_value_plot")
+                _save_figure(figure=ax.figure, fig_name=fig_name)
+        else:
+            
+            print("The assets list of this portfolio is empty!")
+    else:
+        
+        raise TypeError("Invalids types! This functions expects a Portfolio, a str, a bool and a str.")
+
+def plot_dashboard(portfolio: Portfolio, time_period: str = "1y", save_fig: Optional[bool] = False, fig_name: Optional[str] = None) -> Figure:
+    """Creates a dashboard with every portfolio chart from a single data load.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str, optional): The time period of the close price, value and correlation charts. Defaults to "1y".
+        save_fig (Optional[bool], optional): If we want to save the dashboard. Defaults to False.
+        fig_name (Optional[str], optional): The name that we want to give for the dashboard. Defaults to None.
+
+    Raises:
+        ValueError: If the time period is not valid.
+        TypeError: If the inputs are not a Portfolio, a str, a bool and a str.
+
+    Returns:
+        Figure: The figure of the dashboard.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(time_period, str) and isinstance(save_fig, bool) and (isinstance(fig_name, str) or fig_name is None):
+        
+        if len(portfolio.assets) != 0:
+            
+            if time_period not in Portfolio.VALIDS_TIME_PERIODS:
+                
+                raise ValueError("Invalid time period! Check the valids time period in Yahoo Finance API.")
+            tickers_list = [asset.ticker for asset in portfolio.assets]
+            price_store = get_price_store()
+            download_time_period = "5d" if time_period == "1d" else time_period
+            close_prices = price_store.price_matrix(tickers=tickers_list, time_period=download_time_period)
+            volume = price_store.price_matrix(tickers=tickers_list, field="Volume", time_period=download_time_period)
+            sns.set()
+            figure, axes = plt.subplots(nrows=3, ncols=2, figsize=(16, 18))
+            plot_assets_close_price_time_period(assets_list=portfolio.assets, time_period=time_period, data=close_prices, ax=axes[0][0])
+            plot_portfolio_value(portfolio=portfolio, time_period=time_period, data=close_prices, ax=axes[0][1])
+            plot_assets_matrix_correlation(portfolio=portfolio, time_period=time_period, data=close_prices, ax=axes[1][0])
+            plot_assets_liquidity(assets_list=portfolio.assets, data=volume, ax=axes[1][1], close_prices=close_prices)
+            plot_assets_pie_chart(portfolio=portfolio, data=close_prices, ax=axes[2][0])
+            plot_assets_category_pie_chart(portfolio=portfolio, ax=axes[2][1], data=close_prices)
+            figure.tight_layout()
+            if save_fig:
+                
+                if fig_name is None:
+                    
+                    fig_name = _default_fig_name(prefix="portfolio_dashboard")
+                _save_figure(figure=figure, fig_name=fig_name)
+            return figure
+        else:
+            
+            print("The assets list of this portfolio is empty!")
+    else:
+        
+        raise TypeError("Invalids types! This functions expects a Portfolio, a str, a bool and a str.")
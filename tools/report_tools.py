@@ -0,0 +1,198 @@
+import base64
+import io
+import matplotlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from market_data import PriceStore, get_price_store, set_price_store
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from pandas import DataFrame
+from portfolio import Portfolio
+from typing import Dict, List, Optional, Tuple
+from .plot_tools import plot_assets_category_pie_chart, plot_assets_close_price_time_period, plot_assets_liquidity, plot_assets_matrix_correlation, plot_assets_pie_chart, plot_portfolio_value
+
+
+VALIDS_REPORT_FORMATS = ["pdf", "html"]
+
+
+def _new_figure(figsize: Tuple[float, float] = (11.69, 8.27)) -> Figure:
+    """Creates a figure attached to an Agg canvas and not to the pyplot global state.
+
+    Args:
+        figsize (Tuple[float, float], optional): The size of the figure in inches. Defaults to A4 landscape.
+
+    Returns:
+        Figure: The figure.
+    """
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+def render_portfolio_figures(portfolio: Portfolio, time_period: str, close_prices: DataFrame, volume: DataFrame) -> List[Figure]:
+    """Renders the pages of a portfolio report from prepared prices, one chart per page.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        time_period (str): The time period of the close price, value and correlation charts.
+        close_prices (DataFrame): A table of close prices with dates as rows and tickers as columns.
+        volume (DataFrame): A table of volumes with dates as rows and tickers as columns.
+
+    Returns:
+        List[Figure]: The pages of the report.
+    """
+    figures = [_new_figure() for _ in range(6)]
+    plot_assets_close_price_time_period(assets_list=portfolio.assets, time_period=time_period, data=close_prices, ax=figures[0].add_subplot())
+    plot_portfolio_value(portfolio=portfolio, time_period=time_period, data=close_prices, ax=figures[1].add_subplot())
+    plot_assets_matrix_correlation(portfolio=portfolio, time_period=time_period, data=close_prices, ax=figures[2].add_subplot())
+    plot_assets_liquidity(assets_list=portfolio.assets, data=volume, ax=figures[3].add_subplot(), close_prices=close_prices)
+    plot_assets_pie_chart(portfolio=portfolio, data=close_prices, ax=figures[4].add_subplot())
+    plot_assets_category_pie_chart(portfolio=portfolio, ax=figures[5].add_subplot(), data=close_prices)
+    for figure in figures:
+        
+        figure.tight_layout()
+    return figures
+
+def write_portfolio_report(portfolio: Portfolio, file_path: str, time_period: str = "1y", report_format: str = "pdf", dpi: int = 150, image_format: str = "png", close_prices: Optional[DataFrame] = None, volume: Optional[DataFrame] = None) -> str:
+    """Writes a multi-page report of a portfolio as a .pdf or a .html file.
+
+    Every figure is closed as soon as its page is written, so the memory used
+    does not grow along a batch.
+
+    Args:
+        portfolio (Portfolio): The portfolio.
+        file_path (str): The path to the report.
+        time_period (str, optional): The time period of the charts. Defaults to "1y".
+        report_format (str, optional): The report format (pdf or html). Defaults to "pdf".
+        dpi (int, optional): The resolution of the charts. Defaults to 150.
+        image_format (str, optional): The image format of the charts embedded in a .html report. Defaults to "png".
+        close_prices (Optional[DataFrame], optional): A prepared table of close prices. Defaults to None (shared price store).
+        volume (Optional[DataFrame], optional): A prepared table of volumes. Defaults to None (shared price store).
+
+    Raises:
+        ValueError: If the report format is not valid.
+        TypeError: If the inputs are not a Portfolio, a str, a str, a str and an int.
+
+    Returns:
+        str: The path to the report.
+    """
+    if isinstance(portfolio, Portfolio) and isinstance(file_path, str) and isinstance(time_period, str) and isinstance(report_format, str) and isinstance(dpi, int):
+        
+        if report_format not in VALIDS_REPORT_FORMATS:
+            
+            raise ValueError(f"Invalid report format! The valids report formats are {VALIDS_REPORT_FORMATS}.")
+        tickers_list = [asset.ticker for asset in portfolio.assets]
+        download_time_period = "5d" if time_period == "1d" else time_period
+        if close_prices is None:
+            
+            close_prices = get_price_store().price_matrix(tickers=tickers_list, time_period=download_time_period)
+        if volume is None:
+            
+            volume = get_price_store().price_matrix(tickers=tickers_list, field="Volume", time_period=download_time_period)
+        figures = render_portfolio_figures(portfolio=portfolio, time_period=time_period, close_prices=close_prices, volume=volume)
+        if report_format == "pdf":
+            
+            with PdfPages(file_path) as pdf:
+                
+                for figure in figures:
+                    
+                    pdf.savefig(figure, dpi=dpi)
+                    figure.clear()
+        else:
+            
+            images = []
+            for figure in figures:
+                
+                buffer = io.BytesIO()
+                figure.savefig(buffer, format=image_format, dpi=dpi)
+                figure.clear()
+                mime_type = "image/svg+xml" if image_format == "svg" else f"image/{image_format}"
+                images.append(f'<img src="data:{mime_type};base64,{base64.b64encode(buffer.getvalue()).decode("ascii")}"/>')
+            with open(file_path, "w") as html_file:
+                
+                html_file.write("<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>Portfolio report</title></head>\n<body>\n")
+                html_file.write("\n".join(images))
+                html_file.write("\n</body>\n</html>\n")
+        figures.clear()
+        return file_path
+    else:
+        
+        raise TypeError("Invalid types! This function expects a Portfolio, a str, a str, a str and an int.")
+
+def _init_report_worker(price_store: PriceStore) -> None:
+    """Prepares a report process: headless backend and a copy of the loaded prices.
+
+    Args:
+        price_store (PriceStore): The price store loaded by the parent process.
+    """
+    matplotlib.use("Agg")
+    set_price_store(price_store=price_store)
+
+def _report_worker(task: Tuple[Portfolio, str, str, str, int, str, DataFrame, DataFrame]) -> str:
+    """Writes one report in a worker process.
+
+    Args:
+        task (Tuple): The arguments of write_portfolio_report.
+
+    Returns:
+        str: The path to the report.
+    """
+    portfolio, file_path, time_period, report_format, dpi, image_format, close_prices, volume = task
+    return write_portfolio_report(portfolio=portfolio, file_path=file_path, time_period=time_period, report_format=report_format, dpi=dpi, image_format=image_format, close_prices=close_prices, volume=volume)
+
+def generate_batch_reports(portfolios: Dict[str, Portfolio], output_folder: str, time_period: str = "1y", report_format: str = "pdf", dpi: int = 150, image_format: str = "png", max_workers: Optional[int] = None) -> List[str]:
+    """Writes one report per portfolio, spreading the portfolios across a process pool.
+
+    The prices of the union of the tickers (and the exchange rates that they
+    need) are loaded once in the parent process and shared with the workers.
+
+    Args:
+        portfolios (Dict[str, Portfolio]): The portfolios by report name.
+        output_folder (str): The folder of the reports.
+        time_period (str, optional): The time period of the charts. Defaults to "1y".
+        report_format (str, optional): The report format (pdf or html). Defaults to "pdf".
+        dpi (int, optional): The resolution of the charts. Defaults to 150.
+        image_format (str, optional): The image format of the charts embedded in a .html report. Defaults to "png".
+        max_workers (Optional[int], optional): The number of processes. Defaults to None (number of CPUs). Use 1 to render in this process.
+
+    Raises:
+        ValueError: If the report format is not valid.
+        TypeError: If the inputs are not a dict and a str.
+
+    Returns:
+        List[str]: The paths to the reports.
+    """
+    if isinstance(portfolios, dict) and isinstance(output_folder, str):
+        
+        if report_format not in VALIDS_REPORT_FORMATS:
+            
+            raise ValueError(f"Invalid report format! The valids report formats are {VALIDS_REPORT_FORMATS}.")
+        portfolios = {name: portfolio for name, portfolio in portfolios.items() if len(portfolio.assets) != 0}
+        if len(portfolios) == 0:
+            
+            return []
+        os.makedirs(output_folder, exist_ok=True)
+        tickers_currencies = {asset.ticker: asset.currency for portfolio in portfolios.values() for asset in portfolio.assets}
+        tickers_list = list(tickers_currencies.keys())
+        price_store = get_price_store()
+        download_time_period = "5d" if time_period == "1d" else time_period
+        close_prices = price_store.price_matrix(tickers=tickers_list, time_period=download_time_period)
+        volume = price_store.price_matrix(tickers=tickers_list, field="Volume", time_period=download_time_period)
+        price_store.convert_to_base_currency(price_matrix=close_prices, currencies=list(tickers_currencies.values()))
+        tasks = []
+        for name, portfolio in portfolios.items():
+            
+            portfolio_tickers = list(dict.fromkeys(asset.ticker for asset in portfolio.assets))
+            file_path = os.path.join(output_folder, f"{name}.{report_format}")
+            tasks.append((portfolio, file_path, time_period, report_format, dpi, image_format, close_prices[portfolio_tickers], volume[portfolio_tickers]))
+        if max_workers == 1 or len(tasks) == 1:
+            
+            return [_report_worker(task=task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_report_worker, initargs=(price_store,)) as executor:
+            
+            chunksize = max(1, len(tasks)//(4*(max_workers or os.cpu_count() or 1)))
+            paths = list(executor.map(_report_worker, tasks, chunksize=chunksize))
+        return paths
+    else:
+        
+        raise TypeError("Invalid types! This function expects a dict and a str.")